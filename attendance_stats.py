@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+실시간 참석 통계
+
+이벤트별 등록/체크인 인원, 티켓 종류별 인원, 분당 도착 인원을 누적 카운터로 유지합니다.
+카운터는 매 틱의 참석자 변경분(GuestDelta)만 반영하므로 틱당 비용은 변경된 참석자 수에 비례합니다.
+"""
+
+import html
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from guest_index import GuestDelta, GuestEntry
+
+# 분당 도착 인원을 보관하는 기간 (분)
+ARRIVAL_RETENTION_MINUTES = 60
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def parse_utc(timestamp: Optional[str]) -> Optional[datetime]:
+    """ISO 8601 시각 문자열을 tzinfo 없는 UTC datetime으로 변환"""
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except (ValueError, TypeError):
+        return None
+    if parsed.tzinfo:
+        parsed = parsed.replace(tzinfo=None) - (parsed.utcoffset() or timedelta(0))
+    return parsed
+
+
+def _minute_key(moment: datetime) -> int:
+    """UTC datetime -> epoch 기준 분"""
+    return int((moment - EPOCH).total_seconds() // 60)
+
+
+class AttendanceStats:
+    """이벤트 하나의 누적 참석 카운터"""
+
+    def __init__(self):
+        self.registered = 0
+        self.checked_in = 0
+        # 티켓 종류 -> [등록 인원, 체크인 인원]
+        self.by_ticket: Dict[str, list] = {}
+        # UTC 기준 분(epoch minute) -> 도착 인원
+        self.arrivals: Dict[int, int] = {}
+
+    def apply(self, delta: GuestDelta):
+        """참석자 변경분 반영"""
+        for _, old, new in delta.changes:
+            if old:
+                self._add(old, -1)
+            if new:
+                self._add(new, 1)
+
+    def _add(self, entry: GuestEntry, sign: int):
+        checked_in_at, ticket_type = entry
+        ticket_counts = self.by_ticket.setdefault(ticket_type, [0, 0])
+        self.registered += sign
+        ticket_counts[0] += sign
+        if checked_in_at:
+            self.checked_in += sign
+            ticket_counts[1] += sign
+            moment = parse_utc(checked_in_at)
+            if moment is not None:
+                minute = _minute_key(moment)
+                self.arrivals[minute] = self.arrivals.get(minute, 0) + sign
+                if self.arrivals[minute] <= 0:
+                    del self.arrivals[minute]
+        if ticket_counts == [0, 0]:
+            del self.by_ticket[ticket_type]
+
+    def prune(self, now: datetime):
+        """보관 기간이 지난 분당 도착 기록 삭제"""
+        cutoff = _minute_key(now) - ARRIVAL_RETENTION_MINUTES
+        for minute in [minute for minute in self.arrivals if minute < cutoff]:
+            del self.arrivals[minute]
+
+    def arrivals_per_minute(self, now: datetime, window_minutes: int = 10) -> float:
+        """최근 N분 동안의 분당 평균 도착 인원"""
+        current = _minute_key(now)
+        total = sum(self.arrivals.get(minute, 0) for minute in range(current - window_minutes + 1, current + 1))
+        return total / window_minutes
+
+    def format_summary(self, event_name: str, now: datetime, window_minutes: int = 10) -> str:
+        """Telegram 요약 메시지 포맷팅"""
+        rate = self.checked_in / self.registered * 100 if self.registered else 0.0
+        ticket_lines = "\n".join(
+            f"• {html.escape(ticket_type)}: {counts[1]} / {counts[0]}명"
+            for ticket_type, counts in sorted(self.by_ticket.items(), key=lambda item: -item[1][0])
+        )
+        message = f"""
+📊 <b>실시간 참석 현황</b>
+
+📅 <b>이벤트:</b> {html.escape(event_name)}
+✅ <b>체크인:</b> {self.checked_in} / {self.registered}명 ({rate:.1f}%)
+🚶 <b>최근 {window_minutes}분 도착:</b> 분당 {self.arrivals_per_minute(now, window_minutes):.1f}명
+        """.strip()
+        if ticket_lines:
+            message += f"\n\n🏷️ <b>티켓 종류별:</b>\n{ticket_lines}"
+        return message
+
+    def to_dict(self) -> Dict:
+        return {
+            'registered': self.registered,
+            'checked_in': self.checked_in,
+            'by_ticket': self.by_ticket,
+            'arrivals': {str(minute): count for minute, count in self.arrivals.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AttendanceStats':
+        stats = cls()
+        stats.registered = data.get('registered', 0)
+        stats.checked_in = data.get('checked_in', 0)
+        stats.by_ticket = {ticket: list(counts) for ticket, counts in data.get('by_ticket', {}).items()}
+        stats.arrivals = {int(minute): count for minute, count in data.get('arrivals', {}).items()}
+        return stats
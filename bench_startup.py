@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+단발성 실행 시작 시간 벤치마크
+
+cron으로 실행되는 `luma_checkin_bot.py`가 시작해서 첫 HTTP 요청을 보내기까지의 시간을 측정합니다.
+
+- eager: 모든 의존성(requests, dotenv)을 시작 시점에 임포트하고 `.env`를 파싱하는 기존 방식
+- fast: 지연 임포트 + 미리 컴파일된 설정 스냅샷을 사용하는 현재 방식
+
+로컬 HTTP 서버를 Luma API 대신 띄우고(LUMA_API_BASE_URL), 프로세스 생성 시점부터
+서버가 첫 요청을 받을 때까지의 시간을 반복 측정해 중앙값을 출력합니다.
+`-X importtime` 결과로 모듈별 임포트 시간 상위 항목도 함께 보여줍니다.
+
+사용법:
+    python bench_startup.py [--runs 20] [--top 10]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import statistics
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'luma_checkin_bot.py')
+
+SCENARIOS = {
+    'eager': [
+        '-c',
+        "import requests, dotenv; dotenv.load_dotenv('.env'); "
+        f"import sys, runpy; sys.path.insert(0, {os.path.dirname(BOT_PATH)!r}); "
+        f"runpy.run_path({BOT_PATH!r}, run_name='__main__')"
+    ],
+    'fast': [BOT_PATH],
+}
+
+ENV_CONTENT = """LUMA_API_KEY=bench-key
+TELEGRAM_BOT_TOKEN=bench-token
+TELEGRAM_CHAT_ID=-1
+VIP_GUESTS=김대표,이사장
+MENTION_USERS=@manager1
+"""
+
+
+class _FirstRequestHandler(BaseHTTPRequestHandler):
+    """첫 요청 수신 시각을 기록하고 빈 이벤트 목록을 반환"""
+
+    def do_GET(self):
+        self.server.first_request_at.setdefault(self.server.run_id, time.perf_counter())
+        body = json.dumps({'entries': []}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure_first_request(server, workdir: str, scenario: str, run_id: int):
+    """프로세스 생성부터 첫 HTTP 요청 수신까지, 그리고 프로세스 종료까지 걸린 시간 (ms)"""
+    env = {key: value for key, value in os.environ.items()
+           if key not in ('LUMA_API_KEY', 'TELEGRAM_BOT_TOKEN', 'TELEGRAM_CHAT_ID')}
+    env['LUMA_API_BASE_URL'] = f"http://127.0.0.1:{server.server_port}"
+    env['NO_PROXY'] = '127.0.0.1'
+    server.run_id = run_id
+    started = time.perf_counter()
+    subprocess.run([sys.executable] + SCENARIOS[scenario], cwd=workdir, env=env,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    finished = time.perf_counter()
+    first_request_at = server.first_request_at.get(run_id)
+    if first_request_at is None:
+        raise RuntimeError(f"{scenario}: 봇이 HTTP 요청을 보내지 않았습니다.")
+    return (first_request_at - started) * 1000, (finished - started) * 1000
+
+
+def import_breakdown(workdir: str, scenario: str, top: int):
+    """`-X importtime`으로 측정한 누적 임포트 시간 상위 모듈 (us)"""
+    if scenario == 'eager':
+        code = "import requests, dotenv, luma_checkin_bot"
+    else:
+        code = "import luma_checkin_bot"
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(BOT_PATH))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=workdir,
+                            env=env, capture_output=True, text=True, check=False)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, self_us, cumulative_us, name = line.replace(':', '|', 1).split('|')
+        name = name.rstrip()
+        # 최상위 모듈(들여쓰기 없음)만 집계
+        if len(name) - len(name.lstrip()) == 1:
+            rows.append((int(cumulative_us), name.strip()))
+    rows.sort(reverse=True)
+    return sum(cumulative for cumulative, _ in rows), rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="단발성 실행 시작 시간 벤치마크")
+    parser.add_argument('--runs', type=int, default=20, help="시나리오별 반복 횟수")
+    parser.add_argument('--top', type=int, default=10, help="출력할 임포트 상위 모듈 수")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='luma-bench-')
+    with open(os.path.join(workdir, '.env'), 'w') as f:
+        f.write(ENV_CONTENT)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _FirstRequestHandler)
+    server.first_request_at = {}
+    server.run_id = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        print("=== 모듈 임포트 시간 (누적, 최상위 모듈) ===")
+        for scenario in SCENARIOS:
+            total_us, rows = import_breakdown(workdir, scenario, args.top)
+            print(f"\n[{scenario}] 합계 {total_us / 1000:.1f} ms")
+            for cumulative_us, name in rows:
+                print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+        samples = {scenario: ([], []) for scenario in SCENARIOS}
+        run_id = 0
+        # 첫 라운드는 스냅샷/바이트코드 생성을 위한 워밍업, 이후 시나리오를 번갈아 실행해 잡음을 분산
+        for i in range(args.runs + 1):
+            for scenario in SCENARIOS:
+                run_id += 1
+                first_request_ms, total_ms = measure_first_request(server, workdir, scenario, run_id)
+                if i > 0:
+                    samples[scenario][0].append(first_request_ms)
+                    samples[scenario][1].append(total_ms)
+
+        for title, index in (("첫 HTTP 요청까지 걸린 시간", 0), ("전체 실행 시간 (라이브 이벤트 없음)", 1)):
+            print(f"\n=== {title} ===")
+            medians = {}
+            for scenario in SCENARIOS:
+                values = samples[scenario][index]
+                medians[scenario] = statistics.median(values)
+                print(f"[{scenario}] 중앙값 {medians[scenario]:.1f} ms "
+                      f"(최소 {min(values):.1f} ms, 최대 {max(values):.1f} ms, {args.runs}회)")
+            saved = medians['eager'] - medians['fast']
+            print(f"단축: {saved:.1f} ms ({saved / medians['eager'] * 100:.1f}%)")
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
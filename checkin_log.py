@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+체크인 기록 로그
+
+봇이 찾은 체크인을 감지 시각, 전송 시각과 함께 이벤트별 추가 전용(append-only) 로그 파일에 남겨,
+행사가 끝난 뒤 도착 추이 분석이나 보고서(report.py)에 사용합니다.
+
+- `<CHECKIN_LOG_DIR>/<event_id>.log`: 체크인 한 건당 한 줄 (탭 구분)
+      체크인 시각  감지 시각  전송 시각(0이면 묶음/미전송)  참석자 ID  티켓 종류  VIP(0/1)  이름
+  시각은 모두 UTC epoch 초입니다.
+- `<CHECKIN_LOG_DIR>/<event_id>.idx`: 로그를 약 64KB 블록으로 나눈 희소 시간 인덱스
+  (블록 시작 위치, 길이, 블록 안 체크인 시각 최솟값/최댓값, 건수)
+
+구간 조회("18:00~18:30 도착")와 분 단위 히스토그램은 로그 파일을 메모리 매핑(mmap)하고
+인덱스에서 구간과 겹치는 블록만 읽으므로, 며칠에 걸친 10만 건 로그도 파일 전체를 읽지 않습니다.
+"""
+
+import os
+import mmap
+import fcntl
+import struct
+import logging
+import calendar
+from datetime import datetime
+from typing import List, Dict, Iterator, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 인덱스 블록 크기 (바이트)
+BLOCK_BYTES = 64 * 1024
+
+# 인덱스 항목: 블록 시작 위치, 길이, 체크인 시각 최솟값, 최댓값, 건수
+_INDEX_ENTRY = struct.Struct('<QIqqI')
+
+
+class CheckinRecord(NamedTuple):
+    checked_in_at: int
+    detected_at: int
+    delivered_at: int
+    guest_id: str
+    ticket_type: str
+    vip: bool
+    name: str
+
+
+def epoch(moment: Optional[datetime]) -> int:
+    """tzinfo 없는 UTC datetime -> epoch 초 (None이면 0)"""
+    return calendar.timegm(moment.utctimetuple()) if moment else 0
+
+
+def _clean(text: Optional[str]) -> str:
+    return (text or '').replace('\t', ' ').replace('\n', ' ').replace('\r', ' ')
+
+
+def encode_record(record: CheckinRecord) -> bytes:
+    return (
+        f"{record.checked_in_at}\t{record.detected_at}\t{record.delivered_at}\t{_clean(record.guest_id)}\t"
+        f"{_clean(record.ticket_type)}\t{int(record.vip)}\t{_clean(record.name)}\n"
+    ).encode('utf-8')
+
+
+def decode_record(line: bytes) -> Optional[CheckinRecord]:
+    """로그 한 줄을 기록으로 변환 (기록 중 중단된 줄 등 형식이 맞지 않으면 None)"""
+    fields = line.decode('utf-8', 'replace').split('\t')
+    if len(fields) != 7:
+        return None
+    try:
+        return CheckinRecord(int(fields[0]), int(fields[1]), int(fields[2]), fields[3], fields[4],
+                             fields[5] == '1', fields[6])
+    except ValueError:
+        return None
+
+
+def _checked_in_at(line: bytes) -> Optional[int]:
+    """줄 전체를 해석하지 않고 체크인 시각만 읽음"""
+    tab = line.find(b'\t')
+    try:
+        return int(line[:tab]) if tab > 0 else None
+    except ValueError:
+        return None
+
+
+def _safe_name(event_id: str) -> str:
+    return "".join(c if c.isalnum() or c in '-_' else '_' for c in event_id)
+
+
+class CheckinLog:
+    """이벤트별 체크인 기록 로그 디렉터리"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def paths(self, event_id: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, _safe_name(event_id))
+        return f"{base}.log", f"{base}.idx"
+
+    def events(self) -> List[str]:
+        """기록이 있는 이벤트 ID(파일 이름) 목록"""
+        try:
+            return sorted(name[:-4] for name in os.listdir(self.directory) if name.endswith('.log'))
+        except FileNotFoundError:
+            return []
+
+    def append(self, event_id: str, records: List[CheckinRecord]):
+        """체크인 기록 추가 (로그 끝에 쓰고, 인덱스에 들어가지 않은 끝부분이 블록 크기를 넘으면 인덱스 추가)"""
+        if not records:
+            return
+        log_path, index_path = self.paths(event_id)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(log_path, 'a+b') as log_file:
+                fcntl.flock(log_file, fcntl.LOCK_EX)
+                try:
+                    data = b"".join(encode_record(record) for record in records)
+                    # 기록 중 중단돼 줄바꿈 없이 끝난 줄이 있으면 새 기록이 그 줄에 붙지 않도록 줄을 바꿈
+                    if log_file.seek(0, os.SEEK_END):
+                        log_file.seek(-1, os.SEEK_END)
+                        if log_file.read(1) != b'\n':
+                            data = b'\n' + data
+                    log_file.write(data)
+                    log_file.flush()
+                    self._index_tail(log_path, index_path, log_file.tell())
+                finally:
+                    fcntl.flock(log_file, fcntl.LOCK_UN)
+        except OSError as e:
+            logger.warning("이벤트 %s 체크인 기록 저장 실패: %s", event_id, e)
+
+    @staticmethod
+    def _index_tail(log_path: str, index_path: str, size: int):
+        indexed_end = 0
+        try:
+            index_size = os.path.getsize(index_path)
+            # 마지막 항목 이후에 기록 중 중단된 불완전한 항목이 있으면 무시
+            index_size -= index_size % _INDEX_ENTRY.size
+            if index_size:
+                with open(index_path, 'rb') as f:
+                    f.seek(index_size - _INDEX_ENTRY.size)
+                    offset, length, _, _, _ = _INDEX_ENTRY.unpack(f.read(_INDEX_ENTRY.size))
+                    indexed_end = offset + length
+        except FileNotFoundError:
+            index_size = 0
+        if size - indexed_end < BLOCK_BYTES:
+            return
+
+        entries = []
+        with open(log_path, 'rb') as f:
+            f.seek(indexed_end)
+            tail = f.read(size - indexed_end)
+        start = 0
+        while len(tail) - start >= BLOCK_BYTES:
+            # 블록 크기를 넘는 첫 줄 끝에서 블록을 나눔
+            end = tail.find(b'\n', start + BLOCK_BYTES - 1)
+            if end < 0:
+                break
+            block = tail[start:end + 1]
+            times = [t for t in map(_checked_in_at, block.splitlines()) if t is not None]
+            entries.append(_INDEX_ENTRY.pack(
+                indexed_end + start, len(block), min(times, default=0), max(times, default=0), len(times)
+            ))
+            start = end + 1
+        if entries:
+            with open(index_path, 'r+b' if index_size else 'wb') as f:
+                f.seek(index_size)
+                f.truncate()
+                f.write(b"".join(entries))
+
+    def open(self, event_id: str) -> 'CheckinLogReader':
+        log_path, index_path = self.paths(event_id)
+        return CheckinLogReader(log_path, index_path)
+
+
+class CheckinLogReader:
+    """메모리 매핑한 체크인 기록 로그 읽기 (with 문으로 사용)"""
+
+    def __init__(self, log_path: str, index_path: str):
+        self._file = open(log_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.size = size
+        # (블록 시작 위치, 길이, 최솟값, 최댓값, 건수)
+        self.blocks: List[Tuple[int, int, int, int, int]] = []
+        try:
+            with open(index_path, 'rb') as f:
+                data = f.read()
+            usable = len(data) - len(data) % _INDEX_ENTRY.size
+            self.blocks = [entry for entry in _INDEX_ENTRY.iter_unpack(data[:usable]) if entry[0] + entry[1] <= size]
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> 'CheckinLogReader':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def _spans(self, start: Optional[int], end: Optional[int]) -> Iterator[Tuple[int, int]]:
+        """조회 구간과 겹칠 수 있는 (시작 위치, 끝 위치) 구간 (인덱스에 없는 끝부분 포함)"""
+        indexed_end = 0
+        for offset, length, low, high, _ in self.blocks:
+            indexed_end = offset + length
+            if (start is not None and high < start) or (end is not None and low >= end):
+                continue
+            yield offset, offset + length
+        if indexed_end < self.size:
+            yield indexed_end, self.size
+
+    def lines(self, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[bytes]:
+        """체크인 시각이 [start, end) 구간인 로그 줄 (기록 순서)"""
+        if self._map is None:
+            return
+        for span_start, span_end in self._spans(start, end):
+            for line in self._map[span_start:span_end].split(b'\n'):
+                if not line:
+                    continue
+                checked_in_at = _checked_in_at(line)
+                if checked_in_at is None:
+                    continue
+                if (start is None or checked_in_at >= start) and (end is None or checked_in_at < end):
+                    yield line
+
+    def records(self, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[CheckinRecord]:
+        """체크인 시각이 [start, end) 구간인 기록"""
+        for line in self.lines(start, end):
+            record = decode_record(line)
+            if record is not None:
+                yield record
+
+    def histogram(self, start: Optional[int] = None, end: Optional[int] = None,
+                  bucket_seconds: int = 60) -> Dict[int, int]:
+        """구간 안의 체크인 수를 bucket_seconds 단위로 집계 (구간 시작 epoch 초 -> 건수)"""
+        counts: Dict[int, int] = {}
+        for line in self.lines(start, end):
+            bucket = _checked_in_at(line) // bucket_seconds * bucket_seconds
+            counts[bucket] = counts.get(bucket, 0) + 1
+        return dict(sorted(counts.items()))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+미리 컴파일된 설정 스냅샷
+
+cron으로 매번 새로 실행될 때 python-dotenv를 임포트하고 `.env`를 파싱하는 비용을 없애기 위해,
+파싱 결과를 marshal 형식의 스냅샷 파일(`.env.snapshot`)로 저장해 두고 재사용합니다.
+`.env`의 수정 시각이나 크기가 바뀌면 스냅샷은 자동으로 다시 만들어집니다.
+스냅샷에는 `.env`의 비밀 값이 그대로 들어 있으므로 소유자만 읽을 수 있는 권한(0600)으로 저장합니다.
+
+배포 시 미리 스냅샷을 만들어 두려면:
+
+    python config_snapshot.py
+"""
+
+import os
+import sys
+import marshal
+from typing import Dict, Optional
+
+SNAPSHOT_VERSION = 1
+
+
+def _snapshot_path(env_file: str) -> str:
+    return f"{env_file}.snapshot"
+
+
+def _source_key(env_file: str):
+    st = os.stat(env_file)
+    return (os.path.abspath(env_file), st.st_mtime_ns, st.st_size)
+
+
+def compile_snapshot(env_file: str) -> Dict[str, str]:
+    """`.env`를 파싱해 스냅샷 파일로 저장하고 파싱 결과를 반환"""
+    from dotenv import dotenv_values
+
+    values = {key: value for key, value in dotenv_values(env_file).items() if value is not None}
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'source': _source_key(env_file),
+        'values': values,
+    }
+    tmp_path = f"{_snapshot_path(env_file)}.tmp"
+    try:
+        # API 키 등 비밀 값이 들어 있으므로 소유자만 읽을 수 있게 저장
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            marshal.dump(snapshot, f)
+        os.replace(tmp_path, _snapshot_path(env_file))
+    except OSError:
+        # 스냅샷을 쓸 수 없어도 설정 로드는 계속 진행
+        pass
+    return values
+
+
+def read_snapshot(env_file: str) -> Optional[Dict[str, str]]:
+    """최신 스냅샷이 있으면 그 값을, 없거나 오래되었으면 None을 반환"""
+    try:
+        with open(_snapshot_path(env_file), 'rb') as f:
+            snapshot = marshal.load(f)
+        if (snapshot.get('version') == SNAPSHOT_VERSION
+                and tuple(snapshot.get('source', ())) == _source_key(env_file)):
+            return snapshot['values']
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def read_config(env_file: str = '.env') -> Dict[str, str]:
+    """`.env` 값 (파일이 없으면 빈 사전, 스냅샷이 최신이면 dotenv 임포트와 파싱을 건너뜀)"""
+    if not os.path.exists(env_file):
+        return {}
+    values = read_snapshot(env_file)
+    if values is None:
+        values = compile_snapshot(env_file)
+    return values
+
+
+def load_config(env_file: str = '.env') -> bool:
+    """`.env` 값을 환경 변수로 로드 (이미 설정된 환경 변수는 덮어쓰지 않음)
+
+    load_dotenv()와 같은 동작이지만, 스냅샷이 최신이면 dotenv 임포트와 파싱을 건너뜁니다.
+    """
+    if not os.path.exists(env_file):
+        return False
+
+    for key, value in read_config(env_file).items():
+        os.environ.setdefault(key, value)
+    return True
+
+
+if __name__ == "__main__":
+    env_path = sys.argv[1] if len(sys.argv) > 1 else '.env'
+    if not os.path.exists(env_path):
+        print(f"❌ {env_path} 파일이 없습니다.")
+        sys.exit(1)
+    compiled = compile_snapshot(env_path)
+    print(f"✅ {_snapshot_path(env_path)} 생성 완료 ({len(compiled)}개 항목)")
@@ -0,0 +1,15 @@
+"""
+pytest 설정
+
+아래 스크립트는 실제 API 키로 Luma와 Telegram에 직접 요청하는 점검용 스크립트라서
+(임포트하는 순간 요청을 보냄) 테스트 수집에서 제외합니다. 필요할 때 `python test_guests.py`처럼 직접 실행하세요.
+"""
+
+collect_ignore = [
+    'simple_test.py',
+    'test_api_key.py',
+    'test_calendar_events.py',
+    'test_guests.py',
+    'test_luma_events.py',
+    'test_working_api.py',
+]
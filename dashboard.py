@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+이벤트 현황판 (고정 메시지)
+
+이벤트마다 스태프 채팅방에 현황판 메시지를 하나 보내 고정해 두고, 새 메시지를 보내는 대신
+editMessageText로 체크인/등록 인원, 최근 도착 10명, 도착한 VIP를 제자리에서 갱신합니다.
+
+- 체크인이 아무리 많아도 현황판은 DASHBOARD_INTERVAL_SECONDS마다 최대 한 번만 수정합니다.
+- 내용(갱신 시각 제외)의 해시가 마지막으로 보낸 것과 같으면 수정하지 않습니다.
+"""
+
+import html
+import hashlib
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+
+from attendance_stats import AttendanceStats, parse_utc
+from guest_index import guest_key, guest_checked_in_at, guest_ticket_type
+
+# 현황판에 보여 줄 최근 도착 인원
+MAX_ARRIVALS = 10
+
+
+def _kst(timestamp: Optional[str], fmt: str = '%H:%M') -> str:
+    moment = parse_utc(timestamp)
+    return (moment + timedelta(hours=9)).strftime(fmt) if moment else '-'
+
+
+class Dashboard:
+    """이벤트 하나의 현황판 메시지 상태 (이벤트 상태에 저장)"""
+
+    def __init__(self):
+        self.chat_id: Optional[str] = None
+        self.message_id: Optional[int] = None
+        # 마지막으로 보낸 내용의 해시와 수정 시각 (UTC ISO 8601)
+        self.content_hash: Optional[str] = None
+        self.edited_at: Optional[str] = None
+        # 최근 도착 [참석자 ID, 이름, 티켓 종류, 체크인 시각] (최근 순)
+        self.arrivals: List[List[str]] = []
+        # 도착한 VIP 이름 -> 체크인 시각
+        self.vips: Dict[str, str] = {}
+
+    def add_arrivals(self, guests: List[Dict]):
+        """새로 체크인한 참석자를 최근 도착 목록에 반영"""
+        arrivals = {entry[0]: entry for entry in self.arrivals}
+        for guest in guests:
+            checked_in_at = guest_checked_in_at(guest)
+            if guest_key(guest) and checked_in_at:
+                arrivals[guest_key(guest)] = [
+                    guest_key(guest), guest.get('name', '알 수 없음'), guest_ticket_type(guest), checked_in_at
+                ]
+        self.arrivals = sorted(
+            arrivals.values(), key=lambda entry: parse_utc(entry[3]) or datetime.min, reverse=True
+        )[:MAX_ARRIVALS]
+
+    def update_vip(self, guest: Dict):
+        """VIP 참석자의 체크인 여부 반영 (체크인 취소 시 제거)"""
+        name = guest.get('name', '알 수 없음')
+        checked_in_at = guest_checked_in_at(guest)
+        if checked_in_at:
+            self.vips[name] = checked_in_at
+        else:
+            self.vips.pop(name, None)
+
+    def render(self, event_name: str, stats: AttendanceStats) -> str:
+        """현황판 본문 (갱신 시각 제외)"""
+        rate = stats.checked_in / stats.registered * 100 if stats.registered else 0.0
+        lines = [
+            "📌 <b>실시간 현황판</b>",
+            "",
+            f"📅 <b>이벤트:</b> {html.escape(event_name)}",
+            f"✅ <b>체크인:</b> {stats.checked_in} / {stats.registered}명 ({rate:.1f}%)",
+        ]
+        if self.vips:
+            lines += ["", f"🌟 <b>도착한 VIP ({len(self.vips)}명):</b>"]
+            lines += [
+                f"• {html.escape(name)} ({_kst(checked_in_at)})"
+                for name, checked_in_at in sorted(self.vips.items(), key=lambda item: item[1])
+            ]
+        if self.arrivals:
+            lines += ["", f"🚶 <b>최근 도착 {len(self.arrivals)}명:</b>"]
+            lines += [
+                f"• {_kst(checked_in_at)} {html.escape(name)} ({html.escape(ticket_type)})"
+                for _, name, ticket_type, checked_in_at in self.arrivals
+            ]
+        return "\n".join(lines)
+
+    @staticmethod
+    def content_digest(body: str) -> str:
+        return hashlib.sha1(body.encode('utf-8')).hexdigest()
+
+    def due(self, now: datetime, interval_seconds: float) -> bool:
+        """수정 간격이 지났는지 (처음 보내는 경우 항상 True)"""
+        if self.message_id is None or not self.edited_at:
+            return True
+        return now - datetime.fromisoformat(self.edited_at) >= timedelta(seconds=interval_seconds)
+
+    @staticmethod
+    def with_timestamp(body: str, now: datetime) -> str:
+        return f"{body}\n\n🕒 마지막 갱신: {(now + timedelta(hours=9)).strftime('%H:%M:%S')} KST"
+
+    def to_dict(self) -> Dict:
+        return {
+            'chat_id': self.chat_id,
+            'message_id': self.message_id,
+            'content_hash': self.content_hash,
+            'edited_at': self.edited_at,
+            'arrivals': self.arrivals,
+            'vips': self.vips,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Dashboard':
+        dashboard = cls()
+        dashboard.chat_id = data.get('chat_id')
+        dashboard.message_id = data.get('message_id')
+        dashboard.content_hash = data.get('content_hash')
+        dashboard.edited_at = data.get('edited_at')
+        dashboard.arrivals = data.get('arrivals', [])
+        dashboard.vips = data.get('vips', {})
+        return dashboard
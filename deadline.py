@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+틱 실행 시간 예산
+
+- Deadline: 틱 하나에 허용된 시간 예산. 모든 API 호출의 타임아웃이 남은 예산을 넘지 않도록 하고,
+  예산을 다 쓰면 남은 작업(이벤트 처리, 알림 전송)을 다음 틱으로 미룹니다.
+- TickLock: 이전 틱이 아직 실행 중이면 새 틱을 쌓지 않고, 실행 중인 틱이 끝난 뒤 한 번으로 합쳐 실행합니다.
+- TickMetrics: 예산 사용량, 예산 초과, 미뤄진 작업, 합쳐진 틱 수, 레인별 알림 대기 시간을 파일에 누적합니다.
+"""
+
+import os
+import json
+import time
+import fcntl
+import logging
+from typing import List, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# API 호출 하나에 허용하는 최대/최소 타임아웃 (초)
+DEFAULT_REQUEST_TIMEOUT = 10.0
+MIN_REQUEST_TIMEOUT = 1.0
+
+# 참석자 페이지 조회를 멈추고 알림 전송에 남겨 둘 예산 비율
+SEND_RESERVE_RATIO = 0.2
+
+
+class DeadlineExceeded(Exception):
+    """틱 시간 예산을 모두 사용함"""
+
+
+class RequestBudgetExceeded(DeadlineExceeded):
+    """Luma API 요청 예산(rate_limit.RequestGovernor)이 부족해 남은 조회를 다음 틱으로 미룸"""
+
+
+class Deadline:
+    """틱 시간 예산 (단조 시계 기준)"""
+
+    def __init__(self, budget_seconds: float, wall_deadline: Optional[float] = None):
+        self.budget = budget_seconds
+        self.started = time.monotonic()
+        self.expires_at = self.started + budget_seconds
+        # 스케줄러가 넘겨준 절대 마감 시각(epoch)이 더 이르면 그쪽을 따름
+        if wall_deadline is not None:
+            self.expires_at = min(self.expires_at, self.started + (wall_deadline - time.time()))
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, stage: str, reserve_ratio: float = 0.0):
+        """남은 예산이 reserve_ratio 비율 이하이면 DeadlineExceeded 발생"""
+        if self.remaining() <= self.budget * reserve_ratio:
+            raise DeadlineExceeded(f"{stage}: 틱 시간 예산 {self.budget:.0f}초 초과")
+
+    def timeout(self, cap: float = DEFAULT_REQUEST_TIMEOUT) -> float:
+        """API 호출 타임아웃: 남은 예산과 cap 중 작은 값 (최소 MIN_REQUEST_TIMEOUT)"""
+        return max(min(cap, self.remaining()), MIN_REQUEST_TIMEOUT)
+
+
+def request_timeout(deadline: Optional[Deadline], cap: float = DEFAULT_REQUEST_TIMEOUT) -> float:
+    """데드라인이 없을 때도 쓸 수 있는 API 호출 타임아웃"""
+    return deadline.timeout(cap) if deadline else cap
+
+
+class TickLock:
+    """틱 중복 실행 방지 잠금 (프로세스 간 fcntl 잠금)
+
+    잠금을 얻지 못한 틱은 `<잠금 파일>.pending`에 건너뛴 횟수를 남기고 종료하며,
+    잠금을 가진 틱은 끝나기 전에 이 기록을 확인해 건너뛴 틱들을 한 번으로 합쳐 이어서 실행합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pending_path = f"{path}.pending"
+        self._file = None
+
+    def try_acquire(self) -> bool:
+        lock_file = open(self.path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    def mark_pending(self):
+        """실행 중인 틱이 있어 건너뛴 틱 기록"""
+        with open(self.pending_path, 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.write("1\n")
+
+    def pop_pending(self) -> int:
+        """건너뛴 틱 수를 가져오고 기록을 비움"""
+        try:
+            with open(self.pending_path, 'r+') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                count = len([line for line in f if line.strip()])
+                f.seek(0)
+                f.truncate()
+                return count
+        except FileNotFoundError:
+            return 0
+
+
+class TickMetrics:
+    """틱 예산 관련 누적 지표 (JSON 파일)"""
+
+    FIELDS = (
+        'ticks', 'budget_exceeded', 'coalesced_ticks',
+        'deferred_events', 'deferred_notifications',
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data: Dict = self._load()
+
+    def _load(self) -> Dict:
+        data = {field: 0 for field in self.FIELDS}
+        data.update({'last_usage': 0.0, 'max_usage': 0.0, 'total_usage': 0.0})
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data.update(json.load(f))
+        except (FileNotFoundError, ValueError):
+            pass
+        return data
+
+    def record_tick(self, deadline: Deadline, exceeded: bool, deferred_events: int,
+                    deferred_notifications: int, coalesced: int, lanes: Optional[Dict[str, List[float]]] = None):
+        usage = deadline.elapsed() / deadline.budget if deadline.budget else 0.0
+        self.data['ticks'] += 1
+        self.data['budget_exceeded'] += int(exceeded)
+        self.data['coalesced_ticks'] += coalesced
+        self.data['deferred_events'] += deferred_events
+        self.data['deferred_notifications'] += deferred_notifications
+        self.data['last_usage'] = round(usage, 4)
+        self.data['max_usage'] = round(max(self.data['max_usage'], usage), 4)
+        self.data['total_usage'] = round(self.data['total_usage'] + usage, 4)
+        # 레인별 알림 대기 시간 누적: 레인 이름 -> {sent, total_delay, max_delay, last_max_delay}
+        for name, (count, total, worst) in (lanes or {}).items():
+            lane = self.data.setdefault('lanes', {}).setdefault(
+                name, {'sent': 0, 'total_delay': 0.0, 'max_delay': 0.0, 'last_max_delay': 0.0}
+            )
+            lane['sent'] += int(count)
+            lane['total_delay'] = round(lane['total_delay'] + total, 3)
+            lane['max_delay'] = round(max(lane['max_delay'], worst), 3)
+            lane['last_max_delay'] = round(worst, 3)
+        self._save()
+
+    def average_usage(self) -> float:
+        return self.data['total_usage'] / self.data['ticks'] if self.data['ticks'] else 0.0
+
+    def _save(self):
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("틱 지표 저장 실패: %s", e)
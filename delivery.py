@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+채팅방별 병렬 전송
+
+채팅방마다 보낼 메시지 묶음을 하나의 작업으로 만들어 스레드 풀에서 동시에 실행합니다.
+한 채팅방 안에서는 순서대로 보내므로 순서가 유지되고, 채팅방끼리는 서로 기다리지 않으므로
+느리거나 실패하는 채팅방이 다른 채팅방의 전송을 늦추지 않습니다.
+
+채팅방 안의 알림은 우선순위 레인(VIP/멘션 -> 일반 -> 요약) 순으로 보내므로, 체크인이 몰려도
+VIP 알림이 일반 알림 뒤에서 기다리지 않고, 전송 속도 제한이나 시간 예산 때문에 미룰 때는 낮은 레인부터 밀립니다.
+레인별 대기 시간(대기열에 넣은 시각부터 실제 전송 시각까지)은 LaneMetrics로 측정합니다.
+"""
+
+import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+Item = TypeVar('Item')
+
+# 우선순위 레인 (숫자가 작을수록 먼저 전송)
+LANE_VIP = 0
+LANE_REGULAR = 1
+LANE_SUMMARY = 2
+LANE_NAMES = ('vip', 'regular', 'summary')
+
+
+class Notification(NamedTuple):
+    """채팅방 하나로 보낼 알림 (일괄 요약이면 참석자가 여러 명)"""
+    guests: List[Dict]
+    message: str
+    lane: int
+    # 대기열에 넣은 시각 (time.monotonic)
+    queued_at: float
+
+
+def prioritize(items: List[Notification]) -> List[Notification]:
+    """레인 순으로 정렬 (같은 레인 안에서는 원래 순서 유지)"""
+    return sorted(items, key=lambda item: item.lane)
+
+
+class LaneMetrics:
+    """틱 하나 동안의 레인별 대기 시간 (여러 전송 스레드에서 기록)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            # 레인 이름 -> [전송 수, 대기 시간 합계, 최대 대기 시간]
+            self.lanes: Dict[str, List[float]] = {}
+
+    def record(self, lane: int, sent_at: float, queued_at: float):
+        delay = max(sent_at - queued_at, 0.0)
+        with self._lock:
+            stats = self.lanes.setdefault(LANE_NAMES[lane], [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += delay
+            stats[2] = max(stats[2], delay)
+
+    def snapshot(self) -> Dict[str, List[float]]:
+        with self._lock:
+            return {name: list(stats) for name, stats in self.lanes.items()}
+
+    def format(self) -> str:
+        """로그용 레인별 요약 (평균/최대 대기 초)"""
+        return ", ".join(
+            f"{name} {int(count)}건 평균 {total / count:.2f}초 최대 {worst:.2f}초"
+            for name, (count, total, worst) in sorted(self.snapshot().items(), key=lambda item: LANE_NAMES.index(item[0]))
+            if count
+        )
+
+
+def deliver_per_chat(batches: Dict[str, List[Item]],
+                     send_batch: Callable[[str, List[Item]], List[Item]],
+                     max_workers: int = 4) -> Dict[str, List[Item]]:
+    """채팅방별 묶음을 동시에 전송하고 채팅방별로 보내지 못한(미룬) 항목 반환
+
+    send_batch(chat_id, items)는 한 채팅방의 항목을 순서대로 보내고 미룬 항목을 돌려줍니다.
+    한 채팅방에서 예외가 나도 다른 채팅방 전송은 계속되며, 해당 채팅방 항목은 모두 미룬 항목으로 돌려줘
+    예산 때문에 미룬 항목처럼 다음 틱에 다시 보냅니다.
+    """
+    deferred: Dict[str, List[Item]] = {}
+    batches = {chat_id: items for chat_id, items in batches.items() if items}
+    if not batches:
+        return deferred
+
+    def run(chat_id: str, items: List[Item]) -> List[Item]:
+        try:
+            return send_batch(chat_id, items)
+        except Exception as e:
+            logger.error("채팅방 %s 전송 중 오류 발생 (%s건), 다음 틱으로 미룹니다: %s", chat_id, len(items), e,
+                         exc_info=True)
+            return items
+
+    # 채팅방이 하나면 스레드 없이 바로 전송
+    if len(batches) == 1 or max_workers <= 1:
+        for chat_id, items in batches.items():
+            deferred[chat_id] = run(chat_id, items)
+        return deferred
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batches)), thread_name_prefix='delivery') as pool:
+        # 틱 상관관계 ID 등 컨텍스트 변수가 작업 스레드 로그에도 남도록 컨텍스트를 복사해 실행
+        futures = {
+            chat_id: pool.submit(contextvars.copy_context().run, run, chat_id, items)
+            for chat_id, items in batches.items()
+        }
+        for chat_id, future in futures.items():
+            deferred[chat_id] = future.result()
+    return deferred
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+체크인 다이제스트(묶음 알림)
+
+참석자가 몰리는 대형 이벤트에서 체크인마다 메시지를 보내는 대신,
+채팅방별로 일정 시간(윈도우) 동안의 체크인을 모아 티켓 종류별로 묶은 요약 메시지 하나로 보냅니다.
+다운타임 후 밀린 체크인을 한꺼번에 알릴 때도 같은 형식의 일괄 요약 메시지를 사용합니다.
+"""
+
+import html
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Tuple
+
+from guest_index import guest_ticket_type
+
+# Telegram 메시지 최대 길이 (여유분 포함)
+MAX_MESSAGE_LENGTH = 4000
+
+# 티켓 종류별로 이름을 나열할 최대 인원
+MAX_NAMES_PER_GROUP = 30
+
+# (이벤트 ID, 이벤트 이름, 티켓 종류, 참석자 이름)
+DigestEntry = Tuple[str, str, str, str]
+
+
+def digest_entry(event_id: str, event_name: str, guest: Dict) -> DigestEntry:
+    """참석자 정보를 요약 메시지 항목으로 변환"""
+    return (event_id, event_name, guest_ticket_type(guest), guest.get('name', '알 수 없음'))
+
+
+class DigestBuffer:
+    """채팅방별 다이제스트 대기열"""
+
+    def __init__(self, window_seconds: int):
+        self.window = timedelta(seconds=window_seconds)
+        # 채팅방 ID -> (윈도우 시작 시각, 대기 중인 체크인 목록)
+        self.pending: Dict[str, Tuple[datetime, List[DigestEntry]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(entries) for _, entries in self.pending.values())
+
+    def add(self, chat_id: str, event_id: str, event_name: str, guest: Dict, now: datetime):
+        """체크인 하나를 채팅방 대기열에 추가 (대기열이 비어 있으면 새 윈도우 시작)"""
+        if chat_id not in self.pending:
+            self.pending[chat_id] = (now, [])
+        self.pending[chat_id][1].append(digest_entry(event_id, event_name, guest))
+
+    def due_chats(self, now: datetime, force: bool = False) -> List[str]:
+        """윈도우가 끝나 전송할 차례인 채팅방 목록"""
+        return [
+            chat_id for chat_id, (opened_at, _) in self.pending.items()
+            if force or now - opened_at >= self.window
+        ]
+
+    def pop(self, chat_id: str) -> List[DigestEntry]:
+        """채팅방 대기열을 비우고 대기 중이던 체크인 목록 반환"""
+        _, entries = self.pending.pop(chat_id, (None, []))
+        return entries
+
+    def requeue(self, chat_id: str, entries: List[DigestEntry], now: datetime):
+        """전송하지 못한 체크인을 대기열 앞에 되돌림 (다음 전송 때 바로 다시 시도)"""
+        if not entries:
+            return
+        _, newer = self.pending.pop(chat_id, (None, []))
+        self.pending[chat_id] = (now - self.window, entries + newer)
+
+
+def format_digest(entries: List[DigestEntry], window_seconds: int) -> str:
+    """다이제스트 메시지 포맷팅 (이벤트 -> 티켓 종류별로 묶음)"""
+    return _format_grouped(f"📋 <b>체크인 요약</b> (최근 {window_seconds}초, {len(entries)}명)", entries)
+
+
+def format_backlog(entries: List[DigestEntry], since: datetime, until: datetime) -> str:
+    """다운타임 등으로 밀린 체크인을 한 번에 알리는 일괄 요약 메시지 포맷팅"""
+    # 한국 시간으로 표시 (UTC+9)
+    start = (since + timedelta(hours=9)).strftime('%m-%d %H:%M')
+    end = (until + timedelta(hours=9)).strftime('%m-%d %H:%M')
+    return _format_grouped(f"⏪ <b>밀린 체크인 일괄 요약</b> ({start} ~ {end} KST, {len(entries)}명)", entries)
+
+
+def _format_grouped(header: str, entries: List[DigestEntry]) -> str:
+    """체크인 목록을 이벤트 -> 티켓 종류별로 묶은 메시지"""
+    grouped: Dict[str, Dict[str, List[str]]] = {}
+    for _, event_name, ticket_type, name in entries:
+        grouped.setdefault(event_name, {}).setdefault(ticket_type, []).append(name)
+
+    lines = [header]
+    for event_name, by_ticket in grouped.items():
+        lines.append("")
+        lines.append(f"📅 <b>이벤트:</b> {html.escape(event_name)}")
+        for ticket_type, names in sorted(by_ticket.items(), key=lambda item: -len(item[1])):
+            shown = ", ".join(html.escape(name) for name in names[:MAX_NAMES_PER_GROUP])
+            if len(names) > MAX_NAMES_PER_GROUP:
+                shown += f" 외 {len(names) - MAX_NAMES_PER_GROUP}명"
+            lines.append(f"🏷️ <b>{html.escape(ticket_type)}</b> ({len(names)}명): {shown}")
+
+    # HTML 태그가 잘리지 않도록 줄 단위로 길이 제한
+    message = ""
+    for line in lines:
+        if len(message) + len(line) + 1 > MAX_MESSAGE_LENGTH:
+            message += "\n… 이하 생략"
+            break
+        message = f"{message}\n{line}" if message else line
+    return message
+
+
+def parse_chat_modes(value: Optional[str]) -> Dict[str, str]:
+    """`채팅방ID:모드,채팅방ID:모드` 형식의 채팅방별 전송 모드 설정 파싱"""
+    modes = {}
+    for item in (value or '').split(','):
+        chat_id, _, mode = item.strip().rpartition(':')
+        if chat_id and mode:
+            modes[chat_id.strip()] = mode.strip()
+    return modes
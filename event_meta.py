@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+이벤트 메타데이터 캐시
+
+라이브 이벤트 목록에는 이벤트 이름과 ID 정도만 있어, 장소, 시작/종료 시각, 정원 같은 정보는
+이벤트 상세 조회(`/public/v1/event/{id}`)로 따로 가져와야 합니다. 이 정보를 이벤트 ID별로
+JSON 파일에 캐시해 두고 TTL이 지나면 백그라운드 스레드에서 새로 고칩니다.
+
+- 단발성 실행(cron)과 데몬 모드 모두 시작할 때 파일에서 캐시를 읽어 오므로(warm start),
+  틱 처리 중에는 이벤트 정보를 얻으려고 API 호출을 기다리지 않습니다.
+- 캐시가 오래됐어도 새로 고치는 동안에는 이전 값을 그대로 사용합니다.
+"""
+
+import os
+import html
+import json
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Callable, List, Dict, Optional
+
+from attendance_stats import parse_utc
+
+logger = logging.getLogger(__name__)
+
+# 이 기간 동안 조회하지 않은 이벤트는 캐시에서 제거 (초)
+EVICT_AFTER_SECONDS = 7 * 24 * 3600
+
+
+def extract_metadata(event: Dict) -> Dict:
+    """이벤트 상세 응답에서 캐시할 정보만 추림"""
+    event = event.get('event', event)
+    address = event.get('geo_address_json') or {}
+    venue = address.get('description') or address.get('full_address') or address.get('address')
+    if not venue and event.get('meeting_url'):
+        venue = '온라인'
+    capacity = None
+    for key in ('capacity', 'max_capacity', 'guest_limit'):
+        if isinstance(event.get(key), int):
+            capacity = event[key]
+            break
+    return {
+        'name': event.get('name'),
+        'start_at': event.get('start_at'),
+        'end_at': event.get('end_at'),
+        'timezone': event.get('timezone'),
+        'venue': venue,
+        'capacity': capacity,
+        'url': event.get('url'),
+        'registration_questions': event.get('registration_questions') or [],
+    }
+
+
+def upcoming_events(entries: List[Dict], now: datetime, lead_minutes: float) -> List[Dict]:
+    """캘린더 이벤트 목록 중 lead_minutes분 안에 시작하는 이벤트 (시작 순)"""
+    upcoming = []
+    for entry in entries:
+        event = entry.get('event', entry)
+        start_at = parse_utc(event.get('start_at'))
+        if event.get('api_id') and start_at and now < start_at <= now + timedelta(minutes=lead_minutes):
+            upcoming.append((start_at, event))
+    upcoming.sort(key=lambda item: item[0])
+    return [event for _, event in upcoming]
+
+
+def format_event_context(meta: Optional[Dict]) -> str:
+    """요약 메시지에 붙일 이벤트 정보 (장소, 일정 KST, 정원)"""
+    if not meta:
+        return ""
+    lines = []
+    if meta.get('venue'):
+        lines.append(f"📍 <b>장소:</b> {html.escape(meta['venue'])}")
+    start_at = parse_utc(meta.get('start_at'))
+    end_at = parse_utc(meta.get('end_at'))
+    if start_at:
+        # 한국 시간으로 변환 (UTC+9)
+        schedule = (start_at + timedelta(hours=9)).strftime('%m-%d %H:%M')
+        if end_at:
+            schedule += (end_at + timedelta(hours=9)).strftime(' ~ %H:%M')
+        lines.append(f"🕒 <b>일정:</b> {schedule} KST")
+    if meta.get('capacity'):
+        lines.append(f"👥 <b>정원:</b> {meta['capacity']:,}명")
+    return "\n".join(lines)
+
+
+class EventMetadataCache:
+    """이벤트 ID -> 메타데이터 캐시 (JSON 파일, TTL 만료 시 백그라운드 새로 고침)
+
+    fetch(event_id)는 이벤트 상세 응답을 돌려주거나 실패 시 None을 돌려주는 함수입니다.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, fetch: Optional[Callable[[str], Optional[Dict]]] = None):
+        self.path = path
+        self.ttl = ttl_seconds
+        self.fetch = fetch
+        self._lock = threading.Lock()
+        self._dirty = False
+        # 이벤트 ID -> {'fetched_at': epoch 초, 'used_at': epoch 초, 'meta': 메타데이터}
+        self._entries: Dict[str, Dict] = {}
+        self._refreshing: Dict[str, Future] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+            logger.debug("이벤트 메타데이터 캐시 %s건을 불러왔습니다.", len(self._entries))
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, event_id: str) -> Optional[Dict]:
+        """캐시된 메타데이터 (없으면 None), 없거나 TTL이 지났으면 백그라운드 새로 고침 시작"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(event_id)
+            if entry is not None:
+                entry['used_at'] = now
+            stale = entry is None or now - entry['fetched_at'] >= self.ttl
+        if stale:
+            self._refresh(event_id)
+        return entry['meta'] if entry else None
+
+    def _refresh(self, event_id: str):
+        if self.fetch is None:
+            return
+        with self._lock:
+            if event_id in self._refreshing:
+                return
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='event-meta')
+            self._refreshing[event_id] = self._pool.submit(self._load, event_id)
+
+    def _load(self, event_id: str):
+        try:
+            event = self.fetch(event_id)
+            if event:
+                self.put(event_id, extract_metadata(event))
+                logger.debug("이벤트 %s 메타데이터를 새로 고쳤습니다.", event_id)
+        except Exception as e:
+            logger.warning("이벤트 %s 메타데이터 조회 실패: %s", event_id, e)
+        finally:
+            with self._lock:
+                self._refreshing.pop(event_id, None)
+
+    def put(self, event_id: str, meta: Dict):
+        now = time.time()
+        with self._lock:
+            self._entries[event_id] = {'fetched_at': now, 'used_at': now, 'meta': meta}
+            self._dirty = True
+
+    def wait(self, timeout: float):
+        """진행 중인 새로 고침을 최대 timeout초 기다림 (단발성 실행 종료 전)"""
+        with self._lock:
+            pending = list(self._refreshing.values())
+        if pending:
+            wait(pending, timeout=max(timeout, 0))
+
+    def save(self):
+        """변경된 경우에만 파일로 저장 (오래 조회하지 않은 이벤트는 제거, 임시 파일에 쓴 뒤 교체)"""
+        now = time.time()
+        with self._lock:
+            expired = [
+                event_id for event_id, entry in self._entries.items()
+                if now - entry.get('used_at', entry['fetched_at']) > EVICT_AFTER_SECONDS
+            ]
+            for event_id in expired:
+                del self._entries[event_id]
+            if not self._dirty and not expired:
+                return
+            data = dict(self._entries)
+            self._dirty = False
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("이벤트 메타데이터 캐시 저장 실패: %s", e)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+이벤트별 봇 상태 저장소
+
+단발성 실행(cron) 사이에도 이벤트별 참석자 인덱스, 참석 통계, 참석자 목록 동기화 진행 상황이 유지되도록
+이벤트마다 JSON 파일 하나(`<STATE_DIR>/<event_id>.json`)로 저장합니다.
+데몬 모드에서는 메모리에 올려 둔 상태를 그대로 재사용하고 틱이 끝날 때만 저장합니다.
+
+참석자 인덱스와 참석 통계는 크기가 커서 JSON 대신 바이너리 스냅샷(`<event_id>.guests`, guest_snapshot.py)으로
+따로 저장합니다. 단발성 실행은 상태를 저장할 때마다, 데몬 모드는 snapshot_interval초마다와 종료할 때 저장합니다.
+상태 파일에는 마지막으로 맞춰 저장한 스냅샷의 식별자를 남겨, 재시작 후 스냅샷이 상태 파일보다 오래됐으면
+진행 중이던 동기화를 처음부터 다시 해 그동안의 변경분을 반영합니다.
+"""
+
+import os
+import json
+import time
+import logging
+from datetime import datetime
+from typing import List, Dict, Optional, Set, Tuple
+
+from guest_index import GuestIndex
+from attendance_stats import AttendanceStats
+from registration import QuestionSchema
+from dashboard import Dashboard
+from guest_snapshot import SnapshotError, read_snapshot, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+class SyncCheckpoint:
+    """참석자 전체 목록 동기화(페이지 조회) 진행 상황
+
+    참석자가 많아 한 틱 안에 모든 페이지를 조회하지 못하면 다음 페이지 커서와
+    지금까지 본 참석자 ID를 저장해 두고, 다음 틱에서 첫 페이지부터 다시 조회하지 않고 이어서 조회합니다.
+    """
+
+    def __init__(self):
+        # 다음에 조회할 페이지 커서 (None이면 첫 페이지부터)
+        self.cursor: Optional[str] = None
+        # 이번 동기화에서 지금까지 본 참석자 ID
+        self.seen: Set[str] = set()
+        self.pages = 0
+        self.ticks = 0
+        # 이번 동기화 시작 시각과 마지막 전체 동기화 완료 시각 (UTC ISO 8601)
+        self.started_at: Optional[str] = None
+        self.last_completed_at: Optional[str] = None
+        # 마지막 전체 동기화의 참석자 수 (진행률 추정용)
+        self.last_total = 0
+
+    @property
+    def in_progress(self) -> bool:
+        return self.cursor is not None
+
+    def advance(self, next_cursor: Optional[str]):
+        """페이지 하나 조회 완료"""
+        self.pages += 1
+        self.cursor = next_cursor
+
+    def complete(self, now: datetime):
+        """전체 동기화 완료 후 다음 동기화를 위해 초기화"""
+        self.last_total = len(self.seen)
+        self.last_completed_at = now.isoformat()
+        self.reset()
+
+    def reset(self):
+        self.cursor = None
+        self.seen = set()
+        self.pages = 0
+        self.ticks = 0
+        self.started_at = None
+
+    def progress(self) -> str:
+        """진행 상황 문자열"""
+        text = f"{len(self.seen):,}명 (페이지 {self.pages}, 틱 {self.ticks}회)"
+        if self.last_total:
+            text += f", 이전 전체 {self.last_total:,}명 기준 {min(len(self.seen) / self.last_total, 1.0) * 100:.0f}%"
+        return text
+
+    def to_dict(self) -> Dict:
+        return {
+            'cursor': self.cursor,
+            'seen': list(self.seen),
+            'pages': self.pages,
+            'ticks': self.ticks,
+            'started_at': self.started_at,
+            'last_completed_at': self.last_completed_at,
+            'last_total': self.last_total,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SyncCheckpoint':
+        sync = cls()
+        sync.cursor = data.get('cursor')
+        sync.seen = set(data.get('seen', []))
+        sync.pages = data.get('pages', 0)
+        sync.ticks = data.get('ticks', 0)
+        sync.started_at = data.get('started_at')
+        sync.last_completed_at = data.get('last_completed_at')
+        sync.last_total = data.get('last_total', 0)
+        return sync
+
+
+class EventState:
+    """이벤트 하나에 대한 봇의 누적 상태"""
+
+    def __init__(self, event_id: str):
+        self.event_id = event_id
+        self.guest_index = GuestIndex()
+        self.stats = AttendanceStats()
+        # 마지막 요약 메시지 전송 시각 (UTC ISO 8601)
+        self.last_summary_at: Optional[str] = None
+        # 워터마크: 이 시각 이전의 체크인은 모두 처리함 (UTC ISO 8601, 다운타임 후 이 시각부터 따라잡음)
+        self.watermark: Optional[str] = None
+        # 워터마크 이후 체크인 중 이미 알림을 보낸 참석자 ID -> 체크인 시각 (검색 구간이 겹쳐도 한 번만 전송)
+        self.notified: Dict[str, str] = {}
+        # 틱 시간 예산 부족으로 보내지 못한 체크인 알림 {'guest': 참석자, 'chats': [채팅방 ID]} (다음 틱에서 먼저 전송)
+        self.deferred_checkins: List[Dict] = []
+        # 전송에 실패한 다이제스트 항목: 채팅방 ID -> [이벤트 ID, 이벤트 이름, 티켓 종류, 이름] 목록 (다음 틱에서 다시 전송)
+        self.pending_digest: Dict[str, List[List[str]]] = {}
+        # 참석자 전체 목록 동기화 체크포인트
+        self.sync = SyncCheckpoint()
+        # 등록 질문 목록 (알림에 표시할 등록 답변 조회용)
+        self.questions = QuestionSchema()
+        # 고정 현황판 메시지 상태
+        self.dashboard = Dashboard()
+
+    def advance_watermark(self, watermark: str):
+        """워터마크를 앞으로 옮기고 그 이전 체크인의 전송 기록은 정리"""
+        if self.watermark and watermark <= self.watermark:
+            return
+        self.watermark = watermark
+        self.notified = {
+            guest_id: checked_in_at for guest_id, checked_in_at in self.notified.items()
+            if checked_in_at >= watermark
+        }
+
+    def to_dict(self, include_index: bool = True) -> Dict:
+        """상태를 사전으로 변환 (include_index가 False이면 스냅샷으로 따로 저장하는 참석자 인덱스와 통계 제외)"""
+        data = {
+            'event_id': self.event_id,
+            'last_summary_at': self.last_summary_at,
+            'watermark': self.watermark,
+            'notified': self.notified,
+            'deferred_checkins': self.deferred_checkins,
+            'pending_digest': self.pending_digest,
+            'sync': self.sync.to_dict(),
+            'questions': self.questions.to_list(),
+            'dashboard': self.dashboard.to_dict(),
+        }
+        if include_index:
+            data['guests'] = self.guest_index.to_dict()
+            data['stats'] = self.stats.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'EventState':
+        state = cls(data['event_id'])
+        state.guest_index = GuestIndex.from_dict(data.get('guests', {}))
+        state.stats = AttendanceStats.from_dict(data.get('stats', {}))
+        state.last_summary_at = data.get('last_summary_at')
+        state.watermark = data.get('watermark')
+        state.notified = data.get('notified', {})
+        # 채팅방 정보 없이 참석자만 저장된 항목은 다음 전송 때 라우팅 규칙으로 대상 채팅방을 다시 정함
+        state.deferred_checkins = [
+            entry if 'guest' in entry else {'guest': entry, 'chats': []}
+            for entry in data.get('deferred_checkins', [])
+        ]
+        state.pending_digest = data.get('pending_digest', {})
+        state.sync = SyncCheckpoint.from_dict(data.get('sync', {}))
+        state.questions = QuestionSchema.from_list(data.get('questions', []))
+        state.dashboard = Dashboard.from_dict(data.get('dashboard', {}))
+        return state
+
+
+class EventStateStore:
+    """이벤트 상태를 디렉터리에 JSON 파일(참석자 인덱스는 바이너리 스냅샷)로 저장하고 메모리에 캐시"""
+
+    def __init__(self, directory: str, snapshot_interval: float = 0):
+        self.directory = directory
+        self._cache: Dict[str, EventState] = {}
+        # 참석자 인덱스 스냅샷 최소 저장 간격 (초, 0이면 상태를 저장할 때마다)
+        self.snapshot_interval = snapshot_interval
+        # 이벤트 ID -> (스냅샷에 쓴 인덱스 변경 번호, 스냅샷 식별자, 저장 시각 monotonic)
+        self._snapshots: Dict[str, Tuple[int, Optional[int], float]] = {}
+        # 스냅샷에서 읽은 참석자 수와 걸린 시간 (시작 후 첫 알림까지 시간 보고용)
+        self.loaded_guests = 0
+        self.load_seconds = 0.0
+
+    def _base_path(self, event_id: str) -> str:
+        safe_id = "".join(c if c.isalnum() or c in '-_' else '_' for c in event_id)
+        return os.path.join(self.directory, safe_id)
+
+    def _path(self, event_id: str) -> str:
+        return f"{self._base_path(event_id)}.json"
+
+    def _snapshot_path(self, event_id: str) -> str:
+        return f"{self._base_path(event_id)}.guests"
+
+    def get(self, event_id: str) -> EventState:
+        """이벤트 상태 조회 (메모리 -> 파일 -> 새 상태 순)"""
+        state = self._cache.get(event_id)
+        if state is not None:
+            return state
+        data = None
+        try:
+            with open(self._path(event_id), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            state = EventState.from_dict(data)
+        except FileNotFoundError:
+            state = EventState(event_id)
+        except (ValueError, KeyError) as e:
+            logger.warning("이벤트 %s 상태 파일을 읽을 수 없어 새로 시작합니다: %s", event_id, e)
+            state = EventState(event_id)
+            data = None
+        if data is not None:
+            self._load_snapshot(state, data)
+        self._cache[event_id] = state
+        return state
+
+    def _load_snapshot(self, state: EventState, data: Dict):
+        """참석자 인덱스 스냅샷을 읽어 상태에 반영"""
+        started = time.perf_counter()
+        try:
+            snapshot = read_snapshot(self._snapshot_path(state.event_id))
+        except (SnapshotError, OSError, ValueError) as e:
+            logger.warning("이벤트 %s 참석자 인덱스 스냅샷을 읽을 수 없습니다: %s", state.event_id, e)
+            snapshot = None
+
+        if snapshot is not None:
+            state.guest_index = snapshot.guest_index
+            state.stats = snapshot.stats
+            elapsed = time.perf_counter() - started
+            self.loaded_guests += len(snapshot.guest_index)
+            self.load_seconds += elapsed
+            self._snapshots[state.event_id] = (0, snapshot.saved_at, time.monotonic())
+            logger.info("이벤트 %s 참석자 인덱스 스냅샷 적재: %s명, %.0fms (스냅샷 워터마크: %s)",
+                        state.event_id, len(snapshot.guest_index), elapsed * 1000, snapshot.watermark)
+            if data.get('snapshot') != snapshot.saved_at and state.sync.in_progress:
+                # 스냅샷 이후에 진행된 동기화의 변경분은 스냅샷에 없으므로 동기화를 처음부터 다시 해 반영
+                logger.info("이벤트 %s 스냅샷이 상태 파일보다 오래되어 참석자 동기화를 처음부터 다시 합니다.", state.event_id)
+                state.sync.reset()
+        elif 'guests' in data:
+            # 이전 형식 상태 파일의 인덱스는 다음 저장 때 스냅샷으로 옮김
+            self._snapshots[state.event_id] = (-1, None, 0.0)
+        elif state.sync.last_completed_at or state.sync.in_progress:
+            # 인덱스 없이 동기화 기록만 남았으면 전체 참석자가 새 체크인으로 보이지 않도록 인덱스를 처음부터 다시 만듦
+            logger.warning("이벤트 %s 참석자 인덱스가 없어 전체 동기화부터 다시 합니다.", state.event_id)
+            state.sync.reset()
+            state.sync.last_completed_at = None
+            state.guest_index = GuestIndex()
+            state.stats = AttendanceStats()
+
+    def _save_snapshot(self, state: EventState, force: bool = False) -> Optional[int]:
+        """인덱스가 바뀌었고 저장 간격이 지났으면 스냅샷 저장, 현재 인덱스와 같은 스냅샷의 식별자 반환"""
+        version, saved_at, written_at = self._snapshots.get(state.event_id, (None, None, 0.0))
+        if version == state.guest_index.version:
+            return saved_at
+        if not force and version is not None and time.monotonic() - written_at < self.snapshot_interval:
+            return None
+        try:
+            saved_at = write_snapshot(self._snapshot_path(state.event_id), state.guest_index, state.stats, state.watermark)
+        except (OSError, SnapshotError) as e:
+            logger.warning("이벤트 %s 참석자 인덱스 스냅샷 저장 실패: %s", state.event_id, e)
+            return None
+        self._snapshots[state.event_id] = (state.guest_index.version, saved_at, time.monotonic())
+        return saved_at
+
+    def save(self, state: EventState, force_snapshot: bool = False):
+        """이벤트 상태를 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            data = state.to_dict(include_index=False)
+            data['snapshot'] = self._save_snapshot(state, force_snapshot)
+            path = self._path(state.event_id)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("이벤트 %s 상태 저장 실패: %s", state.event_id, e)
+
+    def flush(self):
+        """메모리에 있는 모든 이벤트의 상태와 밀린 스냅샷 저장 (데몬 종료 시)"""
+        for state in list(self._cache.values()):
+            self.save(state, force_snapshot=True)
+
+    def states(self) -> List[EventState]:
+        """메모리에 올라와 있는 이벤트 상태 목록"""
+        return list(self._cache.values())
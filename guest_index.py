@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+이벤트 참석자 인덱스
+
+참석자별 체크인 시각과 티켓 종류를 기억해 두고, 매 틱마다 새로 조회한 참석자 목록과 비교해
+달라진 참석자(신규 등록, 체크인, 체크인 취소, 티켓 변경, 등록 취소)만 변경분(GuestDelta)으로 돌려줍니다.
+통계 등 후속 처리는 전체 목록 대신 이 변경분만 사용합니다.
+"""
+
+from typing import List, Dict, Optional, Set, Tuple
+
+DEFAULT_TICKET_TYPE = '일반'
+
+# (체크인 시각 문자열 또는 None, 티켓 종류)
+GuestEntry = Tuple[Optional[str], str]
+
+
+def guest_key(guest: Dict) -> Optional[str]:
+    """참석자 식별자 (api_id, 없으면 이메일)"""
+    return guest.get('api_id') or guest.get('email')
+
+
+def guest_checked_in_at(guest: Dict) -> Optional[str]:
+    """참석자의 체크인 시각 문자열 (체크인하지 않았으면 None)"""
+    checkin_info = guest.get('checkin_info') or {}
+    return checkin_info.get('checked_in_at') or None
+
+
+def guest_ticket_type(guest: Dict) -> str:
+    """참석자의 티켓 종류"""
+    return guest.get('ticket_type') or DEFAULT_TICKET_TYPE
+
+
+class GuestDelta:
+    """한 틱 동안의 참석자 변경분"""
+
+    def __init__(self):
+        # (참석자 ID, 이전 항목 또는 None, 새 항목 또는 None)
+        self.changes: List[Tuple[str, Optional[GuestEntry], Optional[GuestEntry]]] = []
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def new_checkin_ids(self) -> List[str]:
+        """이번 틱에 새로 체크인한 참석자 ID 목록"""
+        return [
+            guest_id for guest_id, old, new in self.changes
+            if new and new[0] and not (old and old[0])
+        ]
+
+
+class GuestIndex:
+    """이벤트 하나의 참석자 ID -> (체크인 시각, 티켓 종류) 인덱스"""
+
+    def __init__(self, guests: Optional[Dict[str, List]] = None):
+        self.guests: Dict[str, GuestEntry] = {
+            guest_id: (entry[0], entry[1]) for guest_id, entry in (guests or {}).items()
+        }
+        # 변경될 때마다 늘어나는 번호 (스냅샷 저장 필요 여부 판단용)
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.guests)
+
+    def apply(self, guests: List[Dict]) -> GuestDelta:
+        """전체 참석자 목록을 반영하고 변경분을 반환"""
+        seen = set()
+        delta = self.apply_page(guests, seen)
+        delta.changes.extend(self.remove_unseen(seen).changes)
+        return delta
+
+    def apply_page(self, guests: List[Dict], seen: Set[str]) -> GuestDelta:
+        """참석자 목록 일부(페이지)를 반영하고 변경분을 반환 (본 참석자 ID는 seen에 추가)
+
+        목록 일부만으로는 사라진 참석자를 알 수 없으므로 삭제는 remove_unseen()에서 처리합니다.
+        """
+        delta = GuestDelta()
+        for guest in guests:
+            guest_id = guest_key(guest)
+            if guest_id is None:
+                continue
+            seen.add(guest_id)
+            entry = (guest_checked_in_at(guest), guest_ticket_type(guest))
+            old = self.guests.get(guest_id)
+            if old != entry:
+                self.guests[guest_id] = entry
+                delta.changes.append((guest_id, old, entry))
+        if delta.changes:
+            self.version += 1
+        return delta
+
+    def remove_unseen(self, seen: Set[str]) -> GuestDelta:
+        """전체 목록을 다 본 뒤 목록에서 사라진 참석자(등록 취소 등)를 제거하고 변경분을 반환"""
+        delta = GuestDelta()
+        # 인덱스 크기가 다를 때만 찾음
+        if len(self.guests) > len(seen):
+            for guest_id in [guest_id for guest_id in self.guests if guest_id not in seen]:
+                delta.changes.append((guest_id, self.guests.pop(guest_id), None))
+        if delta.changes:
+            self.version += 1
+        return delta
+
+    def to_dict(self) -> Dict[str, List]:
+        return {guest_id: list(entry) for guest_id, entry in self.guests.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, List]) -> 'GuestIndex':
+        return cls(data)
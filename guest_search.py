@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+참석자 검색 인덱스
+
+현장 스태프가 "○○님 오셨나요?"를 Luma를 열지 않고 확인할 수 있도록, 라이브 이벤트 참석자의
+이름과 이메일을 메모리 검색 인덱스로 유지합니다. 매 틱 조회한 참석자 페이지로 바뀐 참석자만 다시
+색인하므로, 검색 한 번은 Luma API 호출 없이 사전 조회 몇 번으로 끝납니다.
+
+- 한 글자 검색어("김")는 토큰 접두어 인덱스, 두 글자 이상은 2-gram 인덱스로 후보를 찾은 뒤 부분 문자열로 확인합니다.
+  한글은 음절 하나가 정보가 많아 3-gram 대신 2-gram을 써야 "철수"처럼 두 글자 이름으로도 찾을 수 있습니다.
+- 한글 이름은 붙여 쓴 전체 이름("김철수")과 공백으로 나눈 토큰을 모두 색인하고,
+  초성 검색("ㄱㅊㅅ")도 지원합니다.
+"""
+
+import re
+import threading
+import unicodedata
+from typing import List, Dict, Iterable, NamedTuple, Optional, Set
+
+from guest_index import guest_key, guest_checked_in_at, guest_ticket_type
+
+# 접두어 인덱스에 넣을 최대 접두어 길이 (이보다 긴 검색어는 n-gram 인덱스 사용)
+MAX_PREFIX_LENGTH = 1
+NGRAM = 2
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_EMAIL_SEPARATORS = re.compile(r"[._+\-@]")
+
+
+def normalize(text: Optional[str]) -> str:
+    """검색용 정규화 (NFC 결합, 소문자)"""
+    return unicodedata.normalize('NFC', text or '').strip().lower()
+
+
+def choseong(text: str) -> str:
+    """한글 음절을 초성으로 변환 (한글이 아닌 글자는 그대로)"""
+    chars = []
+    for char in text:
+        code = ord(char) - 0xAC00
+        chars.append(_CHOSEONG[code // 588] if 0 <= code < 11172 else char)
+    return "".join(chars)
+
+
+class SearchRecord(NamedTuple):
+    guest_id: str
+    name: str
+    email: str
+    ticket_type: str
+    checked_in_at: Optional[str]
+
+
+def _tokens(name: str, email: str) -> Set[str]:
+    """참석자 하나의 검색 토큰"""
+    tokens = set(name.split())
+    compact = "".join(name.split())
+    if compact:
+        tokens.add(compact)
+        initials = choseong(compact)
+        if initials != compact:
+            tokens.add(initials)
+    if email:
+        tokens.add(email)
+        tokens.update(part for part in _EMAIL_SEPARATORS.split(email) if part)
+    return tokens
+
+
+class GuestSearchIndex:
+    """이벤트 하나의 참석자 이름/이메일 검색 인덱스 (틱 스레드에서 갱신, 명령 스레드에서 검색)"""
+
+    def __init__(self):
+        self.records: Dict[str, SearchRecord] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+        self._prefixes: Dict[str, Set[str]] = {}
+        self._ngrams: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def update_page(self, guests: Iterable[Dict]) -> int:
+        """참석자 페이지 반영 (이름, 이메일, 티켓, 체크인이 바뀐 참석자만 다시 색인), 바뀐 인원 반환"""
+        changed = 0
+        with self._lock:
+            for guest in guests:
+                guest_id = guest_key(guest)
+                if guest_id is None:
+                    continue
+                record = SearchRecord(
+                    guest_id,
+                    guest.get('name') or guest.get('user_name') or '',
+                    guest.get('email') or guest.get('user_email') or '',
+                    guest_ticket_type(guest),
+                    guest_checked_in_at(guest),
+                )
+                old = self.records.get(guest_id)
+                if old == record:
+                    continue
+                self.records[guest_id] = record
+                changed += 1
+                if old is None or (old.name, old.email) != (record.name, record.email):
+                    self._unindex(guest_id)
+                    self._index(guest_id, _tokens(normalize(record.name), normalize(record.email)))
+        return changed
+
+    def remove(self, guest_ids: Iterable[str]):
+        """등록 취소 등으로 목록에서 사라진 참석자 제거"""
+        with self._lock:
+            for guest_id in guest_ids:
+                if self.records.pop(guest_id, None) is not None:
+                    self._unindex(guest_id)
+
+    def _index(self, guest_id: str, tokens: Set[str]):
+        self._tokens[guest_id] = tokens
+        for token in tokens:
+            for length in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+                self._prefixes.setdefault(token[:length], set()).add(guest_id)
+            for start in range(len(token) - NGRAM + 1):
+                self._ngrams.setdefault(token[start:start + NGRAM], set()).add(guest_id)
+
+    def _unindex(self, guest_id: str):
+        for token in self._tokens.pop(guest_id, ()):
+            for length in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+                self._discard(self._prefixes, token[:length], guest_id)
+            for start in range(len(token) - NGRAM + 1):
+                self._discard(self._ngrams, token[start:start + NGRAM], guest_id)
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: str, guest_id: str):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(guest_id)
+            if not ids:
+                del index[key]
+
+    def _match_term(self, term: str) -> Dict[str, int]:
+        """검색어 하나와 맞는 참석자 ID -> 순위 (0: 토큰 일치, 1: 토큰 접두어, 2: 부분 일치)"""
+        if len(term) <= MAX_PREFIX_LENGTH:
+            candidates = self._prefixes.get(term, set())
+        else:
+            grams = [term[start:start + NGRAM] for start in range(len(term) - NGRAM + 1)]
+            sets = sorted((self._ngrams.get(gram, set()) for gram in grams), key=len)
+            candidates = set.intersection(*sets) if sets and sets[0] else set()
+        matches = {}
+        for guest_id in candidates:
+            rank = None
+            for token in self._tokens[guest_id]:
+                if token == term:
+                    rank = 0
+                    break
+                if token.startswith(term):
+                    rank = 1
+                elif rank is None and term in token:
+                    rank = 2
+            if rank is not None:
+                matches[guest_id] = rank
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> List[SearchRecord]:
+        """이름/이메일 검색 (공백으로 나눈 검색어를 모두 포함하는 참석자, 잘 맞는 순)"""
+        terms = normalize(query).split()
+        if not terms:
+            return []
+        with self._lock:
+            ranks: Optional[Dict[str, int]] = None
+            for term in terms:
+                matches = self._match_term(term)
+                if ranks is None:
+                    ranks = matches
+                else:
+                    ranks = {guest_id: max(rank, matches[guest_id]) for guest_id, rank in ranks.items() if guest_id in matches}
+                if not ranks:
+                    return []
+            ordered = sorted(ranks, key=lambda guest_id: (ranks[guest_id], self.records[guest_id].name))
+            return [self.records[guest_id] for guest_id in ordered[:limit]]
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+참석자 인덱스 스냅샷
+
+이벤트 하나의 참석자 인덱스(참석자 ID -> 체크인 시각, 티켓 종류)와 그 인덱스에서 계산한 참석 통계를
+압축된 바이너리 파일(`<STATE_DIR>/<event_id>.guests`)로 저장합니다. 참석자가 많은 이벤트도 시작할 때
+JSON을 해석하지 않고 파일을 메모리 매핑(mmap)해, 구간을 복사하지 않고 memoryview로 잘라 값만 바로 해석하므로
+빠르게 다시 올라옵니다.
+
+파일 구성 (정수는 little-endian):
+    헤더         매직 `LGSN`, 버전, 저장 시각(epoch 나노초, 스냅샷 식별자), 참석자 수, 구간별 길이, 본문 CRC32
+    워터마크     저장 당시 이벤트 워터마크 (UTF-8)
+    티켓 종류    문자열 표: 티켓 종류 이름 목록
+    참석자 ID    문자열 표: 참석자 ID
+    체크인 시각  문자열 표: 원래 체크인 시각 문자열 (체크인 전이면 빈 문자열)
+    티켓 번호    참석자마다 티켓 종류 목록의 번호 (uint16 배열)
+    참석 통계    AttendanceStats.to_dict()의 JSON
+
+문자열 표는 항목 수(uint32), 항목 수 + 1개의 바이트 오프셋(uint32 배열), 이어 붙인 UTF-8 본문 순이므로
+값에 줄바꿈 등 어떤 문자가 들어 있어도 구간 사이의 순서가 어긋나지 않습니다.
+
+버전이나 매직이 다르거나 CRC가 맞지 않으면 스냅샷을 쓰지 않고 전체 동기화부터 다시 합니다.
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import zlib
+import struct
+from array import array
+from typing import List, NamedTuple, Optional
+
+from guest_index import GuestIndex
+from attendance_stats import AttendanceStats
+
+MAGIC = b'LGSN'
+SNAPSHOT_VERSION = 2
+
+# 매직, 버전, 예약, 저장 시각, 참석자 수, 워터마크/티켓 종류/ID/체크인 시각/티켓 번호/통계 구간 길이, CRC32
+_HEADER = struct.Struct('<4sHHqIIIIIIII')
+_COUNT = struct.Struct('<I')
+
+
+class SnapshotError(ValueError):
+    """읽을 수 없는 스냅샷 (버전 불일치, 손상 등)"""
+
+
+class GuestSnapshot(NamedTuple):
+    guest_index: GuestIndex
+    stats: AttendanceStats
+    watermark: Optional[str]
+    saved_at: int
+
+
+def _little_endian(values: array) -> array:
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+def _string_table(items: List[str]) -> bytes:
+    """문자열 목록을 문자열 표(항목 수, 오프셋 배열, UTF-8 본문)로 변환"""
+    encoded = [item.encode('utf-8') for item in items]
+    offsets = array('I', [0])
+    total = 0
+    for data in encoded:
+        total += len(data)
+        offsets.append(total)
+    return _COUNT.pack(len(encoded)) + _little_endian(offsets).tobytes() + b''.join(encoded)
+
+
+def write_snapshot(path: str, guest_index: GuestIndex, stats: AttendanceStats, watermark: Optional[str]) -> int:
+    """스냅샷 저장 (임시 파일에 쓴 뒤 교체), 저장 시각(스냅샷 식별자) 반환"""
+    tickets = sorted({ticket_type for _, ticket_type in guest_index.guests.values()})
+    if len(tickets) > 0xFFFF:
+        raise SnapshotError(f"티켓 종류가 너무 많습니다: {len(tickets)}")
+    ticket_numbers = {ticket_type: number for number, ticket_type in enumerate(tickets)}
+
+    kinds = array('H', (ticket_numbers[ticket_type] for _, ticket_type in guest_index.guests.values()))
+    sections = [
+        (watermark or '').encode('utf-8'),
+        _string_table(tickets),
+        _string_table(list(guest_index.guests)),
+        _string_table([checked_in_at or '' for checked_in_at, _ in guest_index.guests.values()]),
+        _little_endian(kinds).tobytes(),
+        json.dumps(stats.to_dict(), separators=(',', ':')).encode('utf-8'),
+    ]
+    crc = 0
+    for section in sections:
+        crc = zlib.crc32(section, crc)
+    saved_at = time.time_ns()
+    header = _HEADER.pack(MAGIC, SNAPSHOT_VERSION, 0, saved_at, len(guest_index),
+                          *(len(section) for section in sections), crc)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        for section in sections:
+            f.write(section)
+    os.replace(tmp_path, path)
+    return saved_at
+
+
+def _numbers(view: memoryview, typecode: str):
+    """little-endian 정수 배열 구간 (little-endian 시스템에서는 복사 없이 cast)"""
+    if sys.byteorder == 'little':
+        return view.cast(typecode)
+    values = array(typecode)
+    values.frombytes(view)
+    values.byteswap()
+    return values
+
+
+def _read_table(view: memoryview, name: str) -> List[str]:
+    """문자열 표 구간을 문자열 목록으로 해석 (항목마다 매핑된 구간에서 바로 디코딩)"""
+    if len(view) < _COUNT.size:
+        raise SnapshotError(f"{name} 구간이 너무 짧습니다.")
+    count, = _COUNT.unpack_from(view)
+    data_start = _COUNT.size + (count + 1) * 4
+    if len(view) < data_start:
+        raise SnapshotError(f"{name} 오프셋 표가 잘렸습니다.")
+    offsets = _numbers(view[_COUNT.size:data_start], 'I')
+    data = view[data_start:]
+    if offsets[0] != 0 or offsets[count] != len(data):
+        raise SnapshotError(f"{name} 오프셋 표가 본문 길이와 다릅니다.")
+    items = []
+    for index in range(count):
+        start, end = offsets[index], offsets[index + 1]
+        if end < start:
+            raise SnapshotError(f"{name} 오프셋 표가 올바르지 않습니다.")
+        items.append(str(data[start:end], 'utf-8'))
+    return items
+
+
+def _parse(view: memoryview, count: int, lengths: List[int], crc: int, saved_at: int) -> GuestSnapshot:
+    sections = []
+    offset = _HEADER.size
+    for length in lengths:
+        sections.append(view[offset:offset + length])
+        offset += length
+
+    check = 0
+    for section in sections:
+        check = zlib.crc32(section, check)
+    if check != crc:
+        raise SnapshotError("CRC가 맞지 않습니다.")
+
+    watermark, tickets_data, ids_data, times_data, kinds_data, stats_data = sections
+    tickets = _read_table(tickets_data, "티켓 종류")
+    ids = _read_table(ids_data, "참석자 ID")
+    times = [checked_in_at or None for checked_in_at in _read_table(times_data, "체크인 시각")]
+    if len(ids) != count or len(times) != count:
+        raise SnapshotError("참석자 수가 헤더와 다릅니다.")
+    if len(kinds_data) != count * 2:
+        raise SnapshotError("티켓 번호 수가 헤더와 다릅니다.")
+    try:
+        ticket_types = [tickets[number] for number in _numbers(kinds_data, 'H')]
+    except IndexError:
+        raise SnapshotError("티켓 종류 번호가 올바르지 않습니다.")
+
+    guest_index = GuestIndex()
+    guest_index.guests = dict(zip(ids, zip(times, ticket_types)))
+    stats = AttendanceStats.from_dict(json.loads(str(stats_data, 'utf-8')))
+    return GuestSnapshot(guest_index, stats, str(watermark, 'utf-8') or None, saved_at)
+
+
+def read_snapshot(path: str) -> Optional[GuestSnapshot]:
+    """스냅샷 읽기 (파일이 없으면 None, 읽을 수 없으면 SnapshotError)"""
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    error = None
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _HEADER.size:
+            raise SnapshotError("파일이 너무 짧습니다.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            magic, version, _, saved_at, count, *lengths, crc = _HEADER.unpack_from(mapped, 0)
+            if magic != MAGIC:
+                raise SnapshotError("스냅샷 파일이 아닙니다.")
+            if version != SNAPSHOT_VERSION:
+                raise SnapshotError(f"스냅샷 버전이 다릅니다 ({version}, 현재 {SNAPSHOT_VERSION}).")
+            if _HEADER.size + sum(lengths) != size:
+                raise SnapshotError("파일 크기가 헤더와 다릅니다.")
+            view = memoryview(mapped)
+            try:
+                return _parse(view, count, lengths, crc, saved_at)
+            except ValueError as e:
+                # 예외의 traceback이 매핑을 가리키는 구간을 붙잡고 있으면 mmap을 닫을 수 없으므로 메시지만 남김
+                error = str(e)
+            finally:
+                view.release()
+    raise SnapshotError(error)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+이벤트 리스(Lease) 저장소
+
+여러 봇 프로세스(또는 호스트)가 라이브 이벤트를 나누어 처리할 수 있도록
+만료 시간이 있는 리스와 워커 하트비트를 관리합니다.
+
+- 리스는 이벤트 단위로 하나의 워커만 보유할 수 있습니다.
+- 리스를 새로 얻을 때마다 단조 증가하는 토큰(fencing token)이 발급되며,
+  갱신은 토큰이 일치할 때만 성공하므로 리스를 잃은 워커는 더 이상 알림을 보낼 수 없습니다.
+- 저장소는 교체 가능하며 SQLite와 파일 잠금(fcntl) 백엔드를 제공합니다.
+"""
+
+import os
+import json
+import math
+import time
+import fcntl
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseStore:
+    """리스 저장소 인터페이스"""
+
+    def heartbeat(self, worker_id: str, ttl: float, now: Optional[float] = None):
+        """워커 생존 신호 기록"""
+        raise NotImplementedError
+
+    def live_workers(self, now: Optional[float] = None) -> List[str]:
+        """하트비트가 만료되지 않은 워커 목록"""
+        raise NotImplementedError
+
+    def acquire(self, event_id: str, worker_id: str, ttl: float,
+                now: Optional[float] = None) -> Optional[int]:
+        """리스 획득 (성공 시 토큰, 다른 워커가 보유 중이면 None)"""
+        raise NotImplementedError
+
+    def renew(self, event_id: str, worker_id: str, token: int, ttl: float,
+              now: Optional[float] = None) -> bool:
+        """보유 중인 리스 갱신 (토큰이 일치하고 만료 전일 때만 성공)"""
+        raise NotImplementedError
+
+    def release(self, event_id: str, worker_id: str, token: int):
+        """리스 반납"""
+        raise NotImplementedError
+
+    def leases(self, now: Optional[float] = None) -> Dict[str, str]:
+        """만료되지 않은 리스의 이벤트 ID -> 워커 ID"""
+        raise NotImplementedError
+
+
+class SQLiteLeaseStore(LeaseStore):
+    """SQLite 기반 리스 저장소 (같은 호스트의 여러 프로세스 또는 공유 파일시스템용)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS workers ("
+                "worker_id TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "event_id TEXT PRIMARY KEY, worker_id TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, token INTEGER NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def heartbeat(self, worker_id, ttl, now=None):
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO workers (worker_id, expires_at) VALUES (?, ?)",
+                (worker_id, now + ttl)
+            )
+
+    def live_workers(self, now=None):
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT worker_id FROM workers WHERE expires_at > ? ORDER BY worker_id", (now,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def acquire(self, event_id, worker_id, ttl, now=None):
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT worker_id, expires_at, token FROM leases WHERE event_id = ?", (event_id,)
+            ).fetchone()
+            if row and row[1] > now:
+                if row[0] != worker_id:
+                    return None
+                conn.execute(
+                    "UPDATE leases SET expires_at = ? WHERE event_id = ?", (now + ttl, event_id)
+                )
+                return row[2]
+            token = (row[2] if row else 0) + 1
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (event_id, worker_id, expires_at, token) "
+                "VALUES (?, ?, ?, ?)",
+                (event_id, worker_id, now + ttl, token)
+            )
+            return token
+
+    def renew(self, event_id, worker_id, token, ttl, now=None):
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE leases SET expires_at = ? "
+                "WHERE event_id = ? AND worker_id = ? AND token = ? AND expires_at > ?",
+                (now + ttl, event_id, worker_id, token, now)
+            )
+            return cursor.rowcount == 1
+
+    def release(self, event_id, worker_id, token):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE leases SET expires_at = 0 "
+                "WHERE event_id = ? AND worker_id = ? AND token = ?",
+                (event_id, worker_id, token)
+            )
+
+    def leases(self, now=None):
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT event_id, worker_id FROM leases WHERE expires_at > ?", (now,)
+            ).fetchall()
+        return {event_id: worker_id for event_id, worker_id in rows}
+
+
+class FileLeaseStore(LeaseStore):
+    """JSON 파일 + fcntl 잠금 기반 리스 저장소 (로컬 테스트용)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+
+    @contextmanager
+    def _transaction(self):
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.path, 'r') as f:
+                        state = json.load(f)
+                except (FileNotFoundError, ValueError):
+                    state = {}
+                state.setdefault('workers', {})
+                state.setdefault('leases', {})
+                before = json.dumps(state, sort_keys=True)
+                yield state
+                if json.dumps(state, sort_keys=True) != before:
+                    tmp_path = f"{self.path}.tmp"
+                    with open(tmp_path, 'w') as f:
+                        json.dump(state, f)
+                    os.replace(tmp_path, self.path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def heartbeat(self, worker_id, ttl, now=None):
+        now = time.time() if now is None else now
+        with self._transaction() as state:
+            state['workers'][worker_id] = now + ttl
+
+    def live_workers(self, now=None):
+        now = time.time() if now is None else now
+        with self._transaction() as state:
+            return sorted(w for w, expires_at in state['workers'].items() if expires_at > now)
+
+    def acquire(self, event_id, worker_id, ttl, now=None):
+        now = time.time() if now is None else now
+        with self._transaction() as state:
+            lease = state['leases'].get(event_id)
+            if lease and lease['expires_at'] > now:
+                if lease['worker_id'] != worker_id:
+                    return None
+                lease['expires_at'] = now + ttl
+                return lease['token']
+            token = (lease['token'] if lease else 0) + 1
+            state['leases'][event_id] = {
+                'worker_id': worker_id,
+                'expires_at': now + ttl,
+                'token': token
+            }
+            return token
+
+    def renew(self, event_id, worker_id, token, ttl, now=None):
+        now = time.time() if now is None else now
+        with self._transaction() as state:
+            lease = state['leases'].get(event_id)
+            if (not lease or lease['worker_id'] != worker_id
+                    or lease['token'] != token or lease['expires_at'] <= now):
+                return False
+            lease['expires_at'] = now + ttl
+            return True
+
+    def release(self, event_id, worker_id, token):
+        with self._transaction() as state:
+            lease = state['leases'].get(event_id)
+            if lease and lease['worker_id'] == worker_id and lease['token'] == token:
+                lease['expires_at'] = 0
+
+    def leases(self, now=None):
+        now = time.time() if now is None else now
+        with self._transaction() as state:
+            return {
+                event_id: lease['worker_id']
+                for event_id, lease in state['leases'].items()
+                if lease['expires_at'] > now
+            }
+
+
+def create_lease_store(spec: str) -> LeaseStore:
+    """`sqlite:<경로>` 또는 `file:<경로>` 형식의 설정으로 리스 저장소 생성"""
+    backend, _, path = spec.partition(':')
+    if not path:
+        raise ValueError(f"잘못된 LEASE_STORE 형식입니다: {spec} (예: sqlite:leases.db)")
+    if backend == 'sqlite':
+        return SQLiteLeaseStore(path)
+    if backend == 'file':
+        return FileLeaseStore(path)
+    raise ValueError(f"지원하지 않는 리스 저장소입니다: {backend}")
+
+
+class LeaseManager:
+    """워커 하나가 보유한 리스를 관리하고 라이브 이벤트를 워커 간에 분배"""
+
+    def __init__(self, store: LeaseStore, worker_id: str, ttl: float):
+        self.store = store
+        self.worker_id = worker_id
+        self.ttl = ttl
+        # 이벤트 ID -> 토큰 (하트비트 스레드와 공유)
+        self.held: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, event_ids: List[str]) -> List[str]:
+        """라이브 이벤트 중 이 워커가 처리할 몫을 확보하고 그 목록을 반환"""
+        self.store.heartbeat(self.worker_id, self.ttl)
+        workers = self.store.live_workers()
+        worker_count = max(len(workers), 1)
+        share = math.ceil(len(event_ids) / worker_count) if event_ids else 0
+
+        # 더 이상 라이브가 아닌 이벤트의 리스는 반납
+        for event_id in list(self.held):
+            if event_id not in event_ids:
+                self.release(event_id)
+
+        owned = [event_id for event_id in event_ids if self.still_holds(event_id)]
+
+        # 새 워커가 합류해 몫이 줄었다면 초과분을 반납해 재분배되도록 함
+        for event_id in owned[share:]:
+            self.release(event_id)
+        owned = owned[:share]
+
+        # 워커마다 다른 순서로 시도해 동시에 같은 이벤트를 두고 경합하는 일을 줄임
+        offset = workers.index(self.worker_id) if self.worker_id in workers else 0
+        candidates = event_ids[offset:] + event_ids[:offset]
+        for event_id in candidates:
+            if len(owned) >= share:
+                break
+            if event_id in owned:
+                continue
+            token = self.store.acquire(event_id, self.worker_id, self.ttl)
+            if token is not None:
+                with self._lock:
+                    self.held[event_id] = token
+                owned.append(event_id)
+                logger.info("이벤트 %s 리스 획득 (워커: %s, 토큰: %s)", event_id, self.worker_id, token)
+
+        logger.info("활성 워커 %s개, 이 워커의 담당 이벤트 %s/%s개", worker_count, len(owned), len(event_ids))
+        return [event_id for event_id in event_ids if event_id in owned]
+
+    def still_holds(self, event_id: str) -> bool:
+        """리스를 아직 보유 중인지 확인하며 갱신 (알림 전송 직전에 호출)"""
+        with self._lock:
+            token = self.held.get(event_id)
+        if token is None:
+            return False
+        if self.store.renew(event_id, self.worker_id, token, self.ttl):
+            return True
+        with self._lock:
+            self.held.pop(event_id, None)
+        logger.warning("이벤트 %s 리스를 잃었습니다 (워커: %s)", event_id, self.worker_id)
+        return False
+
+    def heartbeat(self):
+        """하트비트 기록 및 보유 리스 전체 갱신"""
+        self.store.heartbeat(self.worker_id, self.ttl)
+        for event_id in list(self.held):
+            self.still_holds(event_id)
+
+    def release(self, event_id: str):
+        """리스 반납"""
+        with self._lock:
+            token = self.held.pop(event_id, None)
+        if token is not None:
+            self.store.release(event_id, self.worker_id, token)
+            logger.info("이벤트 %s 리스 반납 (워커: %s)", event_id, self.worker_id)
+
+    def release_all(self):
+        """보유한 모든 리스 반납 (정상 종료 시)"""
+        for event_id in list(self.held):
+            self.release(event_id)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+설정 파일 실시간 반영
+
+데몬 모드에서 `.env`를 고친 뒤 봇을 재시작하지 않아도 VIP 명단, 멘션 대상, 라우팅 규칙, 전송 모드,
+알림에 표시할 등록 질문 같은 설정이 다음 틱부터 적용되도록 합니다.
+
+- 틱마다 `.env`의 수정 시각과 크기만 stat으로 확인하므로, 바뀌지 않았으면 파일을 읽지 않습니다.
+- 바뀌었으면 새 값으로 VIP 조회 집합, 라우팅 테이블 등을 모두 미리 컴파일해 검증한 뒤 틱과 틱 사이에
+  한 번에 교체합니다. 진행 중인 틱은 이전 설정으로 끝까지 실행되므로 처리 중인 알림이 빠지지 않습니다.
+- 새 설정이 잘못되었으면(라우팅 규칙 오류, 숫자가 아닌 값 등) 오류를 남기고 이전 설정을 계속 사용합니다.
+- `.env`가 잠시 없어졌거나, 읽는 동안 바뀌었거나(저장 중), 파싱할 수 없는 줄이 있거나, 필수 설정이 빠졌으면
+  (덜 쓴 파일) 그 내용을 적용하지 않고 이전 설정을 유지합니다.
+- 실행 중에 다시 읽는 설정은 RELOADABLE_KEYS뿐이며, API 키 등 다른 설정이 바뀌면 재시작이 필요하다고 경고합니다.
+  시작할 때 셸 환경 변수로 지정한 값은 `.env`보다 우선하므로 다시 읽지 않습니다.
+"""
+
+import io
+import os
+import logging
+from typing import Callable, List, Dict, Optional, Tuple
+
+from config_snapshot import compile_snapshot, read_snapshot
+from digest import parse_chat_modes
+from registration import parse_fields
+from routing import Router
+
+logger = logging.getLogger(__name__)
+
+# 실행 중에 다시 읽는 설정
+RELOADABLE_KEYS = (
+    'VIP_GUESTS',
+    'MENTION_USERS',
+    'ROUTING_RULES',
+    'DELIVERY_MODE',
+    'CHAT_DELIVERY_MODES',
+    'SHOW_REGISTRATION_ANSWERS',
+    'REGISTRATION_FIELDS',
+    'SUMMARY_INTERVAL_MINUTES',
+    'CATCHUP_MAX_HOURS',
+    'BULK_SUMMARY_THRESHOLD',
+    'DASHBOARD_INTERVAL_SECONDS',
+    'STAFF_CHAT_IDS',
+    'WHOIS_MAX_RESULTS',
+)
+
+DELIVERY_MODES = ('individual', 'digest')
+
+# 이전 `.env`에 있었는데 새 `.env`에서 빠졌으면 덜 쓴 파일로 보는 설정
+REQUIRED_KEYS = ('LUMA_API_KEY', 'TELEGRAM_BOT_TOKEN', 'TELEGRAM_CHAT_ID')
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+
+class LiveSettings:
+    """실행 중에 교체할 수 있는 설정 묶음 (만든 뒤에는 고치지 않음)"""
+
+    def __init__(self, values: Dict[str, str], fallback_chat: str):
+        get: Callable[[str, str], str] = lambda key, default='': values.get(key) or default
+        self.values = {key: values.get(key, '') for key in RELOADABLE_KEYS}
+
+        self.vip_guests = _split(get('VIP_GUESTS'))
+        # 체크인마다 조회하므로 목록 대신 집합으로
+        self.vip_index = frozenset(self.vip_guests)
+        self.mention_users = _split(get('MENTION_USERS'))
+        self.router = Router.parse(get('ROUTING_RULES'), fallback_chat)
+
+        self.delivery_mode = get('DELIVERY_MODE', 'individual')
+        self.chat_delivery_modes = parse_chat_modes(get('CHAT_DELIVERY_MODES'))
+        for mode in [self.delivery_mode] + list(self.chat_delivery_modes.values()):
+            if mode not in DELIVERY_MODES:
+                raise ValueError(f"알 수 없는 전송 모드입니다: {mode}")
+
+        self.show_registration_answers = get('SHOW_REGISTRATION_ANSWERS', '1').lower() in ('1', 'true', 'yes')
+        self.registration_fields = parse_fields(get('REGISTRATION_FIELDS'))
+
+        self.summary_interval_minutes = int(get('SUMMARY_INTERVAL_MINUTES', '0'))
+        self.catchup_max_hours = float(get('CATCHUP_MAX_HOURS', '24'))
+        self.bulk_summary_threshold = int(get('BULK_SUMMARY_THRESHOLD', '20'))
+        self.dashboard_interval_seconds = float(get('DASHBOARD_INTERVAL_SECONDS', '60'))
+        self.staff_chat_ids = _split(get('STAFF_CHAT_IDS'))
+        self.whois_limit = int(get('WHOIS_MAX_RESULTS', '10'))
+
+    @classmethod
+    def from_env(cls, fallback_chat: str) -> 'LiveSettings':
+        return cls({key: os.environ[key] for key in RELOADABLE_KEYS if key in os.environ}, fallback_chat)
+
+    def describe_changes(self, old: 'LiveSettings') -> List[str]:
+        """이전 설정과 달라진 항목 설명 (로그용)"""
+        changes = []
+        added = [name for name in self.vip_guests if name not in old.vip_index]
+        removed = [name for name in old.vip_guests if name not in self.vip_index]
+        if added or removed:
+            changes.append(
+                f"VIP_GUESTS: {len(old.vip_guests)}명 -> {len(self.vip_guests)}명"
+                f" (추가: {', '.join(added) or '-'}, 제외: {', '.join(removed) or '-'})"
+            )
+        for key in RELOADABLE_KEYS:
+            if key != 'VIP_GUESTS' and self.values[key] != old.values[key]:
+                changes.append(f"{key}: '{old.values[key]}' -> '{self.values[key]}'")
+        return changes
+
+
+class ConfigWatcher:
+    """`.env` 변경 감지 (수정 시각과 크기만 확인)"""
+
+    def __init__(self, env_file: str = '.env'):
+        self.env_file = env_file
+        self._source = self._stat()
+        # 적용하지 않기로 한 파일 상태 (같은 파일에 대해 오류를 반복해서 남기지 않음)
+        self._rejected: Optional[Tuple[int, int]] = None
+        values = self._read(cached=True)
+        # 시작할 때 `.env`와 다른 값으로 지정된 환경 변수는 셸에서 지정한 것이므로 계속 우선 적용
+        self.overrides = {
+            key: os.environ[key] for key in RELOADABLE_KEYS
+            if key in os.environ and os.environ[key] != values.get(key)
+        }
+        self._values = values
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.env_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read(self, cached: bool = False) -> Dict[str, str]:
+        if self._source is None:
+            return {}
+        values = read_snapshot(self.env_file) if cached else None
+        return values if values is not None else compile_snapshot(self.env_file)
+
+    def _read_changed(self, source: Tuple[int, int]) -> Optional[Dict[str, str]]:
+        """바뀐 `.env`를 읽어 온전한 파일이면 값을, 아니면 None 반환"""
+        from dotenv import dotenv_values
+        from dotenv.parser import parse_stream
+
+        try:
+            with open(self.env_file, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+        if self._stat() != source:
+            # 읽는 동안 바뀌었으면 저장 중인 파일이므로 다음 틱에 다시 확인
+            return None
+
+        self._rejected = source
+        errors = [binding.original.line for binding in parse_stream(io.StringIO(text)) if binding.error]
+        if errors:
+            logger.error("%s의 %s번째 줄을 해석할 수 없어 이전 설정을 계속 사용합니다.", self.env_file,
+                         ", ".join(str(line) for line in errors))
+            return None
+        values = {key: value for key, value in dotenv_values(stream=io.StringIO(text)).items() if value is not None}
+        missing = [key for key in REQUIRED_KEYS if key in self._values and key not in values]
+        if missing:
+            logger.error("%s에 %s 설정이 없어 덜 쓴 파일로 보고 이전 설정을 계속 사용합니다.", self.env_file,
+                         ", ".join(missing))
+            return None
+        self._rejected = None
+        return values
+
+    def poll(self) -> Optional[Dict[str, str]]:
+        """바뀌었으면 실행 중에 다시 읽는 설정의 새 값을, 아니면 None 반환 (온전하지 않은 파일은 무시)"""
+        source = self._stat()
+        # 파일이 잠시 없어졌으면(편집기가 지우고 다시 쓰는 중 등) 바뀌지 않은 것으로 봄
+        if source is None or source == self._source or source == self._rejected:
+            return None
+        values = self._read_changed(source)
+        if values is None:
+            return None
+        self._source = source
+
+        restart_needed = sorted(
+            key for key in set(values) | set(self._values)
+            if key not in RELOADABLE_KEYS and values.get(key) != self._values.get(key)
+        )
+        if restart_needed:
+            logger.warning("다음 설정은 재시작해야 적용됩니다: %s", ", ".join(restart_needed))
+        self._values = values
+
+        merged = {key: values[key] for key in RELOADABLE_KEYS if key in values}
+        merged.update(self.overrides)
+        return merged
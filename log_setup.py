@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+로깅 설정
+
+봇과 스케줄러가 공통으로 사용하는 비동기 로깅 파이프라인입니다.
+
+- 로그 레코드는 큐에만 넣고, 포맷팅과 파일 쓰기는 백그라운드 스레드(QueueListener)가 담당합니다.
+- 파일 로그는 크기(LOG_MAX_BYTES) 또는 시간(LOG_ROTATE_WHEN) 기준으로 회전합니다.
+- LOG_FORMAT=json 이면 JSON Lines 형식으로 기록합니다.
+- 모든 레코드에 틱(tick) 단위 상관관계 ID(tick_id)가 붙어 한 번의 실행 기록을 grep으로 모아볼 수 있습니다.
+"""
+
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import contextvars
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from typing import Optional
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - [%(tick_id)s] %(message)s'
+
+# 현재 틱의 상관관계 ID
+_tick_id = contextvars.ContextVar('tick_id', default='-')
+
+_listener: Optional[QueueListener] = None
+
+
+def new_tick_id(tick_id: Optional[str] = None) -> str:
+    """새 틱 상관관계 ID를 설정하고 반환 (지정하지 않으면 무작위 생성)"""
+    tick_id = tick_id or os.urandom(6).hex()
+    _tick_id.set(tick_id)
+    return tick_id
+
+
+def current_tick_id() -> str:
+    """현재 틱 상관관계 ID"""
+    return _tick_id.get()
+
+
+class TickIdFilter(logging.Filter):
+    """로그를 남긴 스레드의 틱 ID를 레코드에 기록"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, 'tick_id'):
+            record.tick_id = _tick_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """JSON Lines 포맷터"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'tick_id': getattr(record, 'tick_id', '-'),
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _LazyQueueHandler(QueueHandler):
+    """포맷팅을 리스너 스레드로 미루는 QueueHandler
+
+    기본 QueueHandler.prepare()는 호출 스레드에서 메시지를 포맷팅하므로,
+    레코드를 그대로 큐에 넣어 `%` 인자 치환까지 백그라운드에서 처리되게 합니다.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _create_file_handler(log_file: str) -> logging.Handler:
+    """크기 또는 시간 기준 회전 파일 핸들러 생성"""
+    backup_count = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+    rotate_when = os.getenv('LOG_ROTATE_WHEN')
+    if rotate_when:
+        return TimedRotatingFileHandler(
+            log_file, when=rotate_when, backupCount=backup_count, encoding='utf-8'
+        )
+    max_bytes = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+    return RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+    )
+
+
+def setup_logging(log_file: str, level: Optional[str] = None):
+    """루트 로거에 큐 기반 비동기 핸들러 설정"""
+    global _listener
+    if _listener is not None:
+        return
+
+    if os.getenv('LOG_FORMAT', 'text').lower() == 'json':
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    file_handler = _create_file_handler(log_file)
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+
+    # 큐는 크기 제한이 없으므로 로그 호출이 블로킹되지 않음
+    log_queue = queue.SimpleQueue()
+    queue_handler = _LazyQueueHandler(log_queue)
+    queue_handler.addFilter(TickIdFilter())
+
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, (level or os.getenv('LOG_LEVEL', 'INFO')).upper()))
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """큐에 남은 로그를 모두 기록하고 리스너 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -3,101 +3,329 @@
 Luma Check-in Telegram Notification Bot
 
 이 스크립트는 Luma 이벤트의 새로운 체크인 정보를 Telegram으로 전송합니다.
-매 5분마다 실행되어 최근 5분 내 체크인한 사용자들을 찾아 알림을 보냅니다.
-첫 실행 시에는 20분 전까지의 체크인을 검색합니다.
+매 5분마다 실행되어 이벤트별 워터마크(마지막으로 모두 처리한 시각) 이후 체크인한 사용자들을 찾아 알림을 보냅니다.
+워터마크가 없는 첫 실행 시에는 20분 전까지의 체크인을 검색하고,
+다운타임 후 밀린 체크인이 많으면 개별 메시지 대신 일괄 요약으로 보냅니다.
+
+`--daemon` 옵션으로 실행하면 프로세스 안에서 주기적으로 체크를 반복하며,
+LEASE_STORE가 설정되어 있으면 여러 워커가 리스를 통해 라이브 이벤트를 나누어 처리합니다.
+
+cron으로 자주 실행되는 단발성 실행의 시작 시간을 줄이기 위해 모듈 임포트 시점에는 아무 작업도 하지 않습니다.
+requests 등 무거운 모듈은 실제로 필요한 시점에 임포트하고, 설정은 미리 컴파일된 스냅샷에서 읽으며,
+환경 변수 로드와 로깅 설정은 main()에서 수행합니다.
 """
 
 import os
 import sys
+import html
+import time
 import logging
-import requests
+import threading
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from dotenv import load_dotenv
-
-# 환경 변수 로드
-load_dotenv()
+from typing import List, Dict, Iterator, Optional, Set, Tuple
 
-# 로깅 설정
-logging.basicConfig(
-    level=getattr(logging, os.getenv('LOG_LEVEL', 'INFO')),
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('luma_checkin_bot.log')
-    ]
+from log_setup import setup_logging, new_tick_id
+from event_state import EventState, EventStateStore
+from guest_index import GuestDelta, guest_key, guest_checked_in_at, guest_ticket_type
+from attendance_stats import parse_utc
+from digest import DigestBuffer, DigestEntry, digest_entry, format_digest, format_backlog
+from tracing import tracer, TickProfiler
+from delivery import LANE_REGULAR, LANE_SUMMARY, LANE_VIP, LaneMetrics, Notification, deliver_per_chat, prioritize
+from photo import guest_avatar_url
+from event_meta import EventMetadataCache, format_event_context, upcoming_events
+from guest_search import GuestSearchIndex
+from checkin_log import CheckinLog, CheckinRecord, epoch
+from registration import QuestionSchema
+from live_config import ConfigWatcher, LiveSettings
+from transport import HTTPTransport, Transport, TransportError
+from deadline import (
+    Deadline, DeadlineExceeded, RequestBudgetExceeded, TickLock, TickMetrics,
+    DEFAULT_REQUEST_TIMEOUT, SEND_RESERVE_RATIO, request_timeout
 )
+
 logger = logging.getLogger(__name__)
 
 # 첫 실행 여부를 확인하기 위한 상태 파일
 STATE_FILE = '.bot_state'
 
+# 행사 전 참석자 목록 미리 받기는 틱 시간 예산이 이 비율 이상 남았을 때만, 남은 요청 예산의 이 비율까지만 사용
+WARMUP_RESERVE_RATIO = 0.5
+WARMUP_REQUEST_SHARE = 0.5
+
 class LumaAPI:
     """Luma API 클라이언트"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, transport: Optional[Transport] = None):
         self.api_key = api_key
-        self.base_url = "https://api.lu.ma"
+        self.base_url = os.getenv('LUMA_API_BASE_URL', "https://api.lu.ma")
+        # HTTP 전송 (테스트와 재생에서는 가짜 또는 기록 재생 구현으로 교체)
+        self.transport = transport or HTTPTransport()
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        # 응답 기록기 (RECORD_FILE 설정 시)
+        self.recorder = None
+        # 현재 틱의 시간 예산 (요청 타임아웃이 남은 예산을 넘지 않도록 함)
+        self.deadline: Optional[Deadline] = None
+        # API 키별 요청 예산 (LUMA_RATE_PER_MINUTE 설정 시)
+        self.governor = None
     
-    def get_live_events(self) -> List[Dict]:
-        """현재 라이브 상태인 이벤트 조회"""
-        try:
-            response = requests.get(
-                f"{self.base_url}/public/v1/event",
+    def _acquire(self, stage: str, reserve_ratio: float = 0.0):
+        """요청 예산에서 요청 하나를 가져옴 (예산이 없으면 RequestBudgetExceeded)"""
+        if self.governor:
+            self.governor.acquire(stage, self.deadline, reserve_ratio)
+    
+    def _get_json(self, path: str, params: Dict, span_name: str) -> Dict:
+        """GET 요청 후 JSON 응답 반환 (기록 모드면 응답을 그대로 기록)"""
+        with tracer.span(span_name):
+            response = self.transport.get(
+                f"{self.base_url}{path}",
                 headers=self.headers,
-                params={"is_live": True}
+                params=params,
+                timeout=request_timeout(self.deadline)
             )
             response.raise_for_status()
+        with tracer.span('json_decode'):
             data = response.json()
+        if self.recorder:
+            self.recorder.record(path, params, data)
+        return data
+    
+    def get_live_events(self) -> List[Dict]:
+        """현재 라이브 상태인 이벤트 조회"""
+        try:
+            self._acquire("라이브 이벤트 조회")
+            data = self._get_json("/public/v1/event", {"is_live": True}, 'get_live_events')
             return data.get('entries', [])
-        except requests.RequestException as e:
-            logger.error(f"라이브 이벤트 조회 실패: {e}")
+        except TransportError as e:
+            logger.error("라이브 이벤트 조회 실패: %s", e)
+            return []
+        except RequestBudgetExceeded as e:
+            logger.warning("%s, 이번 틱은 건너뜁니다.", e)
             return []
     
-    def get_event_guests(self, event_api_id: str) -> List[Dict]:
-        """특정 이벤트의 참석자 목록 조회"""
+    def iter_guest_pages(self, event_api_id: str, cursor: Optional[str] = None,
+                         max_pages: Optional[int] = None) -> Iterator[Tuple[List[Dict], Optional[str]]]:
+        """참석자 목록을 페이지 단위로 조회: (참석자 목록, 다음 페이지 커서 또는 None)
+        
+        cursor를 주면 해당 페이지부터 이어서 조회합니다. 요청 실패 시 TransportError,
+        페이지 사이에 남은 틱 시간 예산이 알림 전송 몫만 남으면 DeadlineExceeded를,
+        max_pages(이번 틱 요청 예산 중 이 이벤트의 몫)만큼 조회했거나 요청 예산이 부족하면
+        RequestBudgetExceeded를 발생시킵니다.
+        """
+        params = {"pagination_cursor": cursor} if cursor else {}
+        pages = 0
+        while True:
+            stage = f"이벤트 {event_api_id} 참석자 조회"
+            if self.deadline:
+                # 알림 전송에 쓸 예산은 남겨 두고 조회를 멈춤 (다음 틱에 이어서 조회)
+                self.deadline.check(stage, SEND_RESERVE_RATIO)
+            if max_pages is not None and pages >= max_pages:
+                raise RequestBudgetExceeded(f"{stage}: 이번 틱 요청 예산 중 이 이벤트 몫 {max_pages}페이지 사용")
+            self._acquire(stage, SEND_RESERVE_RATIO)
+            pages += 1
+            data = self._get_json(f"/public/v1/event/{event_api_id}/guests", params, 'guest_pagination')
+            
+            # 다음 페이지가 있으면 커서를 따라 계속 조회
+            next_cursor = data.get('next_cursor')
+            if not data.get('has_more') or not next_cursor:
+                next_cursor = None
+            yield data.get('entries', []), next_cursor
+            if next_cursor is None:
+                return
+            params = {"pagination_cursor": next_cursor}
+    
+    def list_calendar_events(self, after: datetime, before: datetime, max_pages: int = 5) -> List[Dict]:
+        """캘린더 이벤트 중 after ~ before 사이의 이벤트 조회 (행사 전 미리 받기용, 실패 시 빈 목록)"""
+        events = []
+        params = {
+            "after": after.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            "before": before.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+        }
         try:
-            response = requests.get(
-                f"{self.base_url}/public/v1/event/{event_api_id}/guests",
-                headers=self.headers
+            for _ in range(max_pages):
+                self._acquire("캘린더 이벤트 조회", SEND_RESERVE_RATIO)
+                data = self._get_json("/public/v1/calendar/list-events", params, 'list_events')
+                events.extend(entry.get('event', entry) for entry in data.get('entries', []))
+                if not data.get('has_more') or not data.get('next_cursor'):
+                    break
+                params = dict(params, pagination_cursor=data['next_cursor'])
+        except (TransportError, DeadlineExceeded) as e:
+            logger.warning("캘린더 이벤트 조회 실패: %s", e)
+        return events
+    
+    def get_event(self, event_api_id: str) -> Optional[Dict]:
+        """이벤트 상세 정보 조회 (메타데이터 캐시의 백그라운드 새로 고침용, 실패 시 None)
+        
+        틱 밖에서도 호출되므로 틱 시간 예산과 관계없이 기본 타임아웃을 사용합니다.
+        """
+        try:
+            if self.governor:
+                self.governor.acquire(f"이벤트 {event_api_id} 상세 정보 조회")
+            response = self.transport.get(
+                f"{self.base_url}/public/v1/event/{event_api_id}",
+                headers=self.headers,
+                timeout=DEFAULT_REQUEST_TIMEOUT
             )
             response.raise_for_status()
-            data = response.json()
-            return data.get('entries', [])
-        except requests.RequestException as e:
-            logger.error(f"이벤트 {event_api_id}의 참석자 조회 실패: {e}")
-            return []
+            return response.json()
+        except (TransportError, RequestBudgetExceeded) as e:
+            logger.warning("이벤트 %s 상세 정보 조회 실패: %s", event_api_id, e)
+            return None
 
 
 class TelegramBot:
     """Telegram Bot API 클라이언트"""
     
-    def __init__(self, bot_token: str, chat_id: str):
+    def __init__(self, bot_token: str, chat_id: str, rate_per_minute: float = 0,
+                 transport: Optional[Transport] = None):
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        # HTTP 전송 (테스트와 재생에서는 가짜 구현으로 교체)
+        self.transport = transport or HTTPTransport()
+        # 현재 틱의 시간 예산 (요청 타임아웃이 남은 예산을 넘지 않도록 함)
+        self.deadline: Optional[Deadline] = None
+        # 채팅방별 전송 간격 (초, 0이면 제한 없음)과 다음 전송 가능 시각
+        self.send_interval = 60 / rate_per_minute if rate_per_minute > 0 else 0.0
+        self._next_send_at: Dict[str, float] = {}
+    
+    def next_send_delay(self, chat_id: Optional[str] = None) -> float:
+        """채팅방에 다음 메시지를 보낼 수 있을 때까지 남은 시간 (초)"""
+        return max(self._next_send_at.get(chat_id or self.chat_id, 0.0) - time.monotonic(), 0.0)
+    
+    def _wait_turn(self, chat_id: str):
+        """채팅방별 전송 속도 제한에 맞춰 대기"""
+        delay = self.next_send_delay(chat_id)
+        if delay:
+            time.sleep(delay)
+        self._next_send_at[chat_id] = time.monotonic() + self.send_interval
+    
+    def send_message(self, message: str, chat_id: Optional[str] = None) -> bool:
+        """메시지 전송 (chat_id를 지정하지 않으면 기본 채팅방, 채팅방별 전송 속도 제한)"""
+        chat_id = chat_id or self.chat_id
+        self._wait_turn(chat_id)
+        try:
+            with tracer.span('telegram_send'):
+                response = self.transport.post(
+                    f"{self.base_url}/sendMessage",
+                    data={
+                        "chat_id": chat_id,
+                        "text": message,
+                        "parse_mode": "HTML"
+                    },
+                    timeout=request_timeout(self.deadline)
+                )
+                response.raise_for_status()
+            logger.info("Telegram 메시지 전송 성공")
+            return True
+        except TransportError as e:
+            logger.error("Telegram 메시지 전송 실패: %s", e)
+            return False
+    
+    def post_message(self, message: str, chat_id: str) -> Optional[int]:
+        """메시지를 보내고 메시지 ID 반환 (현황판용, 실패 시 None)"""
+        self._wait_turn(chat_id)
+        try:
+            with tracer.span('telegram_send'):
+                response = self.transport.post(
+                    f"{self.base_url}/sendMessage",
+                    data={"chat_id": chat_id, "text": message, "parse_mode": "HTML"},
+                    timeout=request_timeout(self.deadline)
+                )
+                response.raise_for_status()
+            return response.json()['result']['message_id']
+        except (TransportError, KeyError, ValueError) as e:
+            logger.error("Telegram 메시지 전송 실패: %s", e)
+            return None
+    
+    def edit_message(self, message: str, chat_id: str, message_id: int) -> Optional[bool]:
+        """보낸 메시지 내용 수정 (성공 True, 일시적 실패 False, 메시지가 삭제되어 수정할 수 없으면 None)"""
+        self._wait_turn(chat_id)
+        try:
+            with tracer.span('telegram_edit'):
+                response = self.transport.post(
+                    f"{self.base_url}/editMessageText",
+                    data={"chat_id": chat_id, "message_id": message_id, "text": message, "parse_mode": "HTML"},
+                    timeout=request_timeout(self.deadline)
+                )
+            if response.status_code == 400:
+                description = response.json().get('description', '')
+                if 'not modified' in description:
+                    return True
+                if 'not found' in description:
+                    return None
+            response.raise_for_status()
+            return True
+        except (TransportError, ValueError) as e:
+            logger.error("Telegram 메시지 수정 실패: %s", e)
+            return False
     
-    def send_message(self, message: str) -> bool:
-        """메시지 전송"""
+    def pin_message(self, chat_id: str, message_id: int) -> bool:
+        """메시지를 채팅방 상단에 고정 (알림 없이)"""
         try:
-            response = requests.post(
-                f"{self.base_url}/sendMessage",
-                data={
-                    "chat_id": self.chat_id,
-                    "text": message,
-                    "parse_mode": "HTML"
-                }
+            response = self.transport.post(
+                f"{self.base_url}/pinChatMessage",
+                data={"chat_id": chat_id, "message_id": message_id, "disable_notification": True},
+                timeout=request_timeout(self.deadline)
             )
             response.raise_for_status()
-            logger.info("Telegram 메시지 전송 성공")
             return True
-        except requests.RequestException as e:
-            logger.error(f"Telegram 메시지 전송 실패: {e}")
+        except TransportError as e:
+            logger.warning("Telegram 메시지 고정 실패 (봇에 고정 권한이 있는지 확인하세요): %s", e)
             return False
+    
+    def reply_message(self, message: str, chat_id: str, reply_to: Optional[int] = None) -> bool:
+        """스태프 명령에 답장 (틱 밖에서 호출되므로 틱 시간 예산과 전송 속도 제한을 적용하지 않음)"""
+        data = {"chat_id": chat_id, "text": message, "parse_mode": "HTML"}
+        if reply_to:
+            data["reply_to_message_id"] = reply_to
+        try:
+            response = self.transport.post(f"{self.base_url}/sendMessage", data=data, timeout=DEFAULT_REQUEST_TIMEOUT)
+            response.raise_for_status()
+            return True
+        except TransportError as e:
+            logger.error("Telegram 답장 전송 실패: %s", e)
+            return False
+    
+    def get_updates(self, offset: Optional[int], timeout: int) -> Optional[List[Dict]]:
+        """새 메시지 long polling (실패 시 None)"""
+        params = {"timeout": timeout, "allowed_updates": '["message"]'}
+        if offset is not None:
+            params["offset"] = offset
+        try:
+            response = self.transport.get(f"{self.base_url}/getUpdates", params=params, timeout=timeout + DEFAULT_REQUEST_TIMEOUT)
+            response.raise_for_status()
+            return response.json().get('result', [])
+        except (TransportError, ValueError) as e:
+            logger.warning("Telegram 메시지 수신 실패: %s", e)
+            return None
+    
+    def send_photo(self, photo, caption: str, chat_id: Optional[str] = None) -> Optional[str]:
+        """사진 전송 (photo는 이미 올린 file_id 또는 이미지 바이트) 후 Telegram file_id 반환 (실패 시 None)"""
+        chat_id = chat_id or self.chat_id
+        self._wait_turn(chat_id)
+        data = {"chat_id": chat_id, "caption": caption, "parse_mode": "HTML"}
+        files = None
+        if isinstance(photo, bytes):
+            files = {"photo": ("avatar.jpg", photo)}
+        else:
+            data["photo"] = photo
+        try:
+            with tracer.span('telegram_send_photo'):
+                response = self.transport.post(
+                    f"{self.base_url}/sendPhoto",
+                    data=data,
+                    files=files,
+                    timeout=request_timeout(self.deadline)
+                )
+                response.raise_for_status()
+            # 가장 큰 크기의 사진 file_id를 재사용
+            return response.json()['result']['photo'][-1]['file_id']
+        except (TransportError, KeyError, IndexError, ValueError) as e:
+            logger.error("Telegram 사진 전송 실패: %s", e)
+            return None
 
 
 class LumaCheckinBot:
@@ -112,16 +340,173 @@ class LumaCheckinBot:
         if not all([self.luma_api_key, self.telegram_bot_token, self.telegram_chat_id]):
             raise ValueError("필수 환경 변수가 설정되지 않았습니다. .env 파일을 확인해주세요.")
         
-        # VIP 설정 (선택사항)
-        vip_guests_str = os.getenv('VIP_GUESTS', '')
-        self.vip_guests = [name.strip() for name in vip_guests_str.split(',') if name.strip()]
+        # 실행 중에 다시 읽을 수 있는 설정: VIP, 멘션 대상, 라우팅 규칙, 전송 모드(individual/digest),
+        # 요약 주기, 알림에 표시할 등록 질문 등 (live_config.RELOADABLE_KEYS)
+        self.config_watcher = None
+        self.command_listener = None
+        self.apply_settings(LiveSettings.from_env(self.telegram_chat_id))
+        
+        self.digest_window_seconds = int(os.getenv('DIGEST_WINDOW_SECONDS', '60'))
+        self.digest_buffer = DigestBuffer(self.digest_window_seconds)
+        self.daemon = False
+        
+        # 채팅방별 동시 전송 수 (알림 라우팅 규칙이 없으면 모든 체크인을 TELEGRAM_CHAT_ID로)
+        self.delivery_workers = int(os.getenv('DELIVERY_WORKERS', '4'))
+        if os.getenv('ROUTING_RULES'):
+            logger.info("알림 라우팅 규칙 적용 (대상 채팅방 %s개)", len(self.router.chats()))
+        
+        # 단계별 소요 시간 추적 및 틱 프로파일링 (선택사항)
+        tracer.enabled = os.getenv('TRACE_STAGES', '').lower() in ('1', 'true', 'yes')
+        self.profiler = None
+        profile_mode = os.getenv('PROFILE_MODE', 'off').lower()
+        if profile_mode != 'off':
+            tracer.enabled = True
+            self.profiler = TickProfiler(
+                profile_mode,
+                os.getenv('PROFILE_DIR', 'profiles'),
+                keep_slowest=int(os.getenv('PROFILE_KEEP_SLOWEST', '0'))
+            )
+        
+        # 이벤트별 참석자 인덱스와 참석 통계
+        self.state_store = EventStateStore(os.getenv('STATE_DIR', '.bot_state.d'))
         
-        mention_users_str = os.getenv('MENTION_USERS', '')
-        self.mention_users = [user.strip() for user in mention_users_str.split(',') if user.strip()]
+        # 틱 시간 예산 (초): 예산을 다 쓰면 남은 이벤트와 알림은 다음 틱으로 미룸
+        self.tick_budget_seconds = float(os.getenv('TICK_BUDGET_SECONDS', '50'))
+        self.deadline: Optional[Deadline] = None
+        # 틱 중복 실행 방지 (이전 틱이 실행 중이면 끝난 뒤 한 번으로 합쳐서 실행) 및 예산 지표
+        self.tick_lock = TickLock(os.getenv('TICK_LOCK_FILE', '.bot_tick.lock'))
+        self.tick_metrics = TickMetrics(os.getenv('TICK_METRICS_FILE', '.bot_metrics.json'))
+        self._deferred_events = 0
+        self._deferred_notifications = 0
+        # 우선순위 레인별 알림 대기 시간 (틱마다 초기화)
+        self.lane_metrics = LaneMetrics()
+        
+        # 체크인 기록 로그 (행사 후 분석용, 빈 값이면 기록하지 않음)와 참석자별 첫 전송 시각
+        checkin_log_dir = os.getenv('CHECKIN_LOG_DIR', 'checkins.d')
+        self.checkin_log = CheckinLog(checkin_log_dir) if checkin_log_dir else None
+        self._delivered_at: Dict[int, datetime] = {}
+        # 봇 시작 후 첫 알림까지 걸린 시간 (재시작 후 알림이 다시 나가기까지의 지연)
+        self._started_at = time.monotonic()
+        self.first_notification_seconds: Optional[float] = None
+        self._startup_reported = False
+
+        # 행사 전 참석자 목록 미리 받기: 시작 몇 분 전부터, 미리 받은 목록을 몇 분마다 다시 받을지 (0이면 끔)
+        self.warmup_lead_minutes = float(os.getenv('WARMUP_LEAD_MINUTES', '60'))
+        self.warmup_refresh_minutes = float(os.getenv('WARMUP_REFRESH_MINUTES', '15'))
+        self._upcoming: Optional[Tuple[datetime, List[Dict]]] = None
+        
+        # 현재 UTC 시각 함수 (재생 시에는 가상 시계로 교체)
+        self.utcnow = datetime.utcnow
         
         # API 클라이언트 초기화
         self.luma_api = LumaAPI(self.luma_api_key)
-        self.telegram_bot = TelegramBot(self.telegram_bot_token, self.telegram_chat_id)
+        # Luma API 요청 예산 (선택사항): API 키별 토큰 버킷을 같은 호스트의 스레드/프로세스가 공유 (기본값 0은 제한 없음)
+        luma_rate = float(os.getenv('LUMA_RATE_PER_MINUTE', '0'))
+        if luma_rate > 0:
+            from rate_limit import RequestGovernor, create_bucket_store
+            self.luma_api.governor = RequestGovernor(
+                create_bucket_store(os.getenv('LUMA_RATE_STORE', 'sqlite:.luma_rate.db')), self.luma_api_key,
+                luma_rate, float(os.getenv('LUMA_RATE_BURST') or luma_rate)
+            )
+        self.telegram_bot = TelegramBot(
+            self.telegram_bot_token, self.telegram_chat_id,
+            rate_per_minute=float(os.getenv('TELEGRAM_SEND_RATE_PER_MINUTE', '20'))
+        )
+        
+        # 이벤트 메타데이터(장소, 일정, 정원, 등록 질문) 캐시: 시작 시 파일에서 읽고 TTL이 지나면 백그라운드에서 새로 고침
+        self.event_meta = EventMetadataCache(
+            os.getenv('EVENT_CACHE_FILE', '.event_cache.json'),
+            float(os.getenv('EVENT_CACHE_TTL_SECONDS', '3600')),
+            fetch=self.luma_api.get_event
+        )
+        
+        # 고정 현황판 (선택사항): 이벤트별 현황판 메시지를 DASHBOARD_INTERVAL_SECONDS마다 최대 한 번 제자리에서 수정
+        self.dashboard_chat_id = os.getenv('DASHBOARD_CHAT_ID') or None
+        if os.getenv('DASHBOARD', '').lower() in ('1', 'true', 'yes'):
+            self.dashboard_chat_id = self.dashboard_chat_id or self.telegram_chat_id
+        
+        # 스태프 명령 (선택사항, 데몬 모드): /whois로 라이브 이벤트 참석자를 로컬 검색 인덱스에서 조회
+        self.staff_commands = os.getenv('STAFF_COMMANDS', '').lower() in ('1', 'true', 'yes')
+        self.guest_search: Dict[str, GuestSearchIndex] = {}
+        self._event_names: Dict[str, str] = {}
+        
+        # 참석자 사진 전송 (선택사항): 텍스트 알림 뒤에 프로필 사진을 sendPhoto로 전송
+        self.photo_sender = None
+        if os.getenv('SEND_PHOTOS', '').lower() in ('1', 'true', 'yes'):
+            from photo import FileIdCache, PhotoSender
+            cache = FileIdCache(os.getenv('PHOTO_CACHE_FILE', '.photo_cache.json'),
+                                capacity=int(os.getenv('PHOTO_CACHE_SIZE', '1000')))
+            self.photo_sender = PhotoSender(cache, fetch_workers=int(os.getenv('PHOTO_FETCH_WORKERS', '4')))
+        
+        # Luma 응답 기록 (선택사항): 오프라인 재생용 압축 JSONL 아카이브
+        record_file = os.getenv('RECORD_FILE')
+        if record_file:
+            from replay import ResponseRecorder
+            self.luma_api.recorder = ResponseRecorder(record_file)
+        
+        # 워커 모드 설정 (선택사항): 여러 프로세스가 리스로 이벤트를 분배
+        self.lease_manager = None
+        lease_store_spec = os.getenv('LEASE_STORE')
+        if lease_store_spec:
+            import socket
+            from lease_store import LeaseManager, create_lease_store
+            worker_id = os.getenv('WORKER_ID') or socket.gethostname()
+            lease_ttl = float(os.getenv('LEASE_TTL_SECONDS', '600'))
+            self.lease_manager = LeaseManager(create_lease_store(lease_store_spec), worker_id, lease_ttl)
+            logger.info("워커 모드 활성화 (워커: %s, 리스 TTL: %.0f초)", worker_id, lease_ttl)
+    
+    def apply_settings(self, settings: LiveSettings):
+        """미리 컴파일한 설정으로 교체 (틱과 틱 사이에만 호출)"""
+        self.settings = settings
+        self.vip_guests = settings.vip_guests
+        self.vip_index = settings.vip_index
+        self.mention_users = settings.mention_users
+        # 알림 라우팅 규칙 (선택사항, 없으면 모든 체크인을 TELEGRAM_CHAT_ID로)
+        self.router = settings.router
+        self.delivery_mode = settings.delivery_mode
+        self.chat_delivery_modes = settings.chat_delivery_modes
+        # 알림에 표시할 등록 질문 답변 (설정하지 않으면 모든 답변을 등록 양식 순서대로)
+        self.show_registration_answers = settings.show_registration_answers
+        self.registration_fields = settings.registration_fields
+        # 참석 현황 요약 메시지 주기 (분, 0이면 보내지 않음)
+        self.summary_interval_minutes = settings.summary_interval_minutes
+        # 다운타임 후 따라잡기: 워터마크부터 최대 몇 시간까지 검색할지, 몇 명 이상이면 일괄 요약으로 보낼지
+        self.catchup_max_hours = settings.catchup_max_hours
+        self.bulk_summary_threshold = settings.bulk_summary_threshold
+        self.dashboard_interval_seconds = settings.dashboard_interval_seconds
+        self.staff_chat_ids = settings.staff_chat_ids
+        self.whois_limit = settings.whois_limit
+        if self.command_listener:
+            self.command_listener.allowed_chats = {str(chat_id) for chat_id in self.command_chats()}
+    
+    def reload_settings(self):
+        """`.env`가 바뀌었으면 새 설정을 검증해 교체 (잘못되었으면 이전 설정 유지)"""
+        values = self.config_watcher.poll() if self.config_watcher else None
+        if values is None:
+            return
+        try:
+            settings = LiveSettings(values, self.telegram_chat_id)
+        except ValueError as e:
+            logger.error("바뀐 설정이 올바르지 않아 이전 설정을 계속 사용합니다: %s", e)
+            return
+        changes = settings.describe_changes(self.settings)
+        if not changes:
+            return
+        self.apply_settings(settings)
+        for change in changes:
+            logger.info("설정 변경 적용: %s", change)
+    
+    def command_chats(self) -> List[str]:
+        """스태프 명령을 받을 채팅방 (알림 대상 채팅방과 STAFF_CHAT_IDS)"""
+        return self.router.chats() + self.staff_chat_ids
+    
+    def is_vip(self, guest: Dict) -> bool:
+        """VIP 참석자인지 확인"""
+        return guest.get('name', '알 수 없음') in self.vip_index
+    
+    def delivery_mode_for(self, chat_id: str) -> str:
+        """채팅방의 알림 전송 모드"""
+        return self.chat_delivery_modes.get(chat_id, self.delivery_mode)
     
     def is_first_run(self) -> bool:
         """첫 번째 실행인지 확인"""
@@ -134,12 +519,13 @@ class LumaCheckinBot:
                 f.write(str(datetime.now().isoformat()))
             logger.info("실행 상태 파일이 생성되었습니다.")
         except Exception as e:
-            logger.warning(f"상태 파일 생성 실패: {e}")
+            logger.warning("상태 파일 생성 실패: %s", e)
     
-    def get_recent_checkins(self, guests: List[Dict], minutes_ago: int = 5) -> List[Dict]:
-        """최근 N분 내 체크인한 사용자 필터링"""
-        now = datetime.utcnow()
-        cutoff_time = now - timedelta(minutes=minutes_ago)
+    def get_recent_checkins(self, guests: List[Dict], minutes_ago: float = 5,
+                            since: Optional[datetime] = None) -> List[Dict]:
+        """최근 N분 내(since를 주면 그 시각 이후) 체크인한 사용자 필터링"""
+        now = self.utcnow()
+        cutoff_time = since or now - timedelta(minutes=minutes_ago)
         
         recent_checkins = []
         
@@ -162,13 +548,14 @@ class LumaCheckinBot:
                     recent_checkins.append(guest)
                     
             except (ValueError, TypeError) as e:
-                logger.warning(f"체크인 시간 파싱 실패: {checked_in_at_str}, 오류: {e}")
+                logger.warning("체크인 시간 파싱 실패: %s, 오류: %s", checked_in_at_str, e)
                 continue
         
         return recent_checkins
     
-    def format_checkin_message(self, guest: Dict, event_name: str) -> str:
-        """체크인 메시지 포맷팅"""
+    def format_checkin_message(self, guest: Dict, event_name: str,
+                               questions: Optional[QuestionSchema] = None) -> str:
+        """체크인 메시지 포맷팅 (questions를 주면 등록 질문 답변도 표시)"""
         name = guest.get('name', '알 수 없음')
         email = guest.get('email', '이메일 없음')
         ticket_type = guest.get('ticket_type', '일반')
@@ -186,35 +573,87 @@ class LumaCheckinBot:
             formatted_time = checked_in_at_str
         
         # VIP 체크 및 멘션 추가
-        is_vip = name in self.vip_guests
+        is_vip = self.is_vip(guest)
         vip_indicator = "🌟 VIP " if is_vip else ""
         
         message = f"""
 🎫 <b>{vip_indicator}새로운 체크인 알림</b>
 
-📅 <b>이벤트:</b> {event_name}
-👤 <b>이름:</b> {name}
-📧 <b>이메일:</b> {email}
-🏷️ <b>티켓 종류:</b> {ticket_type}
-⏰ <b>체크인 시간:</b> {formatted_time}
+📅 <b>이벤트:</b> {html.escape(str(event_name))}
+👤 <b>이름:</b> {html.escape(str(name))}
+📧 <b>이메일:</b> {html.escape(str(email))}
+🏷️ <b>티켓 종류:</b> {html.escape(str(ticket_type))}
+⏰ <b>체크인 시간:</b> {html.escape(str(formatted_time))}
         """.strip()
         
+        # 등록 질문 답변 (이벤트별 질문 스키마에서 표시 위치를 조회)
+        if questions is not None:
+            answers = questions.format_answers(guest)
+            if answers:
+                message += f"\n\n{answers}"
+        
         # VIP인 경우 멘션 추가
         if is_vip and self.mention_users:
             mentions = " ".join(self.mention_users)
             message += f"\n\n🚨 <b>VIP 참석자 체크인!</b> {mentions}"
-            logger.info(f"VIP 참석자 {name} 체크인 - 멘션 전송: {mentions}")
+            logger.info("VIP 참석자 %s 체크인 - 멘션 전송: %s", name, mentions)
         
         return message
     
-    def run_check(self, minutes_ago: Optional[int] = None):
-        """메인 체크 로직 실행"""
+    def run_check(self, minutes_ago: Optional[float] = None, coalesced: int = 0):
+        """메인 체크 로직 실행 (이전 틱이 실행 중이면 건너뛰고 그 틱에 합침)"""
+        if not self.tick_lock.try_acquire():
+            self.tick_lock.mark_pending()
+            logger.warning("이전 틱이 아직 실행 중이라 이번 틱은 끝난 뒤 합쳐서 실행합니다.")
+            return
+        try:
+            started = self.utcnow()
+            deadline = Deadline(self.tick_budget_seconds, self._scheduler_deadline())
+            minutes_ago = self._run_tick(minutes_ago, deadline, coalesced, os.getenv('TICK_ID'))
+            
+            # 실행 중에 건너뛴 틱이 있으면 그 구간까지 덮도록 검색 구간을 늘려 한 번만 이어서 실행
+            coalesced = self.tick_lock.pop_pending()
+            while coalesced:
+                deadline = Deadline(self.tick_budget_seconds, self._scheduler_deadline())
+                if deadline.expired():
+                    # 스케줄러가 정한 마감 시각이 지났으면 다음 틱이 이어받도록 기록만 남김
+                    for _ in range(coalesced):
+                        self.tick_lock.mark_pending()
+                    break
+                minutes_ago += (self.utcnow() - started).total_seconds() / 60
+                logger.info("실행 중 건너뛴 틱 %s개를 합쳐 최근 %.1f분 구간으로 다시 실행합니다.", coalesced, minutes_ago)
+                started = self.utcnow()
+                minutes_ago = self._run_tick(minutes_ago, deadline, coalesced)
+                coalesced = self.tick_lock.pop_pending()
+        finally:
+            self.tick_lock.release()
+    
+    @staticmethod
+    def _scheduler_deadline() -> Optional[float]:
+        """스케줄러가 전달한 절대 마감 시각 (epoch 초)"""
+        value = os.getenv('TICK_DEADLINE')
+        return float(value) if value else None
+    
+    def _run_tick(self, minutes_ago: Optional[float], deadline: Deadline, coalesced: int,
+                  tick_id: Optional[str] = None) -> float:
+        """틱 하나 실행 후 사용한 검색 구간(분) 반환"""
+        # 이번 틱의 모든 로그에 같은 상관관계 ID 부여 (스케줄러가 전달한 ID가 있으면 이어서 사용)
+        tick_id = new_tick_id(tick_id)
+        tracer.begin_tick(tick_id)
+        if self.profiler:
+            self.profiler.start()
+        self.deadline = self.luma_api.deadline = self.telegram_bot.deadline = deadline
+        self._deferred_events = 0
+        self._deferred_notifications = 0
+        self.lane_metrics.reset()
+        if self.luma_api.governor:
+            self.luma_api.governor.reset_stats()
         try:
             # 스케줄러에서 전달된 minutes_ago 값이 있는지 확인
             force_minutes_ago = os.getenv('FORCE_MINUTES_AGO')
-            if force_minutes_ago:
+            if force_minutes_ago and minutes_ago is None:
                 minutes_ago = int(force_minutes_ago)
-                logger.info(f"스케줄러에서 지정된 시간: {minutes_ago}분")
+                logger.info("스케줄러에서 지정된 시간: %s분", minutes_ago)
             
             # 첫 번째 실행인지 확인 (환경 변수가 없을 때만)
             first_run = self.is_first_run() if not force_minutes_ago else False
@@ -223,54 +662,66 @@ class LumaCheckinBot:
             if minutes_ago is None:
                 minutes_ago = 20 if first_run else 5
             
-            logger.info(f"Luma 체크인 봇 실행 시작 (최근 {minutes_ago}분 체크인 검색)")
+            logger.info("Luma 체크인 봇 실행 시작 (워터마크가 없는 이벤트는 최근 %s분 체크인 검색)", minutes_ago)
             
             if first_run:
                 logger.info("첫 번째 실행: 20분 전부터 체크인 검색")
             
+            if self.luma_api.recorder:
+                self.luma_api.recorder.begin_tick(tick_id, self.utcnow(), minutes_ago)
+            
             # 1. 라이브 이벤트 조회
             live_events = self.luma_api.get_live_events()
             
             if not live_events:
                 logger.info("현재 라이브 상태인 이벤트가 없습니다.")
+                self.warm_upcoming_events(deadline, set())
                 # 첫 실행이었다면 상태 파일 생성
                 if first_run:
                     self.mark_as_run()
-                return
-            
-            # 첫 번째 라이브 이벤트 선택 (PRD에 따라 단일 이벤트만 처리)
-            event = live_events[0]
-            event_api_id = event.get('api_id')
-            event_name = event.get('name', '알 수 없는 이벤트')
-            
-            logger.info(f"라이브 이벤트 발견: {event_name} (ID: {event_api_id})")
+                return minutes_ago
             
-            # 2. 이벤트 참석자 조회
-            guests = self.luma_api.get_event_guests(event_api_id)
-            logger.info(f"총 {len(guests)}명의 참석자 정보를 조회했습니다.")
+            # 워커 모드에서는 리스를 확보한 이벤트만 처리
+            if self.lease_manager:
+                event_ids = [event.get('api_id') for event in live_events]
+                owned_ids = set(self.lease_manager.claim(event_ids))
+                live_events = [event for event in live_events if event.get('api_id') in owned_ids]
+
+            # 라이브가 끝났거나 다른 워커가 맡은 이벤트의 검색 인덱스는 정리
+            live_ids = {event.get('api_id') for event in live_events}
+            for event_id in [event_id for event_id in self.guest_search if event_id not in live_ids]:
+                del self.guest_search[event_id]
+                self._event_names.pop(event_id, None)
             
-            # 3. 최근 N분 내 체크인한 사용자 필터링
-            recent_checkins = self.get_recent_checkins(guests, minutes_ago=minutes_ago)
+            # 캐시에 없거나 오래된 이벤트 메타데이터는 이벤트를 처리하는 동안 백그라운드에서 새로 고침
+            for event in live_events:
+                self.event_meta.get(event.get('api_id'))
             
-            if not recent_checkins:
-                logger.info(f"최근 {minutes_ago}분 내 새로운 체크인이 없습니다.")
-                # 첫 실행이었다면 상태 파일 생성
-                if first_run:
-                    self.mark_as_run()
-                return
+            # 워터마크가 오래된(이전 틱에서 미룬) 이벤트를 먼저 처리해 같은 이벤트만 계속 밀리지 않도록 함
+            live_events.sort(key=lambda event: self.state_store.get(event.get('api_id')).watermark or '')
+
+            for index, event in enumerate(live_events):
+                if deadline.expired():
+                    # 예산을 다 썼으면 남은 이벤트는 이번 검색 구간을 기억해 두고 다음 틱에서 처리
+                    logger.warning("틱 시간 예산을 모두 사용해 이벤트 %s개를 다음 틱으로 미룹니다.", len(live_events) - index)
+                    for deferred in live_events[index:]:
+                        self.defer_event(deferred.get('api_id'), minutes_ago)
+                    break
+                # 요청 예산이 있으면 남은 예산을 남은 이벤트 수로 나눈 만큼만 참석자 페이지를 조회 (나머지는 다음 틱)
+                max_pages = None
+                if self.luma_api.governor and index < len(live_events) - 1:
+                    max_pages = self.luma_api.governor.fair_share(len(live_events) - index)
+                try:
+                    self.process_event(event, minutes_ago, max_pages)
+                except DeadlineExceeded as e:
+                    logger.warning("%s, 이벤트를 다음 틱으로 미룹니다.", e)
+                    self.defer_event(event.get('api_id'), minutes_ago)
             
-            logger.info(f"최근 {minutes_ago}분 내 {len(recent_checkins)}명이 체크인했습니다.")
+            # 윈도우가 끝난 다이제스트 전송 (단발성 실행은 프로세스가 끝나므로 예산과 관계없이 모두 전송)
+            self.flush_digests(force=not self.daemon)
             
-            # 4. Telegram 메시지 전송
-            for guest in recent_checkins:
-                message = self.format_checkin_message(guest, event_name)
-                success = self.telegram_bot.send_message(message)
-                
-                if success:
-                    guest_name = guest.get('name', '알 수 없음')
-                    logger.info(f"{guest_name}의 체크인 알림을 전송했습니다.")
-                else:
-                    logger.error(f"메시지 전송 실패: {guest.get('name', '알 수 없음')}")
+            # 라이브 이벤트를 모두 처리하고 남은 예산으로 곧 시작할 이벤트의 참석자 목록을 미리 받음
+            self.warm_upcoming_events(deadline, live_ids)
             
             # 첫 실행이었다면 상태 파일 생성
             if first_run:
@@ -279,16 +730,723 @@ class LumaCheckinBot:
             logger.info("Luma 체크인 봇 실행 완료")
             
         except Exception as e:
-            logger.error(f"봇 실행 중 오류 발생: {e}", exc_info=True)
+            logger.error("봇 실행 중 오류 발생: %s", e, exc_info=True)
+        finally:
+            if self.photo_sender:
+                self.photo_sender.cache.save()
+            # 단발성 실행은 프로세스가 끝나므로 진행 중인 메타데이터 새로 고침을 남은 예산 안에서 기다린 뒤 저장
+            if not self.daemon:
+                self.event_meta.wait(min(deadline.remaining(), DEFAULT_REQUEST_TIMEOUT))
+            self.event_meta.save()
+            self.record_tick_metrics(deadline, coalesced)
+            if self.profiler:
+                self.profiler.stop(tick_id)
+            trace = tracer.end_tick()
+            if trace:
+                logger.info("%s", trace.format())
+        return minutes_ago
+    
+    def warm_upcoming_events(self, deadline: Deadline, live_ids: Set[str]):
+        """곧 시작할 이벤트의 참석자 목록을 미리 받아 인덱스에 반영 (남은 예산으로만 실행하는 낮은 우선순위 작업)
+        
+        문이 열리는 시각에 첫 라이브 틱이 전체 목록을 처음부터 색인하지 않고 변경분만 반영하도록,
+        WARMUP_LEAD_MINUTES 안에 시작하는 이벤트의 참석자 동기화를 라이브가 되기 전에 끝내 둡니다.
+        """
+        if self.warmup_lead_minutes <= 0 or self.lease_manager:
+            return
+        if self._deferred_events or self._deferred_notifications:
+            # 라이브 이벤트 작업이 밀렸으면 미리 받기는 건너뜀
+            return
+        if deadline.remaining() <= deadline.budget * WARMUP_RESERVE_RATIO:
+            return
+        
+        now = self.utcnow()
+        refresh = timedelta(minutes=self.warmup_refresh_minutes)
+        if self._upcoming is None or now - self._upcoming[0] >= refresh:
+            events = self.luma_api.list_calendar_events(now, now + timedelta(minutes=self.warmup_lead_minutes))
+            self._upcoming = (now, upcoming_events(events, now, self.warmup_lead_minutes))
+        
+        governor = self.luma_api.governor
+        for event in self._upcoming[1]:
+            if event.get('api_id') in live_ids:
+                continue
+            if deadline.remaining() <= deadline.budget * WARMUP_RESERVE_RATIO:
+                break
+            if governor and governor.remaining() < 2:
+                break
+            self.warm_event(event, deadline, refresh)
+    
+    def warm_event(self, event: Dict, deadline: Deadline, refresh: timedelta):
+        """라이브 전 이벤트 하나의 참석자 동기화 (동기화 체크포인트를 라이브 틱과 함께 사용)"""
+        event_api_id = event.get('api_id')
+        event_name = event.get('name', '알 수 없는 이벤트')
+        state = self.state_store.get(event_api_id)
+        sync = state.sync
+        now = self.utcnow()
+        if not sync.in_progress:
+            if sync.last_completed_at and now - datetime.fromisoformat(sync.last_completed_at) < refresh:
+                return
+            sync.started_at = now.isoformat()
+        sync.ticks += 1
+        
+        # 상세 정보(등록 질문 포함)는 메타데이터 캐시가 백그라운드에서 받아 둠
+        self.event_meta.get(event_api_id)
+        max_pages = None
+        if self.luma_api.governor:
+            max_pages = max(int(self.luma_api.governor.remaining() * WARMUP_REQUEST_SHARE), 1)
+        
+        delta = GuestDelta()
+        fetched = 0
+        interrupted = None
+        try:
+            for entries, next_cursor in self.luma_api.iter_guest_pages(event_api_id, sync.cursor, max_pages):
+                with tracer.span('guest_index_update'):
+                    delta.changes.extend(state.guest_index.apply_page(entries, sync.seen).changes)
+                self.registration_questions(event_api_id, entries)
+                fetched += len(entries)
+                sync.advance(next_cursor)
+                if next_cursor and deadline.remaining() <= deadline.budget * WARMUP_RESERVE_RATIO:
+                    interrupted = DeadlineExceeded("틱 시간 예산이 라이브 이벤트 몫만 남음")
+                    break
+        except DeadlineExceeded as e:
+            interrupted = e
+        except TransportError as e:
+            interrupted = e
+            if sync.in_progress and not fetched:
+                sync.reset()
+        
+        if sync.in_progress or interrupted:
+            logger.info("시작 전 이벤트 %s 참석자 목록 미리 받기는 다음 틱에 이어서 진행합니다: %s (%s)",
+                        event_name, sync.progress(), interrupted)
+        else:
+            delta.changes.extend(state.guest_index.remove_unseen(sync.seen).changes)
+            sync.complete(now)
+            logger.info("시작 전 이벤트 %s 참석자 목록을 미리 받았습니다 (%s명, 변경 %s건).", event_name, sync.last_total, len(delta))
+        state.stats.apply(delta)
+        state.stats.prune(now)
+        self.state_store.save(state)
+    
+    def defer_event(self, event_api_id: str, minutes_ago: float):
+        """처리하지 못한 이벤트를 다음 틱으로 미룸 (워터마크가 없으면 이번 검색 구간 시작으로 설정)"""
+        state = self.state_store.get(event_api_id)
+        if state.watermark is None:
+            state.watermark = (self.utcnow() - timedelta(minutes=minutes_ago)).isoformat()
+            self.state_store.save(state)
+        self._deferred_events += 1
+    
+    def record_tick_metrics(self, deadline: Deadline, coalesced: int):
+        """틱 예산 사용량과 미루거나 합친 작업 수 기록"""
+        if self.first_notification_seconds is not None and not self._startup_reported:
+            self._startup_reported = True
+            self.tick_metrics.data['startup'] = {
+                'first_notification_seconds': round(self.first_notification_seconds, 3),
+                'snapshot_guests': self.state_store.loaded_guests,
+                'snapshot_load_ms': round(self.state_store.load_seconds * 1000, 1),
+            }
+            logger.info("시작 후 첫 알림까지 %.2f초 (스냅샷에서 참석자 %s명 적재, %.0fms)",
+                        self.first_notification_seconds, self.state_store.loaded_guests,
+                        self.state_store.load_seconds * 1000)
+        exceeded = deadline.expired() or bool(self._deferred_events or self._deferred_notifications)
+        self.tick_metrics.record_tick(
+            deadline, exceeded, self._deferred_events, self._deferred_notifications, coalesced,
+            lanes=self.lane_metrics.snapshot()
+        )
+        logger.info(
+            "틱 예산 사용 %.1f/%.0f초 (%.0f%%, 평균 %.0f%%), 미룬 이벤트 %s개, 미룬 알림 %s건, 합친 틱 %s개",
+            deadline.elapsed(), deadline.budget, self.tick_metrics.data['last_usage'] * 100,
+            self.tick_metrics.average_usage() * 100,
+            self._deferred_events, self._deferred_notifications, coalesced
+        )
+        governor = self.luma_api.governor
+        if governor:
+            logger.info(
+                "Luma API 요청 %s건 (예산 대기 %.1f초, 남은 예산 %.0f/%.0f건)",
+                governor.requests, governor.waited, governor.remaining(), governor.burst
+            )
+        lanes = self.lane_metrics.format()
+        if lanes:
+            logger.info("레인별 알림 대기 시간: %s", lanes)
+    
+    def memory_structures(self) -> Dict[str, int]:
+        """메모리 진단용 자료 구조별 항목 수"""
+        states = self.state_store.states()
+        sizes = {
+            '이벤트 상태': len(states),
+            '참석자 인덱스': sum(len(state.guest_index) for state in states),
+            '전송 기록': sum(len(state.notified) for state in states),
+            '미룬 알림': sum(len(state.deferred_checkins) for state in states),
+            '동기화 중 확인한 참석자': sum(len(state.sync.seen) for state in states),
+            '현황판 최근 도착/VIP': sum(len(state.dashboard.arrivals) + len(state.dashboard.vips) for state in states),
+            '모아 보내기 대기': len(self.digest_buffer),
+            '참석자 검색 인덱스': sum(len(search) for search in self.guest_search.values()),
+            '검색 이벤트 이름': len(self._event_names),
+            '이벤트 메타데이터 캐시': len(self.event_meta),
+            '시작 전 이벤트 목록': len(self._upcoming[1]) if self._upcoming else 0,
+            '전송 시각 기록': len(self._delivered_at),
+            '채팅방별 전송 간격': len(self.telegram_bot._next_send_at),
+        }
+        if self.photo_sender:
+            sizes['사진 file_id 캐시'] = len(self.photo_sender.cache)
+            sizes['사진 다운로드 대기'] = self.photo_sender.pending_downloads()
+            sizes['사진 전송 중 URL 잠금'] = self.photo_sender.sending_urls()
+        if self.lease_manager:
+            sizes['보유 중인 리스'] = len(self.lease_manager.held)
+        if self.command_listener:
+            sizes['스태프 명령 허용 채팅방'] = len(self.command_listener.allowed_chats)
+        return sizes
+    
+    def process_event(self, event: Dict, minutes_ago: float, max_pages: Optional[int] = None):
+        """단일 라이브 이벤트의 체크인 알림 처리
+        
+        참석자 목록은 이벤트 상태의 동기화 체크포인트부터 이어서 최대 max_pages 페이지까지 조회하며,
+        시간이나 요청 예산이 부족하면 조회한 페이지까지만 반영하고 DeadlineExceeded를 다시 발생시킵니다.
+        """
+        event_api_id = event.get('api_id')
+        event_name = event.get('name', '알 수 없는 이벤트')
+        
+        logger.info("라이브 이벤트 발견: %s (ID: %s)", event_name, event_api_id)
+        
+        state = self.state_store.get(event_api_id)
+        sync = state.sync
+        self.restore_pending_digest(state)
+        # 캐시된 이벤트 메타데이터(또는 이벤트 정보)에 등록 질문 목록이 있으면 질문 스키마 캐시 갱신
+        meta = self.event_meta.get(event_api_id)
+        self.registration_questions(event_api_id, [], meta if meta and meta.get('registration_questions') else event)
+        # 이전에 전체 동기화를 마친 인덱스라면 인덱스 변경분으로도 새 체크인을 찾음
+        index_ready = sync.last_completed_at is not None
+        if sync.in_progress:
+            logger.info("이벤트 %s 참석자 동기화 이어서 진행: %s", event_name, sync.progress())
+        else:
+            sync.started_at = self.utcnow().isoformat()
+        sync.ticks += 1
+        
+        # 2. 이벤트 참석자 조회 (페이지마다 인덱스에 반영하고 체크포인트 갱신)
+        guests = []
+        delta = GuestDelta()
+        # 스태프 명령용 검색 인덱스 (데몬 모드에서 스태프 명령을 켠 경우에만 유지)
+        search = None
+        if self.daemon and self.staff_commands:
+            search = self.guest_search.setdefault(event_api_id, GuestSearchIndex())
+            self._event_names[event_api_id] = event_name
+        interrupted = None
+        sync_started_at = None
+        try:
+            for entries, next_cursor in self.luma_api.iter_guest_pages(event_api_id, sync.cursor, max_pages):
+                with tracer.span('guest_index_update'):
+                    delta.changes.extend(state.guest_index.apply_page(entries, sync.seen).changes)
+                    if search is not None:
+                        search.update_page(entries)
+                    if self.dashboard_chat_id and self.vip_guests:
+                        for guest in entries:
+                            if self.is_vip(guest):
+                                state.dashboard.update_vip(guest)
+                guests.extend(entries)
+                sync.advance(next_cursor)
+        except DeadlineExceeded as e:
+            interrupted = e
+        except TransportError as e:
+            logger.error("이벤트 %s의 참석자 조회 실패: %s", event_api_id, e)
+            if sync.in_progress and not guests:
+                # 저장된 커서가 더 이상 유효하지 않을 수 있으므로 다음 틱에는 첫 페이지부터 다시 조회
+                logger.warning("이벤트 %s 참석자 동기화를 처음부터 다시 시작합니다.", event_name)
+                sync.reset()
+            if not guests:
+                self.state_store.save(state)
+                return
+            interrupted = e
+        
+        if sync.in_progress or interrupted:
+            # 목록 일부만 본 상태에서는 사라진 참석자를 판단하지 않음
+            logger.info("이벤트 %s 참석자 동기화 진행 중: %s", event_name, sync.progress())
+        else:
+            with tracer.span('guest_index_update'):
+                removed = state.guest_index.remove_unseen(sync.seen)
+                delta.changes.extend(removed.changes)
+                if search is not None:
+                    search.remove(guest_id for guest_id, _, _ in removed.changes)
+            if sync.ticks > 1:
+                logger.info("이벤트 %s 참석자 동기화 완료: %s", event_name, sync.progress())
+            sync_started_at = sync.started_at
+            sync.complete(self.utcnow())
+        logger.info("이번 틱에 %s명의 참석자 정보를 조회했습니다.", len(guests))
+        
+        # 참석자 변경분만으로 참석 통계 갱신
+        with tracer.span('guest_index_update'):
+            state.stats.apply(delta)
+            state.stats.prune(self.utcnow())
+        logger.info("참석자 변경 %s건 반영 (체크인 %s / %s명)", len(delta), state.stats.checked_in, state.stats.registered)
+        
+        try:
+            # 3. 워터마크(마지막으로 모두 처리한 시각) 이후 체크인한 사용자 필터링
+            #    워터마크가 없는 새 이벤트는 최근 N분, 다운타임이 길어도 CATCHUP_MAX_HOURS까지만 따라잡음
+            now = self.utcnow()
+            since = now - timedelta(minutes=minutes_ago)
+            if state.watermark:
+                since = max(datetime.fromisoformat(state.watermark), now - timedelta(hours=self.catchup_max_hours))
+                gap_minutes = (now - since).total_seconds() / 60
+                if gap_minutes > max(minutes_ago, 5) * 2:
+                    logger.info("이벤트 %s: 마지막 처리 이후 %.0f분 동안의 체크인을 따라잡습니다.", event_name, gap_minutes)
+            with tracer.span('get_recent_checkins'):
+                recent_checkins = self.get_recent_checkins(guests, since=since)
+                # 앞쪽 페이지를 이전 틱에 조회한 뒤 체크인한 참석자도 놓치지 않도록 인덱스 변경분의 새 체크인을 더함
+                if index_ready:
+                    new_ids = set(delta.new_checkin_ids()) - {guest_key(guest) for guest in recent_checkins}
+                    # 재시작 후 상태 파일보다 오래된 스냅샷에서 시작했으면 워터마크 이전(이미 처리한) 체크인도
+                    # 변경분에 나오므로 제외
+                    watermark_at = datetime.fromisoformat(state.watermark) if state.watermark else None
+                    recent_checkins += [
+                        guest for guest in guests
+                        if guest_key(guest) in new_ids
+                        and not (watermark_at and (parse_utc(guest_checked_in_at(guest)) or now) < watermark_at)
+                    ]
+                # 검색 구간이 겹쳐도 이미 알린 체크인은 다시 보내지 않음
+                recent_checkins = [guest for guest in recent_checkins if guest_key(guest) not in state.notified]
+                for guest in recent_checkins:
+                    checked_in_at = parse_utc(guest_checked_in_at(guest))
+                    if guest_key(guest) and checked_in_at:
+                        state.notified[guest_key(guest)] = checked_in_at.isoformat()
+            
+            minutes_searched = round((now - since).total_seconds() / 60, 1)
+            if not recent_checkins and not state.deferred_checkins:
+                logger.info("최근 %s분 내 새로운 체크인이 없습니다.", minutes_searched)
+            else:
+                # 이전 틱에서 예산 부족으로 보내지 못한 알림은 같은 채팅방으로 먼저 전송
+                deferred, state.deferred_checkins = state.deferred_checkins, []
+                state.deferred_checkins = self.send_checkin_notifications(
+                    event_api_id, event_name, recent_checkins, minutes_searched, since=since, deferred=deferred
+                )
+            
+            # 참석자 목록을 끝까지 본 시점에만 워터마크를 이번 동기화 시작 시각으로 옮김
+            # (일부만 본 틱에서는 옮기지 않아 다음 틱이 같은 구간부터 다시 검색)
+            if sync_started_at:
+                state.advance_watermark(sync_started_at)
+            elif state.watermark is None:
+                state.watermark = since.isoformat()
+            
+            if self.dashboard_chat_id and recent_checkins:
+                state.dashboard.add_arrivals(recent_checkins)
+            if not self.deadline or not self.deadline.expired():
+                self.update_dashboard(state, event_name)
+            
+            if not interrupted and (not self.deadline or not self.deadline.expired()):
+                self.send_summary_if_due(state, event_name)
+        finally:
+            with tracer.span('state_save'):
+                self.state_store.save(state)
+        
+        if isinstance(interrupted, DeadlineExceeded):
+            raise interrupted
+    
+    def send_checkin_notifications(self, event_api_id: str, event_name: str,
+                                   recent_checkins: List[Dict], minutes_ago: float,
+                                   since: Optional[datetime] = None,
+                                   deferred: Optional[List[Dict]] = None) -> List[Dict]:
+        """체크인을 라우팅 규칙에 따라 채팅방별로 나누어 동시에 전송하고, 시간 예산 부족으로 보내지 못한 항목 반환
+        
+        미룬 항목은 {'guest': 참석자, 'chats': [채팅방 ID, ...], 'detected_at': 감지 시각} 형식이며,
+        다음 틱에서 해당 채팅방으로만 다시 보냅니다. 처리가 끝난 체크인은 체크인 기록 로그에 남깁니다.
+        채팅방별로 밀린 체크인이 BULK_SUMMARY_THRESHOLD명 이상이면 VIP를 제외하고 일괄 요약 메시지 하나로 보냅니다.
+        """
+        logger.info("최근 %s분 내 %s명이 체크인했습니다.", minutes_ago, len(recent_checkins))
+        
+        # 4. 체크인마다 라우팅 규칙을 한 번씩 평가해 채팅방별 대기열 구성 (미뤘던 체크인이 먼저)
+        per_chat: Dict[str, List[Dict]] = {}
+        position: Dict[int, int] = {}
+        for entry in deferred or []:
+            guest = entry['guest']
+            position[id(guest)] = len(position)
+            for chat_id in entry['chats'] or self.router.route(guest, event_api_id, self.is_vip(guest)):
+                per_chat.setdefault(chat_id, []).append(guest)
+        for guest in recent_checkins:
+            position[id(guest)] = len(position)
+            for chat_id in self.router.route(guest, event_api_id, self.is_vip(guest)):
+                per_chat.setdefault(chat_id, []).append(guest)
+        
+        # 등록 질문 스키마: 처음 보는 질문이 있을 때만 다시 계산
+        questions = self.registration_questions(
+            event_api_id, recent_checkins + [entry['guest'] for entry in deferred or []]
+        )
+        
+        # 채팅방별 전송 항목 (VIP/멘션 -> 일반 -> 요약 레인 순으로 전송)
+        now = self.utcnow()
+        queued_at = time.monotonic()
+        messages: Dict[int, str] = {}
+        batches: Dict[str, List[Notification]] = {}
+        for chat_id, guests in per_chat.items():
+            use_digest = self.delivery_mode_for(chat_id) == 'digest'
+            regular = [guest for guest in guests if not self.is_vip(guest)]
+            # 다운타임 후처럼 체크인이 많이 밀렸으면 개별 메시지 대신 일괄 요약
+            use_bulk = (not use_digest and 0 < self.bulk_summary_threshold <= len(regular))
+            items = []
+            for guest in guests:
+                # 다이제스트나 일괄 요약 모드에서도 VIP는 즉시 개별 전송
+                if self.is_vip(guest) or not (use_digest or use_bulk):
+                    if id(guest) not in messages:
+                        with tracer.span('format_message'):
+                            messages[id(guest)] = self.format_checkin_message(guest, event_name, questions)
+                        # 텍스트를 보내는 동안 프로필 사진을 미리 내려받음
+                        if self.photo_sender and guest_avatar_url(guest):
+                            self.photo_sender.prefetch(guest_avatar_url(guest))
+                    lane = LANE_VIP if self.is_vip(guest) else LANE_REGULAR
+                    items.append(Notification([guest], messages[id(guest)], lane, queued_at))
+                elif use_digest:
+                    self.digest_buffer.add(chat_id, event_api_id, event_name, guest, now)
+            if use_bulk:
+                entries = [digest_entry(event_api_id, event_name, guest) for guest in regular]
+                items.append(Notification(regular, format_backlog(entries, since or now, now), LANE_SUMMARY, queued_at))
+            batches[chat_id] = prioritize(items)
+        
+        # 채팅방끼리는 동시에, 채팅방 안에서는 레인 순서대로 전송
+        unsent = deliver_per_chat(
+            batches,
+            lambda chat_id, items: self._send_chat_batch(event_api_id, event_name, chat_id, items),
+            self.delivery_workers
+        )
+        
+        # 보내지 못한 항목을 참석자 단위로 모아 원래 순서대로 반환 (감지 시각은 처음 감지한 틱 기준)
+        detected_at = {id(entry['guest']): entry.get('detected_at') for entry in deferred or []}
+        pending: Dict[int, Dict] = {}
+        for chat_id, items in unsent.items():
+            for item in items:
+                for guest in item.guests:
+                    pending.setdefault(id(guest), {
+                        'guest': guest, 'chats': [], 'detected_at': detected_at.get(id(guest)) or epoch(now)
+                    })['chats'].append(chat_id)
+        self._deferred_notifications += len(pending)
+        
+        if self.checkin_log:
+            guests = [entry['guest'] for entry in deferred or []] + recent_checkins
+            self.checkin_log.append(event_api_id, [
+                CheckinRecord(
+                    epoch(parse_utc(guest_checked_in_at(guest))),
+                    detected_at.get(id(guest)) or epoch(now),
+                    epoch(self._delivered_at.get(id(guest))),
+                    guest_key(guest) or '',
+                    guest_ticket_type(guest),
+                    self.is_vip(guest),
+                    guest.get('name', '알 수 없음'),
+                )
+                for guest in guests if id(guest) not in pending
+            ])
+        self._delivered_at.clear()
+        return [pending[key] for key in sorted(pending, key=position.__getitem__)]
+    
+    def registration_questions(self, event_api_id: str, guests: List[Dict],
+                               event: Optional[Dict] = None) -> Optional[QuestionSchema]:
+        """이벤트의 등록 질문 스키마 (이벤트 상태에 캐시, 등록 양식이 바뀌면 다시 만듦)"""
+        if not self.show_registration_answers:
+            return None
+        state = self.state_store.get(event_api_id)
+        # 이벤트 정보에 질문 목록이 있고 캐시와 다르면 교체
+        schema = QuestionSchema.from_event(event) if event else None
+        if schema is not None and schema.signature != state.questions.signature:
+            logger.info("이벤트 %s의 등록 질문 %s개를 불러왔습니다.", event_api_id, len(schema.questions))
+            state.questions = schema
+        if state.questions.learn(guests):
+            logger.info("이벤트 %s의 등록 질문 목록이 바뀌었습니다 (%s개).", event_api_id, len(state.questions.questions))
+        state.questions.configure(self.registration_fields)
+        return state.questions
+    
+    def _send_chat_batch(self, event_api_id: str, event_name: str, chat_id: str,
+                         items: List[Notification]) -> List[Notification]:
+        """채팅방 하나에 항목을 레인 순서대로 전송하고 시간 예산 부족으로 보내지 못한(낮은 레인부터) 항목 반환"""
+        unsent = []
+        for index, (guests, message, lane, queued_at) in enumerate(items):
+            # 리스를 잃었다면 다른 워커가 이어받으므로 즉시 중단 (중복 알림 방지)
+            if self.lease_manager and not self.lease_manager.still_holds(event_api_id):
+                logger.warning("이벤트 %s의 리스를 잃어 알림 전송을 중단합니다.", event_name)
+                return []
+            
+            # 예산 안에 보낼 수 없으면 남은 알림은 이벤트 상태에 보관했다가 다음 틱에서 먼저 전송
+            if self._out_of_send_budget(chat_id):
+                logger.warning("틱 시간 예산을 모두 사용해 채팅방 %s의 알림 %s건을 다음 틱으로 미룹니다.",
+                               chat_id, len(items) - index)
+                unsent = items[index:]
+                items = items[:index]
+                break
+            
+            # 대기 시간: 대기열에 넣은 뒤 전송 속도 제한 대기까지 마치고 실제로 보내는 시각까지
+            self.lane_metrics.record(lane, time.monotonic() + self.telegram_bot.next_send_delay(chat_id), queued_at)
+            success = self.telegram_bot.send_message(message, chat_id=chat_id)
+            if success:
+                if self.first_notification_seconds is None:
+                    self.first_notification_seconds = time.monotonic() - self._started_at
+                for guest in guests:
+                    self._delivered_at.setdefault(id(guest), self.utcnow())
+            if len(guests) > 1:
+                if success:
+                    logger.info("밀린 체크인 %s건을 일괄 요약으로 전송했습니다 (채팅방: %s)", len(guests), chat_id)
+                else:
+                    logger.error("일괄 요약 전송 실패 (채팅방: %s, %s건)", chat_id, len(guests))
+            elif success:
+                logger.info("%s의 체크인 알림을 전송했습니다 (채팅방: %s)", guests[0].get('name', '알 수 없음'), chat_id)
+            else:
+                logger.error("메시지 전송 실패: %s (채팅방: %s)", guests[0].get('name', '알 수 없음'), chat_id)
+        
+        # 채팅방의 텍스트 알림을 모두 보낸 뒤 사진 전송 (사진은 미루지 않고 예산이 남은 만큼만)
+        if self.photo_sender:
+            self._send_chat_photos(chat_id, [item.guests[0] for item in items if len(item.guests) == 1])
+        return unsent
+    
+    def _send_chat_photos(self, chat_id: str, guests: List[Dict]):
+        """참석자 프로필 사진 전송"""
+        for index, guest in enumerate(guests):
+            url = guest_avatar_url(guest)
+            if not url:
+                continue
+            if self._out_of_send_budget(chat_id):
+                logger.info("시간 예산이 부족해 채팅방 %s의 사진 전송을 건너뜁니다 (%s명).", chat_id, len(guests) - index)
+                return
+            caption = f"👤 <b>{html.escape(guest.get('name', '알 수 없음'))}</b>"
+            if not self.photo_sender.send(self.telegram_bot, chat_id, url, caption, request_timeout(self.deadline)):
+                logger.warning("%s의 프로필 사진을 보내지 못했습니다 (채팅방: %s)", guest.get('name', '알 수 없음'), chat_id)
+    
+    def _out_of_send_budget(self, chat_id: str) -> bool:
+        """전송 속도 제한으로 기다려야 하는 시간까지 고려해 이번 틱 예산 안에 보낼 수 없는지 확인"""
+        if not self.deadline:
+            return False
+        return self.deadline.remaining() <= self.telegram_bot.next_send_delay(chat_id)
+    
+    def flush_digests(self, force: bool = False):
+        """윈도우가 끝난 채팅방의 다이제스트 메시지 전송"""
+        now = self.utcnow()
+        for chat_id in self.digest_buffer.due_chats(now, force=force):
+            entries = self.digest_buffer.pop(chat_id)
+            # 대기 중에 리스를 잃은 이벤트의 체크인은 새 담당 워커가 보내므로 제외
+            if self.lease_manager:
+                held = {event_id: self.lease_manager.still_holds(event_id) for event_id in {entry[0] for entry in entries}}
+                entries = [entry for entry in entries if held[entry[0]]]
+            if not entries:
+                continue
+            
+            if self.telegram_bot.send_message(format_digest(entries, self.digest_window_seconds), chat_id=chat_id):
+                logger.info("체크인 %s건을 다이제스트로 전송했습니다 (채팅방: %s)", len(entries), chat_id)
+            else:
+                # 참석자는 이미 알림 처리됐으므로 버리지 않고 이벤트 상태에 저장해 다음 틱에 다시 보냄
+                # (단발성 실행은 프로세스가 끝나므로 메모리 대기열에 되돌리면 사라짐)
+                logger.error("다이제스트 전송 실패 (채팅방: %s, %s건), 다음 틱에 다시 시도합니다.", chat_id, len(entries))
+                self.save_pending_digest(chat_id, entries)
+    
+    def save_pending_digest(self, chat_id: str, entries: List[DigestEntry]):
+        """전송하지 못한 다이제스트 항목을 이벤트별 상태에 저장 (이벤트를 다시 처리할 때 대기열에 되돌림)"""
+        by_event: Dict[str, List[DigestEntry]] = {}
+        for entry in entries:
+            by_event.setdefault(entry[0], []).append(entry)
+        for event_id, event_entries in by_event.items():
+            state = self.state_store.get(event_id)
+            state.pending_digest.setdefault(chat_id, []).extend(list(entry) for entry in event_entries)
+            self.state_store.save(state)
+    
+    def restore_pending_digest(self, state: EventState):
+        """이전 틱에서 전송하지 못한 다이제스트 항목을 대기열 앞에 되돌림 (이번 틱에 바로 다시 전송)"""
+        if not state.pending_digest:
+            return
+        now = self.utcnow()
+        for chat_id, entries in state.pending_digest.items():
+            self.digest_buffer.requeue(chat_id, [tuple(entry) for entry in entries], now)
+        state.pending_digest = {}
+    
+    def update_dashboard(self, state: EventState, event_name: str):
+        """이벤트 현황판 메시지 갱신 (수정 간격 안이거나 내용이 같으면 건너뜀, 메시지가 없으면 보내고 고정)"""
+        if not self.dashboard_chat_id:
+            return
+        dashboard = state.dashboard
+        now = self.utcnow()
+        if dashboard.chat_id != self.dashboard_chat_id:
+            # 현황판 채팅방이 바뀌었으면 새로 보냄
+            dashboard.chat_id, dashboard.message_id, dashboard.content_hash = self.dashboard_chat_id, None, None
+        if not dashboard.due(now, self.dashboard_interval_seconds):
+            return
+        
+        body = dashboard.render(event_name, state.stats)
+        content_hash = dashboard.content_digest(body)
+        if content_hash == dashboard.content_hash:
+            return
+        if self.lease_manager and not self.lease_manager.still_holds(state.event_id):
+            return
+        if self._out_of_send_budget(dashboard.chat_id):
+            return
+        
+        message = dashboard.with_timestamp(body, now)
+        if dashboard.message_id is not None:
+            edited = self.telegram_bot.edit_message(message, dashboard.chat_id, dashboard.message_id)
+            if edited:
+                dashboard.content_hash, dashboard.edited_at = content_hash, now.isoformat()
+                logger.info("이벤트 %s 현황판을 갱신했습니다.", event_name)
+                return
+            if edited is False:
+                return
+            logger.warning("이벤트 %s 현황판 메시지가 삭제되어 새로 보냅니다.", event_name)
+        
+        message_id = self.telegram_bot.post_message(message, dashboard.chat_id)
+        if message_id is None:
+            return
+        dashboard.message_id, dashboard.content_hash, dashboard.edited_at = message_id, content_hash, now.isoformat()
+        self.telegram_bot.pin_message(dashboard.chat_id, message_id)
+        logger.info("이벤트 %s 현황판 메시지를 보내고 고정했습니다.", event_name)
+    
+    def send_summary_if_due(self, state: EventState, event_name: str):
+        """요약 주기가 지났으면 참석 현황 요약 메시지 전송"""
+        if self.summary_interval_minutes <= 0:
+            return
+        
+        now = self.utcnow()
+        if state.last_summary_at:
+            last_summary_at = datetime.fromisoformat(state.last_summary_at)
+            if now - last_summary_at < timedelta(minutes=self.summary_interval_minutes):
+                return
+        
+        if self.lease_manager and not self.lease_manager.still_holds(state.event_id):
+            return
+        
+        message = state.stats.format_summary(event_name, now)
+        context = format_event_context(self.event_meta.get(state.event_id))
+        if context:
+            message += f"\n\n{context}"
+        if self.telegram_bot.send_message(message):
+            state.last_summary_at = now.isoformat()
+            logger.info("이벤트 %s 참석 현황 요약을 전송했습니다.", event_name)
+    
+    def whois(self, query: str, message: Optional[Dict] = None) -> str:
+        """/whois 명령: 라이브 이벤트 참석자를 이름/이메일로 검색해 체크인 여부 답장"""
+        if not query:
+            return "사용법: /whois &lt;이름 또는 이메일&gt;"
+        if not self.guest_search:
+            return "현재 검색할 수 있는 라이브 이벤트가 없거나 참석자 목록을 불러오는 중입니다."
+        
+        sections = []
+        found = 0
+        for event_id, search in list(self.guest_search.items()):
+            results = search.search(query, limit=self.whois_limit)
+            if not results:
+                continue
+            found += len(results)
+            lines = []
+            for record in results:
+                checked_in_at = parse_utc(record.checked_in_at)
+                if checked_in_at:
+                    status = f"✅ {(checked_in_at + timedelta(hours=9)).strftime('%H:%M')} 체크인"
+                else:
+                    status = "⬜ 미체크인"
+                lines.append(f"• {html.escape(record.name or record.email)} ({html.escape(record.ticket_type)}) {status}")
+            if len(self.guest_search) > 1:
+                lines.insert(0, f"📅 <b>{html.escape(self._event_names.get(event_id, event_id))}</b>")
+            sections.append("\n".join(lines))
+        
+        if not sections:
+            return f"🔎 '{html.escape(query)}'와 일치하는 참석자가 없습니다."
+        return f"🔎 <b>'{html.escape(query)}' 검색 결과</b> ({found}명)\n\n" + "\n\n".join(sections)
+    
+    def run_forever(self, interval_seconds: int):
+        """데몬 모드: 프로세스 안에서 주기적으로 체크 실행"""
+        logger.info("데몬 모드 시작 (%s초 주기)", interval_seconds)
+        self.daemon = True
+        stop_event = threading.Event()
+        
+        # 워커 모드에서는 체크 사이에도 하트비트로 리스를 유지
+        if self.lease_manager:
+            heartbeat_interval = max(self.lease_manager.ttl / 3, 1)
+            
+            def heartbeat_loop():
+                while not stop_event.wait(heartbeat_interval):
+                    try:
+                        self.lease_manager.heartbeat()
+                    except Exception as e:
+                        logger.warning("하트비트 기록 실패: %s", e)
+            
+            threading.Thread(target=heartbeat_loop, name='lease-heartbeat', daemon=True).start()
+        
+        # 스태프 명령 수신 (알림 대상 채팅방과 STAFF_CHAT_IDS에서 온 명령만 처리)
+        if self.staff_commands and self.lease_manager:
+            # 워커마다 같은 봇 토큰으로 getUpdates를 호출하면 409 Conflict가 나고, 명령을 받은 워커의 인덱스에는
+            # 자기가 맡은 이벤트만 있으므로 워커 모드에서는 스태프 명령을 켜지 않음
+            logger.warning("워커 모드(LEASE_STORE)에서는 스태프 명령을 사용할 수 없어 STAFF_COMMANDS를 무시합니다.")
+            self.staff_commands = False
+        if self.staff_commands:
+            from staff_commands import CommandListener
+            self.command_listener = CommandListener(self.telegram_bot, {'whois': self.whois}, self.command_chats())
+            self.command_listener.start()
+        
+        # 참석자 인덱스 스냅샷은 틱마다가 아니라 일정 간격으로만 저장 (종료할 때는 모두 저장)
+        self.state_store.snapshot_interval = float(os.getenv('GUEST_SNAPSHOT_INTERVAL_SECONDS', '300'))
+        
+        # 설정 파일 변경 감지 (틱과 틱 사이에 새 설정으로 교체)
+        if os.getenv('CONFIG_RELOAD', '1').lower() in ('1', 'true', 'yes'):
+            self.config_watcher = ConfigWatcher('.env')
+        
+        # 메모리 진단 (선택사항, 틱 사이 할당 위치와 RSS 증가 추이 기록)
+        memory_diagnostics = None
+        if os.getenv('MEMORY_DIAGNOSTICS', '0').lower() in ('1', 'true', 'yes'):
+            from memory_diag import MemoryDiagnostics
+            memory_diagnostics = MemoryDiagnostics(
+                interval_ticks=int(os.getenv('MEMORY_DIAG_INTERVAL_TICKS', '10')),
+                top=int(os.getenv('MEMORY_DIAG_TOP', '10')),
+                warn_mb_per_hour=float(os.getenv('MEMORY_GROWTH_WARN_MB_PER_HOUR', '20')),
+                window_minutes=float(os.getenv('MEMORY_DIAG_WINDOW_MINUTES', '60')),
+            )
+            memory_diagnostics.start()
+        
+        try:
+            minutes_ago = None
+            coalesced = 0
+            while True:
+                started = time.monotonic()
+                self.reload_settings()
+                self.run_check(minutes_ago=minutes_ago, coalesced=coalesced)
+                if memory_diagnostics:
+                    memory_diagnostics.tick(self.memory_structures())
+                elapsed = time.monotonic() - started
+                # 두 번째 체크부터는 실행 주기만큼의 구간만 검색
+                minutes_ago = interval_seconds / 60
+                coalesced = int(elapsed // interval_seconds)
+                if coalesced:
+                    # 틱이 주기보다 오래 걸렸으면 놓친 틱을 쌓지 않고 다음 틱 하나로 합쳐 그 구간까지 검색
+                    minutes_ago = elapsed / 60
+                    logger.warning("틱이 실행 주기보다 오래 걸려 놓친 틱 %s개를 다음 틱에 합칩니다.", coalesced)
+                time.sleep(max(interval_seconds - elapsed, 0))
+        except KeyboardInterrupt:
+            logger.info("데몬 모드 중지됨")
+        finally:
+            stop_event.set()
+            if self.command_listener:
+                self.command_listener.stop()
+            self.flush_digests(force=True)
+            if len(self.digest_buffer):
+                logger.error("보내지 못한 다이제스트 체크인 %s건이 남은 채로 종료합니다.", len(self.digest_buffer))
+            self.state_store.flush()
+            if memory_diagnostics:
+                memory_diagnostics.stop()
+            if tracer.enabled:
+                logger.info("단계별 소요 시간 요약\n%s", tracer.format_totals())
+            if self.lease_manager:
+                self.lease_manager.release_all()
 
 
 def main():
     """메인 함수"""
+    import argparse
+    from config_snapshot import load_config
+    
+    # 환경 변수 로드 (미리 컴파일된 스냅샷 사용, 상태/로그 파일과 같이 작업 디렉터리 기준)
+    load_config('.env')
+    
+    # 로깅 설정 (큐 기반 비동기 기록, 회전, 틱 상관관계 ID)
+    setup_logging('luma_checkin_bot.log')
+    
+    parser = argparse.ArgumentParser(description="Luma 체크인 Telegram 알림 봇")
+    parser.add_argument('--daemon', action='store_true', help="프로세스 안에서 주기적으로 실행")
+    parser.add_argument('--interval', type=int, default=int(os.getenv('POLL_INTERVAL_SECONDS', '300')),
+                        help="데몬 모드 실행 주기 (초)")
+    args = parser.parse_args()
+    
     try:
         bot = LumaCheckinBot()
-        bot.run_check()
+        if args.daemon:
+            bot.run_forever(args.interval)
+        else:
+            bot.run_check()
     except Exception as e:
-        logger.error(f"봇 초기화 실패: {e}", exc_info=True)
+        logger.error("봇 초기화 실패: %s", e, exc_info=True)
         sys.exit(1)
 
 
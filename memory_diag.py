@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+메모리 진단 (선택사항, 데몬 모드)
+
+여러 날에 걸친 이벤트에서 데몬을 오래 실행해도 캐시, 인덱스, 대기열이 새지 않는지 확인하기 위해
+MEMORY_DIAGNOSTICS=1이면 일정 틱마다 다음을 로그에 남깁니다.
+
+- tracemalloc 스냅샷을 이전 스냅샷과 비교해 메모리가 가장 많이 늘어난 할당 위치 상위 N개
+- 봇이 가진 자료 구조(참석자 인덱스, 미룬 알림, 캐시 등)별 항목 수와 이전 대비 증감
+- 프로세스 RSS 추이와 최근 MEMORY_DIAG_WINDOW_MINUTES 동안의 증가 기울기 (MB/시간)
+
+RSS 증가 기울기가 MEMORY_GROWTH_WARN_MB_PER_HOUR를 넘으면 경고합니다.
+tracemalloc은 할당마다 추적 비용이 있으므로 문제를 조사할 때만 켭니다.
+"""
+
+import os
+import time
+import logging
+import tracemalloc
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 기울기를 계산하기 전에 필요한 최소 관찰 기간 (창 길이 대비 비율, 시작 직후 캐시가 차는 구간 제외)
+MIN_WINDOW_COVERAGE = 0.5
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def current_rss() -> Optional[int]:
+    """현재 프로세스 RSS (바이트, Linux /proc 기준, 알 수 없으면 None)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def growth_slope(samples: Deque[Tuple[float, int]]) -> float:
+    """(시각 초, 바이트) 표본의 최소제곱 기울기 (MB/시간)"""
+    if len(samples) < 2:
+        return 0.0
+    count = len(samples)
+    mean_t = sum(t for t, _ in samples) / count
+    mean_v = sum(v for _, v in samples) / count
+    variance = sum((t - mean_t) ** 2 for t, _ in samples)
+    if variance == 0:
+        return 0.0
+    slope = sum((t - mean_t) * (v - mean_v) for t, v in samples) / variance
+    return slope * 3600 / (1024 * 1024)
+
+
+class MemoryDiagnostics:
+    """틱 사이 메모리 진단"""
+
+    def __init__(self, interval_ticks: int = 10, top: int = 10, warn_mb_per_hour: float = 20.0,
+                 window_minutes: float = 60.0, frames: int = 1):
+        self.interval_ticks = max(interval_ticks, 1)
+        self.top = top
+        self.warn_mb_per_hour = warn_mb_per_hour
+        self.window = window_minutes * 60
+        self.frames = frames
+        self.ticks = 0
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._sizes: Dict[str, int] = {}
+        self._rss: Deque[Tuple[float, int]] = deque()
+        self._warned_at: Optional[float] = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        logger.info("메모리 진단 시작 (%s틱마다, 경고 기준 %.0fMB/시간)", self.interval_ticks, self.warn_mb_per_hour)
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def tick(self, sizes: Dict[str, int]):
+        """틱이 끝날 때 호출 (interval_ticks마다 진단 기록)"""
+        self.ticks += 1
+        if self.ticks % self.interval_ticks:
+            return
+        lines = [f"메모리 진단 (틱 {self.ticks})"]
+        lines += self._rss_lines()
+        lines += self._size_lines(sizes)
+        lines += self._allocation_lines()
+        logger.info("%s", "\n".join(lines))
+
+    def _rss_lines(self):
+        rss = current_rss()
+        if rss is None:
+            return []
+        now = time.monotonic()
+        self._rss.append((now, rss))
+        while self._rss and now - self._rss[0][0] > self.window:
+            self._rss.popleft()
+        slope = growth_slope(self._rss)
+        covered = now - self._rss[0][0]
+        traced, peak = tracemalloc.get_traced_memory()
+        lines = [
+            f"  RSS {rss / 1024 / 1024:.1f}MB, 추적 중인 할당 {traced / 1024 / 1024:.1f}MB (최대 {peak / 1024 / 1024:.1f}MB), "
+            f"최근 {covered / 60:.0f}분 증가 기울기 {slope:+.1f}MB/시간"
+        ]
+        if covered >= self.window * MIN_WINDOW_COVERAGE and slope > self.warn_mb_per_hour:
+            if self._warned_at is None or now - self._warned_at >= self.window:
+                self._warned_at = now
+                logger.warning("메모리 사용량이 계속 늘고 있습니다: 최근 %.0f분 동안 %+.1fMB/시간 (기준 %.0fMB/시간)",
+                               covered / 60, slope, self.warn_mb_per_hour)
+        return lines
+
+    def _size_lines(self, sizes: Dict[str, int]):
+        lines = ["  자료 구조별 항목 수:"]
+        for name, size in sizes.items():
+            change = size - self._sizes[name] if name in self._sizes else 0
+            lines.append(f"    {name}: {size:,} ({change:+,})")
+        self._sizes = dict(sizes)
+        return lines
+
+    def _allocation_lines(self):
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        lines = []
+        if self._snapshot is not None:
+            stats = [stat for stat in snapshot.compare_to(self._snapshot, 'lineno') if stat.size_diff > 0]
+            if stats:
+                lines.append(f"  이전 진단 이후 많이 늘어난 할당 위치 상위 {min(self.top, len(stats))}개:")
+                for stat in stats[:self.top]:
+                    frame = stat.traceback[0]
+                    lines.append(
+                        f"    {frame.filename}:{frame.lineno} {stat.size_diff / 1024:+.1f}KB "
+                        f"(현재 {stat.size / 1024:.1f}KB, {stat.count_diff:+}개)"
+                    )
+        self._snapshot = snapshot
+        return lines
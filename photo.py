@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+참석자 사진 알림
+
+체크인 알림 텍스트와 함께 참석자의 Luma 프로필 사진을 Telegram sendPhoto로 보냅니다.
+
+- 한 번 올린 사진은 Telegram이 돌려준 file_id를 이미지 URL별로 디스크에 캐시(LRU)해 두고 재사용하므로,
+  다시 온 참석자나 여러 참석자가 함께 쓰는 기본 아바타는 다시 내려받거나 올리지 않습니다.
+- 이미지는 알림 대상을 정하는 시점에 제한된 크기의 스레드 풀에서 미리 동시에 내려받고,
+  사진 전송은 채팅방의 텍스트 알림을 모두 보낸 뒤에 하므로 텍스트 전송이 늦어지지 않습니다.
+- 예산 부족이나 리스 이전으로 보내지 못한 사진은 최대 MAX_PENDING_DOWNLOADS개까지만
+  PENDING_DOWNLOAD_TTL초 동안 보관하므로, 데몬이 오래 실행돼도 내려받은 이미지가 쌓이지 않습니다.
+- 다운로드는 Telegram/Luma 클라이언트와 같은 전송 계층(transport.py)을 사용합니다.
+"""
+
+import os
+import json
+import logging
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from transport import HTTPTransport, Transport, TransportError
+
+logger = logging.getLogger(__name__)
+
+# 내려받을 이미지 최대 크기 (Telegram sendPhoto 업로드 제한 10MB보다 작게)
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+
+# 보내지 않은 채 보관할 내려받은 이미지 최대 개수와 보관 시간 (초)
+MAX_PENDING_DOWNLOADS = 64
+PENDING_DOWNLOAD_TTL = 300.0
+
+
+def guest_avatar_url(guest: Dict) -> Optional[str]:
+    """참석자의 프로필 사진 URL"""
+    return guest.get('avatar_url') or guest.get('user_avatar_url') or None
+
+
+class FileIdCache:
+    """이미지 URL -> Telegram file_id LRU 캐시 (JSON 파일)"""
+
+    def __init__(self, path: str, capacity: int = 1000):
+        self.path = path
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                # 파일에는 오래 사용하지 않은 순서로 저장
+                self._entries.update(json.load(f))
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, url: str) -> Optional[str]:
+        with self._lock:
+            file_id = self._entries.get(url)
+            if file_id is not None:
+                self._entries.move_to_end(url)
+                self._dirty = True
+            return file_id
+
+    def put(self, url: str, file_id: str):
+        with self._lock:
+            self._entries[url] = file_id
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def save(self):
+        """변경된 경우에만 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = dict(self._entries)
+            self._dirty = False
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("사진 file_id 캐시 저장 실패: %s", e)
+
+
+class PhotoSender:
+    """참석자 사진 미리 받기와 file_id 캐시를 이용한 sendPhoto 전송"""
+
+    def __init__(self, cache: FileIdCache, fetch_workers: int = 4, transport: Optional[Transport] = None,
+                 max_pending: int = MAX_PENDING_DOWNLOADS, pending_ttl: float = PENDING_DOWNLOAD_TTL):
+        self.cache = cache
+        # 이미지 다운로드용 HTTP 전송 (테스트에서는 가짜 구현으로 교체)
+        self.transport = transport or HTTPTransport()
+        self.max_pending = max_pending
+        self.pending_ttl = pending_ttl
+        self._pool = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix='photo-fetch')
+        self._lock = threading.Lock()
+        # 이미지 URL -> (다운로드 시작 시각(time.monotonic), 다운로드 작업) (오래된 순)
+        self._downloads: 'OrderedDict[str, Tuple[float, Future]]' = OrderedDict()
+        # 이미지 URL -> [전송 잠금, 사용 중인 전송 수] (사용 중인 전송이 없으면 삭제)
+        self._url_locks: Dict[str, List] = {}
+
+    def pending_downloads(self) -> int:
+        """보내지 않은 채 보관 중인 다운로드 수"""
+        with self._lock:
+            return len(self._downloads)
+
+    def sending_urls(self) -> int:
+        """전송 중인 이미지 URL 수"""
+        with self._lock:
+            return len(self._url_locks)
+
+    def prefetch(self, url: str):
+        """캐시에 없는 이미지를 백그라운드에서 미리 내려받기 시작"""
+        if self.cache.get(url) is not None:
+            return
+        with self._lock:
+            self._expire_downloads(time.monotonic())
+            if url not in self._downloads:
+                self._downloads[url] = (time.monotonic(), self._pool.submit(self._download, url))
+
+    def _expire_downloads(self, now: float):
+        """보관 시간이 지났거나 최대 개수를 넘은 다운로드를 오래된 것부터 버림 (self._lock 안에서 호출)"""
+        while self._downloads:
+            url, (started, download) = next(iter(self._downloads.items()))
+            if now - started < self.pending_ttl and len(self._downloads) < self.max_pending:
+                break
+            del self._downloads[url]
+            download.cancel()
+            logger.debug("보내지 못한 프로필 사진 다운로드를 버립니다: %s", url)
+
+    def _download(self, url: str) -> Optional[bytes]:
+        try:
+            response = self.transport.get(url, timeout=10)
+            response.raise_for_status()
+        except TransportError as e:
+            logger.warning("프로필 사진 다운로드 실패: %s (%s)", url, e)
+            return None
+        if len(response.content) > MAX_IMAGE_BYTES:
+            logger.warning("프로필 사진이 너무 커서 건너뜁니다: %s", url)
+            return None
+        return response.content
+
+    def send(self, telegram_bot, chat_id: str, url: str, caption: str, timeout: float) -> bool:
+        """사진 전송 (캐시된 file_id가 있으면 재사용, 없으면 내려받은 이미지를 올리고 file_id 캐시)"""
+        # 같은 이미지를 여러 채팅방에 동시에 처음 보낼 때 한 번만 올리도록 URL별로 직렬화
+        with self._lock:
+            url_lock = self._url_locks.setdefault(url, [threading.Lock(), 0])
+            url_lock[1] += 1
+        try:
+            with url_lock[0]:
+                return self._send(telegram_bot, chat_id, url, caption, timeout)
+        finally:
+            with self._lock:
+                url_lock[1] -= 1
+                if not url_lock[1]:
+                    del self._url_locks[url]
+
+    def _send(self, telegram_bot, chat_id: str, url: str, caption: str, timeout: float) -> bool:
+        file_id = self.cache.get(url)
+        if file_id is not None:
+            return telegram_bot.send_photo(file_id, caption, chat_id=chat_id) is not None
+
+        self.prefetch(url)
+        with self._lock:
+            download = self._downloads.get(url, (None, None))[1]
+        try:
+            data = download.result(timeout=timeout) if download else None
+        except Exception:
+            # 시간 안에 받지 못했으면 다운로드는 계속 진행되도록 두고 이번에는 건너뜀 (보관 시간이 지나면 버림)
+            return False
+        if not data:
+            with self._lock:
+                self._downloads.pop(url, None)
+            return False
+        file_id = telegram_bot.send_photo(data, caption, chat_id=chat_id)
+        with self._lock:
+            self._downloads.pop(url, None)
+        if file_id is None:
+            return False
+        self.cache.put(url, file_id)
+        return True
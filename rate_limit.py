@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Luma API 요청 예산 (토큰 버킷)
+
+폴링 주기를 줄이거나 여러 이벤트를 동시에 처리해도 Luma API 요청 제한에 걸리지 않도록,
+API 키별 토큰 버킷으로 요청 수를 제한합니다.
+
+- 버킷은 저장소에 두어 같은 호스트의 여러 스레드와 프로세스(cron 실행, 워커 모드)가 같은 예산을 나눠 씁니다.
+  저장소는 SQLite와 파일 잠금(fcntl) 백엔드, 프로세스 하나만 쓸 때의 메모리 백엔드를 제공합니다.
+- 요청 전에 토큰을 하나 가져오고, 토큰이 없으면 채워질 때까지 기다립니다. 틱 시간 예산 안에 토큰을 얻을 수
+  없으면 RequestBudgetExceeded(DeadlineExceeded)를 발생시켜 남은 작업을 다음 틱으로 미룹니다.
+- remaining()으로 남은 요청 수를 알 수 있어, 틱은 이를 라이브 이벤트 수로 나눠 이벤트별 참석자 페이지 몫을 정합니다.
+  큰 이벤트 하나가 예산을 다 쓰지 않고, 몫을 넘긴 이벤트는 동기화 체크포인트에서 다음 틱에 이어서 조회합니다.
+- 저장소에는 API 키 대신 키의 해시만 기록합니다.
+"""
+
+import os
+import json
+import time
+import fcntl
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+from deadline import Deadline, RequestBudgetExceeded, DEFAULT_REQUEST_TIMEOUT
+
+
+class TokenBucketStore:
+    """토큰 버킷 저장소 인터페이스"""
+
+    def take(self, key: str, rate: float, burst: float, cost: float,
+             now: Optional[float] = None) -> Tuple[bool, float]:
+        """버킷을 현재 시각까지 채운 뒤 토큰이 cost개 이상이면 가져옴: (성공 여부, 남은 토큰 수)
+
+        cost가 0이면 토큰을 가져오지 않고 남은 수만 확인합니다.
+        """
+        raise NotImplementedError
+
+
+def _refill(tokens: float, updated_at: float, rate: float, burst: float, now: float) -> float:
+    return min(burst, tokens + max(now - updated_at, 0) * rate)
+
+
+class SQLiteTokenBucketStore(TokenBucketStore):
+    """SQLite 기반 버킷 저장소 (같은 호스트의 여러 프로세스용)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def take(self, key, rate, burst, cost, now=None):
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens = _refill(row[0], row[1], rate, burst, now) if row else burst
+            granted = tokens >= cost
+            if granted and cost:
+                tokens -= cost
+                conn.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                    (key, tokens, now)
+                )
+        return granted, tokens
+
+
+class FileTokenBucketStore(TokenBucketStore):
+    """JSON 파일 + fcntl 잠금 기반 버킷 저장소"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+
+    def take(self, key, rate, burst, cost, now=None):
+        now = time.time() if now is None else now
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.path, 'r') as f:
+                        buckets = json.load(f)
+                except (FileNotFoundError, ValueError):
+                    buckets = {}
+                bucket = buckets.get(key)
+                tokens = _refill(bucket['tokens'], bucket['updated_at'], rate, burst, now) if bucket else burst
+                granted = tokens >= cost
+                if granted and cost:
+                    tokens -= cost
+                    buckets[key] = {'tokens': tokens, 'updated_at': now}
+                    tmp_path = f"{self.path}.tmp"
+                    with open(tmp_path, 'w') as f:
+                        json.dump(buckets, f)
+                    os.replace(tmp_path, self.path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return granted, tokens
+
+
+class MemoryTokenBucketStore(TokenBucketStore):
+    """프로세스 메모리 버킷 저장소 (스레드 간에만 공유)"""
+
+    def __init__(self):
+        self.buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, cost, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            bucket = self.buckets.get(key)
+            tokens = _refill(bucket[0], bucket[1], rate, burst, now) if bucket else burst
+            granted = tokens >= cost
+            if granted and cost:
+                tokens -= cost
+                self.buckets[key] = (tokens, now)
+        return granted, tokens
+
+
+def create_bucket_store(spec: str) -> TokenBucketStore:
+    """`sqlite:<경로>`, `file:<경로>` 또는 `memory` 형식의 설정으로 버킷 저장소 생성"""
+    if spec == 'memory':
+        return MemoryTokenBucketStore()
+    backend, _, path = spec.partition(':')
+    if not path:
+        raise ValueError(f"잘못된 LUMA_RATE_STORE 형식입니다: {spec} (예: sqlite:.luma_rate.db)")
+    if backend == 'sqlite':
+        return SQLiteTokenBucketStore(path)
+    if backend == 'file':
+        return FileTokenBucketStore(path)
+    raise ValueError(f"지원하지 않는 요청 예산 저장소입니다: {backend}")
+
+
+class RequestGovernor:
+    """API 키 하나의 요청 예산 (분당 rate_per_minute개, 최대 burst개까지 몰아서 사용)"""
+
+    def __init__(self, store: TokenBucketStore, api_key: str, rate_per_minute: float, burst: float):
+        self.store = store
+        self.key = "luma:" + hashlib.sha1(api_key.encode('utf-8')).hexdigest()[:16]
+        self.rate = rate_per_minute / 60
+        self.burst = max(burst, 1.0)
+        # 이 프로세스의 요청 수와 토큰을 기다린 시간 (틱마다 초기화)
+        self.requests = 0
+        self.waited = 0.0
+
+    def reset_stats(self):
+        self.requests = 0
+        self.waited = 0.0
+
+    def remaining(self) -> float:
+        """지금 바로 쓸 수 있는 요청 수 (다른 프로세스 사용분 포함)"""
+        return self.store.take(self.key, self.rate, self.burst, 0)[1]
+
+    def fair_share(self, consumers: int) -> int:
+        """남은 예산을 consumers개가 나눠 쓸 때 하나의 몫 (최소 1)"""
+        return max(int(self.remaining() // max(consumers, 1)), 1)
+
+    def acquire(self, stage: str, deadline: Optional[Deadline] = None, reserve_ratio: float = 0.0):
+        """요청 하나의 토큰을 가져옴 (없으면 채워질 때까지 대기)
+
+        틱 시간 예산(reserve_ratio 비율은 남겨 둠) 안에, 데드라인이 없으면 DEFAULT_REQUEST_TIMEOUT 안에
+        토큰을 얻을 수 없으면 RequestBudgetExceeded를 발생시킵니다.
+        """
+        waited = 0.0
+        while True:
+            granted, tokens = self.store.take(self.key, self.rate, self.burst, 1)
+            if granted:
+                self.requests += 1
+                return
+            wait = (1 - tokens) / self.rate if self.rate > 0 else float('inf')
+            if deadline:
+                available = deadline.remaining() - deadline.budget * reserve_ratio
+            else:
+                available = DEFAULT_REQUEST_TIMEOUT - waited
+            if wait > available:
+                raise RequestBudgetExceeded(f"{stage}: Luma API 요청 예산 부족 (다음 요청까지 {wait:.1f}초)")
+            time.sleep(wait)
+            waited += wait
+            self.waited += wait
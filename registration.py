@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+등록 질문 답변 표시
+
+참석자의 등록 질문 답변(registration_answers)을 체크인 알림에 붙입니다.
+
+- 이벤트마다 등록 질문 목록(스키마)을 한 번 만들어 이벤트 상태에 캐시하고, 어떤 질문을 어떤 순서와
+  이름(별칭)으로 보여 줄지를 질문 키 -> 표시 위치 사전으로 미리 계산해 둡니다.
+  참석자마다 설정 목록을 다시 훑지 않고 답변 하나당 사전 조회 한 번으로 표시 위치를 찾습니다.
+- 처음 보는 질문이 나타나면(등록 양식 변경) 스키마를 다시 만듭니다.
+- 답변이 길어도 Telegram 메시지 길이 제한을 넘지 않도록 답변별, 전체 길이를 잘라냅니다.
+
+REGISTRATION_FIELDS 형식 (`;`로 구분, 적힌 순서대로 표시, `질문=별칭`으로 이름 변경):
+    회사명=소속;직함;LinkedIn 프로필=LinkedIn
+설정하지 않으면 모든 질문을 등록 양식 순서대로 원래 이름으로 표시합니다.
+"""
+
+import html
+import hashlib
+import logging
+from typing import List, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 답변 하나와 등록 정보 전체의 최대 길이 (Telegram 메시지 최대 4096자 안에 기본 알림과 함께 들어가도록)
+MAX_ANSWER_LENGTH = 200
+MAX_ANSWERS_LENGTH = 1500
+
+
+def answer_key(answer: Dict) -> str:
+    """답변이 속한 질문의 키 (질문 ID가 없으면 질문 이름)"""
+    return answer.get('question_id') or answer.get('label') or ''
+
+
+def answer_text(answer: Dict) -> str:
+    """답변 값을 문자열로 변환 (여러 개 선택한 답변은 쉼표로 연결)"""
+    value = answer.get('answer')
+    if value is None:
+        value = answer.get('value')
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value if item not in (None, ''))
+    if isinstance(value, bool):
+        return "예" if value else "아니오"
+    return "" if value is None else str(value).strip()
+
+
+def parse_fields(spec: Optional[str]) -> List[Tuple[str, str]]:
+    """REGISTRATION_FIELDS 문자열을 (질문 이름, 표시 이름) 목록으로 변환"""
+    fields = []
+    for item in (spec or '').split(';'):
+        label, _, alias = item.partition('=')
+        label = label.strip()
+        if label:
+            fields.append((label, alias.strip() or label))
+    return fields
+
+
+class QuestionSchema:
+    """이벤트 하나의 등록 질문 목록과 표시 설정
+
+    questions는 등록 양식에 나타난 순서의 (질문 키, 질문 이름) 목록이며 이벤트 상태에 저장됩니다.
+    display는 질문 키 -> (표시 순서, 표시 이름)으로, 설정과 질문 목록에서 계산하며 저장하지 않습니다.
+    """
+
+    def __init__(self, questions: Optional[List[Tuple[str, str]]] = None):
+        self.questions: List[Tuple[str, str]] = [tuple(q) for q in questions or []]
+        self.signature = self._signature(self.questions)
+        self.display: Dict[str, Tuple[int, str]] = {}
+        self._fields: Optional[List[Tuple[str, str]]] = None
+
+    @staticmethod
+    def _signature(questions: List[Tuple[str, str]]) -> str:
+        text = "\n".join(f"{key}\t{label}" for key, label in questions)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+    @classmethod
+    def from_event(cls, event: Dict) -> Optional['QuestionSchema']:
+        """이벤트 정보에 등록 질문 목록이 있으면 그것으로 스키마 생성"""
+        questions = event.get('registration_questions')
+        if not questions:
+            return None
+        return cls([
+            (q.get('id') or q.get('api_id') or q.get('label', ''), q.get('label', ''))
+            for q in questions if q.get('label')
+        ])
+
+    def learn(self, guests: List[Dict]) -> bool:
+        """참석자 답변에서 처음 보는 질문을 찾아 추가 (추가했으면 True, 표시 설정은 다시 계산)"""
+        known = {key for key, _ in self.questions}
+        added = False
+        for guest in guests:
+            for answer in guest.get('registration_answers') or ():
+                key = answer_key(answer)
+                if key and key not in known:
+                    known.add(key)
+                    self.questions.append((key, answer.get('label') or key))
+                    added = True
+        if added:
+            self.signature = self._signature(self.questions)
+            self._fields = None
+        return added
+
+    def configure(self, fields: List[Tuple[str, str]]):
+        """표시할 질문 설정을 적용해 질문 키 -> (표시 순서, 표시 이름) 사전 계산 (설정과 질문이 같으면 그대로)"""
+        if self._fields == fields:
+            return
+        self._fields = list(fields)
+        if fields:
+            order = {label: (position, alias) for position, (label, alias) in enumerate(fields)}
+            self.display = {
+                key: order[label] for key, label in self.questions if label in order
+            }
+        else:
+            self.display = {key: (position, label) for position, (key, label) in enumerate(self.questions)}
+
+    def format_answers(self, guest: Dict) -> str:
+        """참석자의 표시할 답변을 설정 순서대로 포맷팅 (없으면 빈 문자열)"""
+        answers = guest.get('registration_answers')
+        if not answers or not self.display:
+            return ""
+        slots = []
+        for answer in answers:
+            slot = self.display.get(answer_key(answer))
+            if slot is None:
+                continue
+            text = answer_text(answer)
+            if not text:
+                continue
+            if len(text) > MAX_ANSWER_LENGTH:
+                text = text[:MAX_ANSWER_LENGTH - 1] + "…"
+            slots.append((slot[0], slot[1], text))
+        if not slots:
+            return ""
+
+        lines = ["📝 <b>등록 정보:</b>"]
+        length = len(lines[0])
+        slots.sort()
+        for index, (_, label, text) in enumerate(slots):
+            line = f"• <b>{html.escape(label)}:</b> {html.escape(text)}"
+            if length + len(line) + 1 > MAX_ANSWERS_LENGTH:
+                lines.append(f"… 외 {len(slots) - index}개 항목")
+                break
+            lines.append(line)
+            length += len(line) + 1
+        return "\n".join(lines)
+
+    def to_list(self) -> List[List[str]]:
+        return [list(question) for question in self.questions]
+
+    @classmethod
+    def from_list(cls, data: List) -> 'QuestionSchema':
+        return cls([tuple(question) for question in data or []])
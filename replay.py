@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Luma 응답 기록 및 오프라인 재생
+
+운영 중 봇이 받은 Luma 응답(라이브 이벤트 목록과 모든 참석자 페이지)을 틱 단위로
+압축 JSONL 아카이브에 기록하고(RECORD_FILE), 이를 `LumaCheckinBot.run_check`에 다시 흘려
+운영 환경의 동작을 오프라인에서 재현합니다.
+
+- 재생 시 `datetime.utcnow()` 대신 기록된 시각을 따르는 가상 시계를 사용합니다.
+- 틱 간격은 1배속~1000배속(또는 --speed 0으로 대기 없이)으로 재생할 수 있습니다.
+- 기록된 응답은 Luma 클라이언트의 전송 계층(ReplaySource)에서 돌려주므로 클라이언트 코드는 운영과 같습니다.
+- Telegram으로 보내려던 메시지는 가짜 전송(transport.FakeTelegram)으로 모아서 파일로 저장하므로,
+  버전 간 알림 결과가 동일한지 비교하거나 실제 이벤트 규모로 처리량을 측정할 수 있습니다.
+
+사용법:
+    RECORD_FILE=records/luma.jsonl.gz python luma_checkin_bot.py       # 기록
+    python replay.py records/luma.jsonl.gz --speed 100 --output out.jsonl  # 재생
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit
+from typing import List, Dict, Iterator, Optional
+
+from transport import FakeTelegram, Response, Transport
+
+
+def _request_key(path: str, params: Optional[Dict]) -> str:
+    """요청 경로와 파라미터로 만든 조회 키"""
+    query = "&".join(f"{key}={params[key]}" for key in sorted(params or {}))
+    return f"{path}?{query}"
+
+
+class ResponseRecorder:
+    """Luma 응답을 gzip 압축 JSONL로 기록
+
+    단발성 실행마다 gzip 멤버를 하나씩 이어 붙이므로 cron 실행이 쌓여도 하나의 아카이브로 읽을 수 있습니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _write(self, entry: Dict):
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n"
+        with self._lock:
+            with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                f.write(line)
+
+    def begin_tick(self, tick_id: str, now: datetime, minutes_ago: float):
+        """틱 시작 기록 (재생 시 같은 검색 구간을 쓰도록 minutes_ago도 기록)"""
+        self._write({'type': 'tick', 'tick_id': tick_id, 'ts': now.isoformat(), 'minutes_ago': minutes_ago})
+
+    def record(self, path: str, params: Optional[Dict], data: Dict):
+        """응답 하나 기록"""
+        self._write({
+            'type': 'response',
+            'ts': datetime.utcnow().isoformat(),
+            'key': _request_key(path, params),
+            'data': data,
+        })
+
+
+def read_ticks(path: str) -> Iterator[Dict]:
+    """아카이브를 틱 단위로 읽기: {'tick_id', 'ts', 'minutes_ago', 'responses': [(ts, key, data), ...]}"""
+    tick = None
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry['type'] == 'tick':
+                if tick is not None:
+                    yield tick
+                tick = {
+                    'tick_id': entry['tick_id'],
+                    'ts': entry['ts'],
+                    'minutes_ago': entry.get('minutes_ago'),
+                    'responses': [],
+                }
+            elif tick is not None:
+                tick['responses'].append((entry['ts'], entry['key'], entry['data']))
+    if tick is not None:
+        yield tick
+
+
+class VirtualClock:
+    """재생용 가상 시계 (기록된 시각을 따라감)"""
+
+    def __init__(self):
+        self.now = datetime(1970, 1, 1)
+
+    def set(self, timestamp: str):
+        moment = datetime.fromisoformat(timestamp)
+        if moment > self.now:
+            self.now = moment
+
+    def utcnow(self) -> datetime:
+        return self.now
+
+
+class ReplaySource(Transport):
+    """현재 틱의 기록된 응답을 요청 키로 돌려주는 Luma 전송 (기록 재생 구현)"""
+
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self.responses: Dict[str, List] = {}
+        self.misses = 0
+
+    def load_tick(self, tick: Dict):
+        self.responses = {}
+        for ts, key, data in tick['responses']:
+            self.responses.setdefault(key, []).append((ts, data))
+
+    def request(self, method, url, params=None, data=None, files=None, headers=None, timeout=None):
+        entries = self.responses.get(_request_key(urlsplit(url).path, params))
+        if not entries:
+            # 기록 당시와 다른 요청을 보내는 버전이면 빈 응답으로 처리
+            self.misses += 1
+            return Response.from_json({'entries': []}, url=url)
+        ts, data = entries.pop(0) if len(entries) > 1 else entries[0]
+        self.clock.set(ts)
+        return Response.from_json(data, url=url)
+
+
+def replay(archive: str, speed: float = 1.0, output: Optional[str] = None) -> Dict:
+    """아카이브를 봇에 재생하고 결과 요약 반환"""
+    archive = os.path.abspath(archive)
+    output = os.path.abspath(output) if output else None
+
+    # 재생은 실제 상태/리스/기록에 영향을 주지 않도록 임시 디렉터리에서 실행
+    original_cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix='luma-replay-')
+    os.chdir(workdir)
+    for key in ('LEASE_STORE', 'RECORD_FILE', 'FORCE_MINUTES_AGO', 'TICK_ID', 'TICK_DEADLINE', 'SEND_PHOTOS'):
+        os.environ.pop(key, None)
+    os.environ['STATE_DIR'] = os.path.join(workdir, 'state')
+    os.environ['EVENT_CACHE_FILE'] = os.path.join(workdir, 'event_cache.json')
+    # 기록된 응답만 읽으므로 Luma API 요청 예산을 쓰지 않고, 요청 시각이 매번 다른 행사 전 미리 받기도 하지 않음
+    os.environ['LUMA_RATE_PER_MINUTE'] = '0'
+    os.environ['WARMUP_LEAD_MINUTES'] = '0'
+    # 메시지는 실제로 보내지 않으므로 채팅방별 전송 속도 제한도 두지 않음
+    os.environ['TELEGRAM_SEND_RATE_PER_MINUTE'] = '0'
+    os.environ.setdefault('LUMA_API_KEY', 'replay')
+    os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'replay')
+    os.environ.setdefault('TELEGRAM_CHAT_ID', 'replay')
+
+    from luma_checkin_bot import LumaCheckinBot
+
+    clock = VirtualClock()
+    source = ReplaySource(clock)
+    bot = LumaCheckinBot()
+    bot.utcnow = clock.utcnow
+    bot.luma_api.transport = source
+    # 기록에 없는 이벤트 상세 조회는 하지 않음 (메타데이터 캐시는 재생용 임시 디렉터리의 빈 캐시로 시작)
+    bot.event_meta.fetch = None
+    telegram = FakeTelegram()
+    bot.telegram_bot.transport = telegram
+    sent: List[Dict] = []
+
+    tick_count = 0
+    guest_rows = 0
+    previous_ts = None
+    started = time.perf_counter()
+    try:
+        for tick in read_ticks(archive):
+            tick_ts = datetime.fromisoformat(tick['ts'])
+            if previous_ts is not None and speed > 0:
+                time.sleep(max((tick_ts - previous_ts).total_seconds() / speed, 0))
+            previous_ts = tick_ts
+
+            clock.set(tick['ts'])
+            source.load_tick(tick)
+            guest_rows += sum(
+                len(data.get('entries', [])) for _, key, data in tick['responses'] if '/guests' in key
+            )
+            bot.run_check(minutes_ago=tick['minutes_ago'])
+            sent.extend(dict(tick_id=tick['tick_id'], **message) for message in telegram.sent[len(sent):])
+            tick_count += 1
+    finally:
+        os.chdir(original_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    elapsed = time.perf_counter() - started
+
+    digest = hashlib.sha256()
+    for message in sent:
+        digest.update(f"{message['chat_id']}\0{message.get('text', message.get('photo'))}\0".encode())
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            for message in sent:
+                f.write(json.dumps(message, ensure_ascii=False) + "\n")
+
+    return {
+        'ticks': tick_count,
+        'guest_rows': guest_rows,
+        'notifications': len(sent),
+        'misses': source.misses,
+        'elapsed': elapsed,
+        'digest': digest.hexdigest(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Luma 응답 아카이브 재생")
+    parser.add_argument('archive', help="RECORD_FILE로 기록한 .jsonl.gz 아카이브")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="재생 배속 (1~1000, 0이면 틱 사이 대기 없음)")
+    parser.add_argument('--output', help="재생 중 생성된 알림을 저장할 JSONL 파일")
+    args = parser.parse_args()
+
+    if args.speed < 0:
+        parser.error("--speed는 0 이상이어야 합니다.")
+
+    result = replay(args.archive, speed=args.speed, output=args.output)
+    rate = result['guest_rows'] / result['elapsed'] if result['elapsed'] else 0.0
+    print(f"✅ 재생 완료: 틱 {result['ticks']}회, 알림 {result['notifications']}건")
+    print(f"   소요 시간: {result['elapsed']:.2f}초 (참석자 행 {result['guest_rows']}개, 초당 {rate:,.0f}행)")
+    if result['misses']:
+        print(f"   ⚠️ 기록에 없는 요청 {result['misses']}건은 빈 응답으로 처리했습니다.")
+    print(f"   알림 해시: {result['digest']}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+행사 후 참석 보고서
+
+봇이 남긴 체크인 기록 로그(checkin_log.py)와 이벤트 상태(등록 인원)로 참석률, 도착 추이,
+가장 붐빈 1분, 티켓 종류별 참석률, VIP 참석 현황을 계산합니다.
+체크인 기록은 한 번만 순서대로 읽으며(스트리밍), 10만 건 로그도 몇 초 안에 처리합니다.
+
+사용법:
+    python report.py <이벤트 ID>                        # 텍스트 보고서 출력
+    python report.py <이벤트 ID> --csv reports/evt.csv  # CSV로 저장
+    python report.py <이벤트 ID> --send                 # Telegram으로 전송
+    python report.py --all                              # 기록이 있는 모든 이벤트
+"""
+
+import os
+import sys
+import csv
+import html
+import json
+import argparse
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Tuple
+
+from checkin_log import CheckinLog
+from event_state import EventStateStore
+
+# 텍스트 보고서의 도착 추이 최대 행 수 (넘으면 구간을 넓힘)
+MAX_CURVE_ROWS = 24
+CURVE_BUCKETS_MINUTES = (5, 10, 15, 30, 60, 120, 240, 720, 1440)
+BAR_WIDTH = 20
+
+
+def _kst(epoch_seconds: int, fmt: str = '%m-%d %H:%M') -> str:
+    return (datetime(1970, 1, 1) + timedelta(seconds=epoch_seconds + 9 * 3600)).strftime(fmt)
+
+
+class AttendanceReport:
+    """이벤트 하나의 보고서 집계"""
+
+    def __init__(self, event_id: str, event_name: str):
+        self.event_id = event_id
+        self.event_name = event_name
+        self.registered = 0
+        # 티켓 종류 -> [등록 인원, 체크인 인원] (이벤트 상태 기준)
+        self.tickets: Dict[str, List[int]] = {}
+        # 체크인 기록 기준 집계
+        self.logged = 0
+        self.per_minute: Dict[int, int] = {}
+        self.logged_tickets: Dict[str, int] = {}
+        self.vips_present: Dict[str, int] = {}
+        self.first_arrival: Optional[int] = None
+        self.last_arrival: Optional[int] = None
+        self.detect_delay_total = 0
+        self.deliver_delay_total = 0
+        self.delivered = 0
+
+    def load_state(self, store: EventStateStore):
+        """이벤트 상태의 등록/체크인 인원 (참석률 분모)"""
+        stats = store.get(self.event_id).stats
+        self.registered = stats.registered
+        self.tickets = {ticket_type: list(counts) for ticket_type, counts in stats.by_ticket.items()}
+
+    def scan(self, log: CheckinLog):
+        """체크인 기록을 한 번 읽으며 집계 (같은 참석자가 여러 번 기록됐으면 처음 기록만 사용)"""
+        seen = set()
+        with log.open(self.event_id) as reader:
+            for line in reader.lines():
+                fields = line.split(b'\t', 6)
+                if len(fields) != 7 or fields[3] in seen:
+                    continue
+                seen.add(fields[3])
+                try:
+                    checked_in_at, detected_at, delivered_at = int(fields[0]), int(fields[1]), int(fields[2])
+                except ValueError:
+                    continue
+                self.logged += 1
+                minute = checked_in_at // 60
+                self.per_minute[minute] = self.per_minute.get(minute, 0) + 1
+                ticket_type = fields[4].decode('utf-8', 'replace')
+                self.logged_tickets[ticket_type] = self.logged_tickets.get(ticket_type, 0) + 1
+                if fields[5] == b'1':
+                    self.vips_present[fields[6].decode('utf-8', 'replace')] = checked_in_at
+                if self.first_arrival is None or checked_in_at < self.first_arrival:
+                    self.first_arrival = checked_in_at
+                if self.last_arrival is None or checked_in_at > self.last_arrival:
+                    self.last_arrival = checked_in_at
+                self.detect_delay_total += max(detected_at - checked_in_at, 0)
+                if delivered_at:
+                    self.delivered += 1
+                    self.deliver_delay_total += max(delivered_at - checked_in_at, 0)
+
+    @property
+    def checked_in(self) -> int:
+        # 봇이 행사 중간부터 실행됐으면 기록보다 상태의 체크인 인원이 많음
+        return max(sum(counts[1] for counts in self.tickets.values()), self.logged)
+
+    def peak_minute(self) -> Optional[int]:
+        if not self.per_minute:
+            return None
+        return max(self.per_minute, key=lambda minute: (self.per_minute[minute], -minute))
+
+    def ticket_rows(self) -> List[List]:
+        """[티켓 종류, 등록 인원, 체크인 인원, 참석률] (등록 인원 순)"""
+        rows = []
+        for ticket_type in set(self.tickets) | set(self.logged_tickets):
+            registered, checked_in = self.tickets.get(ticket_type, [0, 0])
+            checked_in = max(checked_in, self.logged_tickets.get(ticket_type, 0))
+            rows.append([ticket_type, registered, checked_in, checked_in / registered if registered else None])
+        return sorted(rows, key=lambda row: (-row[1], row[0]))
+
+    def curve(self) -> Tuple[int, List[List[int]]]:
+        """(구간 길이 분, [[구간 시작 분, 도착 인원], ...]) (텍스트용으로 MAX_CURVE_ROWS 이하가 되도록 구간을 넓힘)"""
+        if not self.per_minute:
+            return 0, []
+        first, last = min(self.per_minute), max(self.per_minute)
+        bucket = next(
+            (size for size in CURVE_BUCKETS_MINUTES if (last - first) // size + 1 <= MAX_CURVE_ROWS),
+            CURVE_BUCKETS_MINUTES[-1]
+        )
+        counts: Dict[int, int] = {}
+        for minute, count in self.per_minute.items():
+            start = minute // bucket * bucket
+            counts[start] = counts.get(start, 0) + count
+        return bucket, [[start, counts.get(start, 0)] for start in range(first // bucket * bucket, last + 1, bucket)]
+
+    def format_text(self, vip_names: List[str]) -> str:
+        """Telegram용 텍스트 보고서"""
+        checked_in = self.checked_in
+        rate = checked_in / self.registered * 100 if self.registered else 0.0
+        lines = [
+            "📋 <b>행사 참석 보고서</b>",
+            "",
+            f"📅 <b>이벤트:</b> {html.escape(self.event_name)}",
+            f"✅ <b>참석:</b> {checked_in} / {self.registered}명 ({rate:.1f}%)",
+        ]
+        if self.first_arrival is not None:
+            lines.append(f"🕒 <b>도착 시간대:</b> {_kst(self.first_arrival)} ~ {_kst(self.last_arrival, '%H:%M')} KST")
+        peak = self.peak_minute()
+        if peak is not None:
+            lines.append(f"🔥 <b>가장 붐빈 1분:</b> {_kst(peak * 60, '%H:%M')} KST ({self.per_minute[peak]}명)")
+        if self.logged:
+            lines.append(f"⏱️ <b>평균 감지 지연:</b> {self.detect_delay_total / self.logged:.0f}초")
+        if self.delivered:
+            lines.append(f"📨 <b>평균 알림 지연:</b> {self.deliver_delay_total / self.delivered:.0f}초")
+
+        ticket_rows = self.ticket_rows()
+        if ticket_rows:
+            lines += ["", "🏷️ <b>티켓 종류별 참석률:</b>"]
+            for ticket_type, registered, ticket_checked_in, show_rate in ticket_rows:
+                rate_text = f" ({show_rate * 100:.1f}%)" if show_rate is not None else ""
+                lines.append(f"• {html.escape(ticket_type)}: {ticket_checked_in} / {registered}명{rate_text}")
+
+        vips = self.vip_rows(vip_names)
+        if vips:
+            attended = sum(1 for _, present in vips if present)
+            lines += ["", f"🌟 <b>VIP 참석:</b> {attended} / {len(vips)}명"]
+            lines += [f"• {html.escape(name)} ({_kst(present, '%H:%M')})" for name, present in vips if present]
+            absent = [name for name, present in vips if not present]
+            if absent:
+                lines.append(f"• 미참석: {', '.join(html.escape(name) for name in absent)}")
+
+        bucket, curve = self.curve()
+        if curve:
+            peak_count = max(count for _, count in curve) or 1
+            lines += ["", f"🚶 <b>도착 추이 ({bucket}분 단위, KST):</b>", "<pre>"]
+            for start, count in curve:
+                bar = "█" * round(count / peak_count * BAR_WIDTH)
+                lines.append(f"{_kst(start * 60, '%H:%M')} {bar} {count}")
+            lines.append("</pre>")
+        return "\n".join(lines)
+
+    def vip_rows(self, vip_names: List[str]) -> List[List]:
+        """[VIP 이름, 체크인 시각 또는 None] (설정된 VIP와 기록에 VIP로 남은 참석자)"""
+        names = list(dict.fromkeys(vip_names + sorted(self.vips_present)))
+        return [[name, self.vips_present.get(name)] for name in names]
+
+    def write_csv(self, path: str, vip_names: List[str]):
+        """보관용 CSV (section, key, value 형식)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['section', 'key', 'value'])
+            writer.writerow(['summary', 'event_id', self.event_id])
+            writer.writerow(['summary', 'event_name', self.event_name])
+            writer.writerow(['summary', 'registered', self.registered])
+            writer.writerow(['summary', 'checked_in', self.checked_in])
+            writer.writerow(['summary', 'attendance_rate',
+                             f"{self.checked_in / self.registered:.4f}" if self.registered else ''])
+            peak = self.peak_minute()
+            if peak is not None:
+                writer.writerow(['summary', 'peak_minute_kst', _kst(peak * 60, '%Y-%m-%d %H:%M')])
+                writer.writerow(['summary', 'peak_arrivals', self.per_minute[peak]])
+            for ticket_type, registered, checked_in, show_rate in self.ticket_rows():
+                writer.writerow([f'ticket:{ticket_type}', 'registered', registered])
+                writer.writerow([f'ticket:{ticket_type}', 'checked_in', checked_in])
+                writer.writerow([f'ticket:{ticket_type}', 'show_rate', f"{show_rate:.4f}" if show_rate is not None else ''])
+            for name, present in self.vip_rows(vip_names):
+                writer.writerow(['vip', name, _kst(present, '%Y-%m-%d %H:%M') if present else ''])
+            for minute in sorted(self.per_minute):
+                writer.writerow(['arrivals', _kst(minute * 60, '%Y-%m-%d %H:%M'), self.per_minute[minute]])
+
+
+def _event_names(cache_file: str) -> Dict[str, str]:
+    """이벤트 메타데이터 캐시의 이벤트 이름"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return {event_id: entry['meta'].get('name') or event_id for event_id, entry in json.load(f).items()}
+    except (FileNotFoundError, ValueError, KeyError):
+        return {}
+
+
+def build_report(event_id: str, log: CheckinLog, store: EventStateStore,
+                 names: Optional[Dict[str, str]] = None) -> AttendanceReport:
+    report = AttendanceReport(event_id, (names or {}).get(event_id, event_id))
+    report.load_state(store)
+    report.scan(log)
+    return report
+
+
+def main():
+    from config_snapshot import load_config
+    load_config('.env')
+
+    parser = argparse.ArgumentParser(description="행사 후 참석 보고서")
+    parser.add_argument('event_id', nargs='?', help="이벤트 ID (체크인 기록 파일 이름)")
+    parser.add_argument('--all', action='store_true', help="체크인 기록이 있는 모든 이벤트")
+    parser.add_argument('--csv', help="CSV 저장 경로 (--all이면 디렉터리)")
+    parser.add_argument('--send', action='store_true', help="텍스트 보고서를 Telegram으로 전송")
+    args = parser.parse_args()
+
+    log = CheckinLog(os.getenv('CHECKIN_LOG_DIR') or 'checkins.d')
+    store = EventStateStore(os.getenv('STATE_DIR', '.bot_state.d'))
+    names = _event_names(os.getenv('EVENT_CACHE_FILE', '.event_cache.json'))
+    vip_names = [name.strip() for name in os.getenv('VIP_GUESTS', '').split(',') if name.strip()]
+
+    if args.all:
+        event_ids = log.events()
+    elif args.event_id:
+        event_ids = [args.event_id]
+    else:
+        parser.error("이벤트 ID 또는 --all을 지정하세요.")
+    if not event_ids:
+        print("❌ 체크인 기록이 없습니다.")
+        return 1
+
+    telegram_bot = None
+    if args.send:
+        from luma_checkin_bot import TelegramBot
+        telegram_bot = TelegramBot(os.getenv('TELEGRAM_BOT_TOKEN', ''), os.getenv('TELEGRAM_CHAT_ID', ''))
+
+    for event_id in event_ids:
+        if not os.path.exists(log.paths(event_id)[0]):
+            print(f"❌ 이벤트 {event_id}의 체크인 기록이 없습니다.")
+            continue
+        report = build_report(event_id, log, store, names)
+        text = report.format_text(vip_names)
+        print(text)
+        print()
+        if args.csv:
+            path = os.path.join(args.csv, f"{event_id}.csv") if args.all else args.csv
+            report.write_csv(path, vip_names)
+            print(f"💾 CSV 저장: {path}")
+        if telegram_bot and not telegram_bot.send_message(text):
+            print(f"❌ 이벤트 {event_id} 보고서 전송 실패")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+체크인 알림 라우팅 규칙
+
+체크인 하나를 어느 채팅방(들)로 보낼지 정하는 규칙입니다. 규칙은 시작 시 한 번 조건별 조회 테이블로
+컴파일해 두므로, 체크인마다 규칙 목록을 순회하지 않고 사전 조회 몇 번으로 대상 채팅방을 구합니다.
+
+ROUTING_RULES 형식 (`;`로 규칙 구분, `조건=채팅방ID[,채팅방ID...]`):
+    all=-100444                  모든 체크인 (로그 채널 등)
+    vip=-100111                  VIP 체크인 (임원 채팅방 등)
+    ticket:VIP Pass=-100222      티켓 종류별 (스태프 채널 등)
+    event:evt-abc=-100555        이벤트별
+    default=-100333              all을 제외한 다른 규칙에 해당하지 않는 체크인
+
+default와 all 규칙이 모두 없으면 다른 규칙에 해당하지 않는 체크인은 fallback_chat(TELEGRAM_CHAT_ID)으로 보냅니다.
+"""
+
+from typing import List, Dict, Optional
+
+from guest_index import guest_ticket_type
+
+
+class RoutingRuleError(ValueError):
+    """잘못된 라우팅 규칙"""
+
+
+class Router:
+    """컴파일된 라우팅 규칙"""
+
+    def __init__(self, default_chats: Optional[List[str]] = None):
+        self.all_chats: List[str] = []
+        self.vip_chats: List[str] = []
+        self.ticket_chats: Dict[str, List[str]] = {}
+        self.event_chats: Dict[str, List[str]] = {}
+        self.default_chats: List[str] = list(default_chats or [])
+
+    @classmethod
+    def parse(cls, spec: Optional[str], fallback_chat: str) -> 'Router':
+        """ROUTING_RULES 문자열을 컴파일 (규칙이 없으면 모든 체크인을 fallback_chat으로)"""
+        router = cls()
+        rules = [rule.strip() for rule in (spec or '').split(';') if rule.strip()]
+        if not rules:
+            router.default_chats = [fallback_chat]
+            return router
+
+        for rule in rules:
+            condition, _, chats_text = rule.rpartition('=')
+            condition = condition.strip()
+            chats = [chat.strip() for chat in chats_text.split(',') if chat.strip()]
+            if not condition or not chats:
+                raise RoutingRuleError(f"라우팅 규칙 형식이 올바르지 않습니다: {rule}")
+
+            kind, _, value = condition.partition(':')
+            kind = kind.strip().lower()
+            value = value.strip()
+            if kind == 'all':
+                target = router.all_chats
+            elif kind == 'vip':
+                target = router.vip_chats
+            elif kind == 'default':
+                target = router.default_chats
+            elif kind == 'ticket' and value:
+                target = router.ticket_chats.setdefault(value, [])
+            elif kind == 'event' and value:
+                target = router.event_chats.setdefault(value, [])
+            else:
+                raise RoutingRuleError(f"알 수 없는 라우팅 조건입니다: {condition}")
+            target.extend(chat for chat in chats if chat not in target)
+        if not router.default_chats and not router.all_chats:
+            # 어느 규칙에도 해당하지 않는 체크인이 알림 없이 사라지지 않도록 기본 채팅방으로 보냄
+            router.default_chats = [fallback_chat]
+        return router
+
+    def route(self, guest: Dict, event_id: str, is_vip: bool) -> List[str]:
+        """체크인 하나의 대상 채팅방 목록 (중복 없이 규칙 순서대로)"""
+        matched: List[str] = []
+        if is_vip:
+            matched.extend(self.vip_chats)
+        if self.ticket_chats:
+            matched.extend(self.ticket_chats.get(guest_ticket_type(guest), ()))
+        if self.event_chats:
+            matched.extend(self.event_chats.get(event_id, ()))
+        if not matched:
+            matched.extend(self.default_chats)
+        matched.extend(self.all_chats)
+        return list(dict.fromkeys(matched))
+
+    def chats(self) -> List[str]:
+        """규칙에 등장하는 모든 채팅방"""
+        chats = self.all_chats + self.vip_chats + self.default_chats
+        for targets in list(self.ticket_chats.values()) + list(self.event_chats.values()):
+            chats.extend(targets)
+        return list(dict.fromkeys(chats))
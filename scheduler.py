@@ -3,63 +3,76 @@
 Luma Check-in Bot Scheduler
 
 이 스크립트는 luma_checkin_bot.py를 5분마다 실행하는 스케줄러입니다.
-첫 실행 시에는 20분 전 체크인을 검색하고, 이후로는 5분마다 최근 5분 체크인을 검색합니다.
+검색 구간은 봇이 이벤트별 워터마크(마지막으로 모두 처리한 시각)로 정하므로,
+재시작이나 배포로 실행이 끊겨도 그동안의 체크인을 빠짐없이 한 번씩만 따라잡습니다.
 """
 
 import schedule
 import time
 import subprocess
 import logging
+import os
 import sys
 from datetime import datetime
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('scheduler.log')
-    ]
-)
+from log_setup import setup_logging, new_tick_id
+from config_snapshot import read_config
+
 logger = logging.getLogger(__name__)
 
+# 봇이 응답하지 않을 때만 강제 종료하기 위한 여유 시간 (초)
+KILL_GRACE_SECONDS = 30
+
+
+def tick_budget_seconds(env_file: str = '.env') -> float:
+    """봇 틱 시간 예산 (초): 봇이 스스로 남은 작업을 미루고 이 시간 안에 끝냄
+
+    봇과 같은 순서(프로세스 환경 변수, `.env`, 기본값 50초)로 읽습니다. 봇 프로세스가 실행할 때마다
+    `.env`를 새로 읽으므로 스케줄러도 실행할 때마다 읽어 마감 시각과 강제 종료 시간을 봇의 예산에 맞춥니다.
+    """
+    value = os.getenv('TICK_BUDGET_SECONDS') or read_config(env_file).get('TICK_BUDGET_SECONDS') or '50'
+    return float(value)
+
 
 def run_bot(minutes_ago=None):
     """봇 실행 함수"""
+    # 봇 프로세스에도 같은 틱 ID를 전달해 스케줄러와 봇 로그를 함께 추적
+    tick_id = new_tick_id()
+    budget = tick_budget_seconds()
     try:
         cmd = [sys.executable, 'luma_checkin_bot.py']
+        env = os.environ.copy()
+        env['TICK_ID'] = tick_id
+        # 봇이 API 호출 타임아웃과 남은 작업 연기에 사용할 마감 시각 전달
+        env['TICK_DEADLINE'] = str(time.time() + budget)
         if minutes_ago:
             # 임시로 환경 변수로 minutes_ago 전달
-            import os
-            env = os.environ.copy()
             env['FORCE_MINUTES_AGO'] = str(minutes_ago)
-            logger.info(f"Luma 체크인 봇 실행 중... (최근 {minutes_ago}분 체크인 검색)")
+            logger.info("Luma 체크인 봇 실행 중... (최근 %s분 체크인 검색)", minutes_ago)
         else:
-            env = None
             logger.info("Luma 체크인 봇 실행 중...")
             
         result = subprocess.run(
             cmd, 
             capture_output=True, 
             text=True, 
-            timeout=60,
+            timeout=budget + KILL_GRACE_SECONDS,
             env=env
         )
         
         if result.returncode == 0:
             logger.info("봇 실행 성공")
             if result.stdout:
-                logger.debug(f"출력: {result.stdout}")
+                logger.debug("출력: %s", result.stdout)
         else:
-            logger.error(f"봇 실행 실패 (exit code: {result.returncode})")
+            logger.error("봇 실행 실패 (exit code: %s)", result.returncode)
             if result.stderr:
-                logger.error(f"에러: {result.stderr}")
+                logger.error("에러: %s", result.stderr)
                 
     except subprocess.TimeoutExpired:
-        logger.error("봇 실행 시간 초과 (60초)")
+        logger.error("봇이 마감 시각 이후에도 응답하지 않아 강제 종료했습니다 (%.0f초)", budget + KILL_GRACE_SECONDS)
     except Exception as e:
-        logger.error(f"봇 실행 중 예외 발생: {e}")
+        logger.error("봇 실행 중 예외 발생: %s", e)
 
 
 def run_bot_regular():
@@ -69,15 +82,17 @@ def run_bot_regular():
 
 def main():
     """메인 함수"""
+    # 로깅 설정 (큐 기반 비동기 기록, 회전, 틱 상관관계 ID)
+    setup_logging('scheduler.log', level='INFO')
     logger.info("Luma 체크인 봇 스케줄러 시작")
-    logger.info("첫 실행은 20분 전 체크인을 검색하고, 이후 5분마다 실행됩니다...")
+    logger.info("시작 시 마지막 처리 시점부터 따라잡고, 이후 5분마다 실행됩니다...")
     
     # 5분마다 실행되도록 스케줄 설정 (일반 실행)
     schedule.every(5).minutes.do(run_bot_regular)
     
-    # 시작 시 첫 번째 실행 - 20분 전 체크인 검색
-    logger.info("초기 실행 (20분 전 체크인 검색)...")
-    run_bot(minutes_ago=60)
+    # 시작 시 첫 번째 실행 - 봇이 워터마크부터 놓친 체크인을 따라잡음
+    logger.info("초기 실행 (마지막 처리 시점부터 따라잡기)...")
+    run_bot()
     
     # 스케줄 실행
     try:
@@ -87,7 +102,7 @@ def main():
     except KeyboardInterrupt:
         logger.info("스케줄러 중지됨")
     except Exception as e:
-        logger.error(f"스케줄러 오류: {e}")
+        logger.error("스케줄러 오류: %s", e)
 
 
 if __name__ == "__main__":
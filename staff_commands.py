@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+스태프 명령 (Telegram long polling)
+
+데몬 모드에서 백그라운드 스레드로 Telegram getUpdates를 long polling해 `/whois 김철수` 같은 명령을 받고,
+등록된 처리 함수의 결과를 명령을 보낸 채팅방에 답장합니다.
+알림 대상 채팅방(과 STAFF_CHAT_IDS)에서 온 명령만 처리하며, 봇이 꺼져 있던 동안 쌓인 오래된 명령은 무시합니다.
+"""
+
+import time
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 이보다 오래된 명령은 답하지 않음 (초)
+MAX_COMMAND_AGE_SECONDS = 120
+
+
+class CommandListener:
+    """Telegram 명령 수신 스레드
+
+    handlers는 명령 이름(`whois`) -> 처리 함수(인자 문자열, 메시지) -> 답장 텍스트 사전입니다.
+    """
+
+    def __init__(self, telegram_bot, handlers: Dict[str, Callable[[str, Dict], str]],
+                 allowed_chats: Iterable[str], poll_timeout: int = 25):
+        self.telegram_bot = telegram_bot
+        self.handlers = handlers
+        self.allowed_chats = {str(chat_id) for chat_id in allowed_chats}
+        self.poll_timeout = poll_timeout
+        self._offset: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='staff-commands', daemon=True)
+        self._thread.start()
+        logger.info("스태프 명령 수신 시작 (/%s)", ", /".join(sorted(self.handlers)))
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            updates = self.telegram_bot.get_updates(self._offset, self.poll_timeout)
+            if updates is None:
+                # 네트워크 오류 등은 점점 길게 기다렸다가 다시 시도
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+                continue
+            backoff = 1.0
+            for update in updates:
+                self._offset = update['update_id'] + 1
+                try:
+                    self.handle_update(update)
+                except Exception as e:
+                    logger.error("스태프 명령 처리 중 오류 발생: %s", e, exc_info=True)
+
+    def handle_update(self, update: Dict):
+        """명령 메시지 하나 처리"""
+        message = update.get('message') or {}
+        text = (message.get('text') or '').strip()
+        if not text.startswith('/'):
+            return
+        command, _, argument = text[1:].partition(' ')
+        # 그룹 채팅방에서는 `/whois@봇이름` 형식으로 올 수 있음
+        command = command.split('@', 1)[0].lower()
+        handler = self.handlers.get(command)
+        if handler is None:
+            return
+
+        chat_id = str((message.get('chat') or {}).get('id', ''))
+        if chat_id not in self.allowed_chats:
+            logger.warning("허용되지 않은 채팅방 %s의 /%s 명령을 무시합니다.", chat_id, command)
+            return
+        if time.time() - message.get('date', 0) > MAX_COMMAND_AGE_SECONDS:
+            logger.info("오래된 /%s 명령을 무시합니다 (채팅방: %s)", command, chat_id)
+            return
+
+        started = time.perf_counter()
+        reply = handler(argument.strip(), message)
+        logger.info("/%s 명령 처리 (채팅방: %s, %.1fms)", command, chat_id, (time.perf_counter() - started) * 1000)
+        self.telegram_bot.reply_message(reply, chat_id, message.get('message_id'))
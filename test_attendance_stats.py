@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+참석자 인덱스 변경분과 누적 참석 통계 테스트
+
+사용법:
+    python -m unittest test_attendance_stats
+"""
+
+import unittest
+from datetime import datetime
+
+from attendance_stats import AttendanceStats, parse_utc
+from guest_index import GuestIndex
+
+NOW = datetime(2026, 5, 1, 10, 0, 0)
+
+
+def guest(guest_id, checked_in_at=None, ticket_type=None):
+    entry = {'api_id': guest_id, 'checkin_info': {'checked_in_at': checked_in_at}}
+    if ticket_type:
+        entry['ticket_type'] = ticket_type
+    return entry
+
+
+class GuestIndexTest(unittest.TestCase):
+
+    def test_delta_contains_only_changes(self):
+        index = GuestIndex()
+        delta = index.apply([guest('g1'), guest('g2', '2026-05-01T09:58:00Z')])
+        self.assertEqual(len(delta), 2)
+        self.assertEqual(delta.new_checkin_ids(), ['g2'])
+
+        delta = index.apply([guest('g1', '2026-05-01T09:59:00Z'), guest('g2', '2026-05-01T09:58:00Z')])
+        self.assertEqual(delta.new_checkin_ids(), ['g1'])
+        self.assertEqual(len(delta), 1)
+
+    def test_removed_guests(self):
+        index = GuestIndex()
+        index.apply([guest('g1'), guest('g2')])
+        version = index.version
+        delta = index.apply([guest('g1')])
+        self.assertEqual(delta.changes, [('g2', (None, '일반'), None)])
+        self.assertEqual(len(index), 1)
+        self.assertGreater(index.version, version)
+
+    def test_unchanged_page_keeps_version(self):
+        index = GuestIndex()
+        index.apply([guest('g1')])
+        version = index.version
+        index.apply([guest('g1')])
+        self.assertEqual(index.version, version)
+
+
+class AttendanceStatsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = GuestIndex()
+        self.stats = AttendanceStats()
+
+    def apply(self, guests):
+        self.stats.apply(self.index.apply(guests))
+
+    def test_counters_follow_changes(self):
+        self.apply([guest('g1', ticket_type='VIP'), guest('g2'), guest('g3')])
+        self.apply([guest('g1', '2026-05-01T09:59:10Z', 'VIP'), guest('g2', '2026-05-01T09:59:40Z'), guest('g3')])
+        self.assertEqual((self.stats.checked_in, self.stats.registered), (2, 3))
+        self.assertEqual(self.stats.by_ticket, {'VIP': [1, 1], '일반': [2, 1]})
+        self.assertEqual(self.stats.arrivals_per_minute(NOW, window_minutes=2), 1.0)
+
+        # 체크인 취소와 등록 취소도 되돌림
+        self.apply([guest('g1', None, 'VIP'), guest('g2', '2026-05-01T09:59:40Z')])
+        self.assertEqual((self.stats.checked_in, self.stats.registered), (1, 2))
+        self.assertEqual(self.stats.by_ticket, {'VIP': [1, 0], '일반': [1, 1]})
+
+    def test_prune_drops_old_arrivals(self):
+        self.apply([guest('g1', '2026-05-01T08:00:00Z'), guest('g2', '2026-05-01T09:50:00Z')])
+        self.stats.prune(NOW)
+        self.assertEqual(len(self.stats.arrivals), 1)
+        self.assertEqual(self.stats.checked_in, 2)
+
+    def test_round_trip(self):
+        self.apply([guest('g1', '2026-05-01T09:59:00Z', 'VIP'), guest('g2')])
+        restored = AttendanceStats.from_dict(self.stats.to_dict())
+        self.assertEqual(restored.to_dict(), self.stats.to_dict())
+
+    def test_summary_escapes_names(self):
+        self.apply([guest('g1', '2026-05-01T09:59:00Z', '<Staff & Crew>')])
+        message = self.stats.format_summary('R&D <Day>', NOW)
+        self.assertIn('R&amp;D &lt;Day&gt;', message)
+        self.assertIn('&lt;Staff &amp; Crew&gt;: 1 / 1명', message)
+
+
+class ParseUtcTest(unittest.TestCase):
+
+    def test_offsets_are_normalized(self):
+        self.assertEqual(parse_utc('2026-05-01T19:00:00+09:00'), datetime(2026, 5, 1, 10, 0))
+        self.assertEqual(parse_utc('2026-05-01T10:00:00Z'), datetime(2026, 5, 1, 10, 0))
+        self.assertIsNone(parse_utc('not a time'))
+        self.assertIsNone(parse_utc(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+체크인 기록 로그와 블록 인덱스 테스트
+
+사용법:
+    python -m unittest test_checkin_log
+"""
+
+import os
+import tempfile
+import unittest
+
+from checkin_log import BLOCK_BYTES, CheckinLog, CheckinRecord, decode_record, encode_record, _INDEX_ENTRY
+from test_run_check import BotHarness
+
+START = 1_777_600_000
+
+
+def record(number: int, checked_in_at: int) -> CheckinRecord:
+    return CheckinRecord(checked_in_at, checked_in_at + 5, checked_in_at + 7, f'g{number}', '일반', False,
+                         f'참석자{number} ' + 'x' * 100)
+
+
+class RecordTest(unittest.TestCase):
+
+    def test_round_trip_cleans_separators(self):
+        original = CheckinRecord(START, START + 1, 0, 'g1', 'V\tIP', True, '김\n철수')
+        line = encode_record(original)
+        self.assertEqual(line.count(b'\t'), 6)
+        self.assertEqual(decode_record(line.rstrip(b'\n')),
+                         original._replace(ticket_type='V IP', name='김 철수'))
+        self.assertIsNone(decode_record(b'123\tbroken'))
+        self.assertIsNone(decode_record(b'x\t1\t2\tg\tt\t0\tname'))
+
+
+class CheckinLogTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.log = CheckinLog(os.path.join(directory.name, 'checkins.d'))
+        # 한 시간 동안 1초마다 한 명 (약 460KB, 블록 여러 개)
+        self.records = [record(number, START + number) for number in range(3600)]
+        for offset in range(0, len(self.records), 500):
+            self.log.append('evt/1', self.records[offset:offset + 500])
+
+    def test_index_covers_log_in_blocks(self):
+        log_path, index_path = self.log.paths('evt/1')
+        self.assertTrue(log_path.endswith('evt_1.log'))
+        self.assertEqual(self.log.events(), ['evt_1'])
+        with self.log.open('evt/1') as reader:
+            self.assertGreater(len(reader.blocks), 3)
+            previous_end = 0
+            for offset, length, low, high, count in reader.blocks:
+                self.assertEqual(offset, previous_end)
+                self.assertGreaterEqual(length, BLOCK_BYTES)
+                self.assertLessEqual(low, high)
+                previous_end = offset + length
+            # 인덱스 블록의 건수와 인덱스에 아직 들어가지 않은 끝부분을 합치면 전체 기록
+            tail = reader._map[previous_end:reader.size].count(b'\n')
+            self.assertEqual(sum(block[4] for block in reader.blocks) + tail, 3600)
+
+    def test_range_query_reads_only_overlapping_blocks(self):
+        with self.log.open('evt/1') as reader:
+            spans = list(reader._spans(START + 1800, START + 1830))
+            self.assertLess(len(spans), 3)
+            records = list(reader.records(START + 1800, START + 1830))
+        self.assertEqual(records, self.records[1800:1830])
+
+    def test_histogram(self):
+        with self.log.open('evt/1') as reader:
+            histogram = reader.histogram(bucket_seconds=600)
+            self.assertEqual(sum(histogram.values()), 3600)
+            self.assertEqual(reader.histogram(START, START + 120), {
+                START // 60 * 60: 60 - START % 60, START // 60 * 60 + 60: 60, START // 60 * 60 + 120: START % 60,
+            })
+
+    def test_torn_tail_is_ignored(self):
+        log_path, index_path = self.log.paths('evt/1')
+        with open(log_path, 'ab') as f:
+            f.write(b'12345\tbroken')
+        with open(index_path, 'ab') as f:
+            f.write(b'\0' * (_INDEX_ENTRY.size - 1))
+        self.log.append('evt/1', [record(9999, START + 9999)])
+        with self.log.open('evt/1') as reader:
+            self.assertEqual(list(reader.records(START + 9000))[-1].guest_id, 'g9999')
+            self.assertEqual(len(list(reader.records())), 3601)
+
+
+class BotCheckinLogTest(unittest.TestCase):
+
+    def test_notified_checkins_are_logged(self):
+        h = BotHarness()
+        self.addCleanup(h.close)
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', ticket_type='VIP', checked_in_at=h.ago(1))
+        h.tick()
+
+        with CheckinLog('checkins.d').open('evt-1') as reader:
+            records = list(reader.records())
+        self.assertEqual([(entry.guest_id, entry.name, entry.ticket_type) for entry in records], [('g1', '김철수', 'VIP')])
+        self.assertGreater(records[0].delivered_at, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
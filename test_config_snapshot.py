@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+설정 스냅샷 테스트
+
+사용법:
+    python -m unittest test_config_snapshot
+"""
+
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+from config_snapshot import _snapshot_path, compile_snapshot, load_config, read_snapshot
+
+
+class ConfigSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.env_file = os.path.join(directory.name, '.env')
+        self.write_env("LUMA_API_KEY=secret\nVIP_GUESTS=김대표,이사장\n")
+
+    def write_env(self, content: str):
+        with open(self.env_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_snapshot_round_trip(self):
+        self.assertIsNone(read_snapshot(self.env_file))
+        values = compile_snapshot(self.env_file)
+        self.assertEqual(values, {'LUMA_API_KEY': 'secret', 'VIP_GUESTS': '김대표,이사장'})
+        self.assertEqual(read_snapshot(self.env_file), values)
+
+    def test_snapshot_is_private(self):
+        compile_snapshot(self.env_file)
+        mode = stat.S_IMODE(os.stat(_snapshot_path(self.env_file)).st_mode)
+        self.assertEqual(mode, 0o600)
+
+    def test_changed_env_invalidates_snapshot(self):
+        compile_snapshot(self.env_file)
+        self.write_env("LUMA_API_KEY=rotated-secret\n")
+        self.assertIsNone(read_snapshot(self.env_file))
+
+    def test_corrupt_snapshot_is_ignored(self):
+        with open(_snapshot_path(self.env_file), 'wb') as f:
+            f.write(b'not marshal')
+        self.assertIsNone(read_snapshot(self.env_file))
+
+    def test_load_config_keeps_existing_environment(self):
+        with mock.patch.dict(os.environ, {'LUMA_API_KEY': 'from-shell'}, clear=True):
+            self.assertTrue(load_config(self.env_file))
+            self.assertEqual(os.environ['LUMA_API_KEY'], 'from-shell')
+            self.assertEqual(os.environ['VIP_GUESTS'], '김대표,이사장')
+
+    def test_load_config_without_env_file(self):
+        self.assertFalse(load_config(self.env_file + '.missing'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+이벤트 현황판 테스트
+
+사용법:
+    python -m unittest test_dashboard
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+from attendance_stats import AttendanceStats
+from dashboard import MAX_ARRIVALS, Dashboard
+from test_run_check import CHAT_ID, BotHarness
+
+NOW = datetime(2026, 5, 1, 10, 0, 0)
+
+
+def guest(guest_id, name, checked_in_at=None, ticket_type=None):
+    entry = {'api_id': guest_id, 'name': name, 'checkin_info': {'checked_in_at': checked_in_at}}
+    if ticket_type:
+        entry['ticket_type'] = ticket_type
+    return entry
+
+
+class DashboardTest(unittest.TestCase):
+
+    def test_recent_arrivals_are_capped_and_sorted(self):
+        dashboard = Dashboard()
+        dashboard.add_arrivals([
+            guest(f'g{number}', f'참석자{number}', f'2026-05-01T09:{number:02d}:00Z') for number in range(15)
+        ] + [guest('g99', '미체크인')])
+        self.assertEqual(len(dashboard.arrivals), MAX_ARRIVALS)
+        self.assertEqual(dashboard.arrivals[0][1], '참석자14')
+        # 같은 참석자가 다시 오면 중복으로 늘지 않음
+        dashboard.add_arrivals([guest('g14', '참석자14', '2026-05-01T09:14:00Z')])
+        self.assertEqual(len(dashboard.arrivals), MAX_ARRIVALS)
+
+    def test_render_escapes_and_lists_vips(self):
+        dashboard = Dashboard()
+        dashboard.update_vip(guest('g1', '<대표>', '2026-05-01T09:30:00Z'))
+        dashboard.update_vip(guest('g2', '이사'))
+        dashboard.add_arrivals([guest('g1', '<대표>', '2026-05-01T09:30:00Z', 'R&D')])
+        stats = AttendanceStats()
+        stats.registered, stats.checked_in = 4, 1
+
+        body = dashboard.render('데모 & 데이', stats)
+        self.assertIn('📅 <b>이벤트:</b> 데모 &amp; 데이', body)
+        self.assertIn('✅ <b>체크인:</b> 1 / 4명 (25.0%)', body)
+        self.assertIn('🌟 <b>도착한 VIP (1명):</b>\n• &lt;대표&gt; (18:30)', body)
+        self.assertIn('• 18:30 &lt;대표&gt; (R&amp;D)', body)
+
+        # 체크인 취소된 VIP는 목록에서 빠짐
+        dashboard.update_vip(guest('g1', '<대표>'))
+        self.assertEqual(dashboard.vips, {})
+
+    def test_due_and_round_trip(self):
+        dashboard = Dashboard()
+        self.assertTrue(dashboard.due(NOW, 60))
+        dashboard.message_id, dashboard.edited_at = 5, NOW.isoformat()
+        self.assertFalse(dashboard.due(NOW + timedelta(seconds=59), 60))
+        self.assertTrue(dashboard.due(NOW + timedelta(seconds=60), 60))
+        self.assertEqual(Dashboard.from_dict(dashboard.to_dict()).to_dict(), dashboard.to_dict())
+        self.assertIn('마지막 갱신: 19:00:00 KST', Dashboard.with_timestamp('본문', NOW))
+
+
+class BotDashboardTest(unittest.TestCase):
+
+    def test_dashboard_is_pinned_then_edited_in_place(self):
+        h = BotHarness({'DASHBOARD': '1', 'DASHBOARD_INTERVAL_SECONDS': '60'})
+        self.addCleanup(h.close)
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(1))
+        h.luma.add_guest('evt-1', 'g2', '이영희')
+        h.tick()
+        dashboards = [entry for entry in h.telegram.sent if '실시간 현황판' in entry['text']]
+        self.assertEqual(len(dashboards), 1)
+        self.assertEqual(len(h.telegram.pinned), 1)
+        message_id = h.telegram.pinned[0][1]
+
+        # 내용이 같으면 수정하지 않음
+        h.advance(2)
+        h.tick()
+        self.assertEqual(len([entry for entry in h.telegram.sent if '실시간 현황판' in entry['text']]), 1)
+
+        h.advance(2)
+        h.luma.check_in('evt-1', 'g2', h.ago(1))
+        h.tick()
+        edits = [entry for entry in h.telegram.sent if entry.get('edit')]
+        self.assertEqual(len(edits), 1)
+        self.assertEqual(edits[0]['edit'], message_id)
+        self.assertEqual(str(edits[0]['chat_id']), CHAT_ID)
+        self.assertIn('2 / 2명', edits[0]['text'])
+
+
+if __name__ == "__main__":
+    unittest.main()
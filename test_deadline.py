@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+틱 시간 예산, 틱 합치기, 틱 지표 테스트
+
+사용법:
+    python -m unittest test_deadline
+"""
+
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+import scheduler
+from deadline import MIN_REQUEST_TIMEOUT, Deadline, DeadlineExceeded, TickLock, TickMetrics, request_timeout
+from test_run_check import BotHarness, names_in
+
+
+class FakeClock:
+    """time.monotonic / time.time 대신 쓰는 시계"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class DeadlineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('deadline.time')
+        time_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        time_mock.monotonic.side_effect = self.clock
+        time_mock.time.side_effect = self.clock
+
+    def test_budget(self):
+        deadline = Deadline(50)
+        self.clock.now += 20
+        self.assertEqual(deadline.elapsed(), 20)
+        self.assertEqual(deadline.remaining(), 30)
+        self.assertEqual(deadline.timeout(), 10)
+        deadline.check('참석자 조회')
+
+        # 알림 전송 몫으로 남겨 둔 비율에 닿으면 조회를 멈춤
+        self.clock.now += 21
+        with self.assertRaises(DeadlineExceeded):
+            deadline.check('참석자 조회', reserve_ratio=0.2)
+        deadline.check('알림 전송')
+        self.assertEqual(deadline.timeout(), 9)
+
+        self.clock.now += 10
+        self.assertTrue(deadline.expired())
+        self.assertEqual(deadline.timeout(), MIN_REQUEST_TIMEOUT)
+
+    def test_scheduler_deadline_wins_when_earlier(self):
+        self.assertEqual(Deadline(50, wall_deadline=self.clock.now + 30).remaining(), 30)
+        self.assertEqual(Deadline(50, wall_deadline=self.clock.now + 90).remaining(), 50)
+
+    def test_request_timeout_without_deadline(self):
+        self.assertEqual(request_timeout(None, cap=5), 5)
+
+
+class TickLockTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, '.bot_tick.lock')
+
+    def test_lock_is_exclusive(self):
+        first, second = TickLock(self.path), TickLock(self.path)
+        self.assertTrue(first.try_acquire())
+        self.assertFalse(second.try_acquire())
+        first.release()
+        self.assertTrue(second.try_acquire())
+        second.release()
+
+    def test_pending_ticks_are_counted_once(self):
+        lock = TickLock(self.path)
+        self.assertEqual(lock.pop_pending(), 0)
+        lock.mark_pending()
+        lock.mark_pending()
+        self.assertEqual(lock.pop_pending(), 2)
+        self.assertEqual(lock.pop_pending(), 0)
+
+
+class TickMetricsTest(unittest.TestCase):
+
+    def test_accumulates_across_runs(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, '.bot_metrics.json')
+        deadline = mock.Mock(budget=50)
+        deadline.elapsed.return_value = 25
+
+        TickMetrics(path).record_tick(deadline, False, 0, 0, 0, {'vip': (2, 1.0, 0.75)})
+        metrics = TickMetrics(path)
+        deadline.elapsed.return_value = 50
+        metrics.record_tick(deadline, True, 1, 3, 2, {'vip': (1, 0.5, 0.5)})
+
+        self.assertEqual(metrics.data['ticks'], 2)
+        self.assertEqual(metrics.data['budget_exceeded'], 1)
+        self.assertEqual(metrics.data['coalesced_ticks'], 2)
+        self.assertEqual(metrics.data['deferred_notifications'], 3)
+        self.assertEqual(metrics.data['max_usage'], 1.0)
+        self.assertEqual(metrics.average_usage(), 0.75)
+        self.assertEqual(metrics.data['lanes']['vip'],
+                         {'sent': 3, 'total_delay': 1.5, 'max_delay': 0.75, 'last_max_delay': 0.5})
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['ticks'], 2)
+
+
+class BotDeadlineTest(unittest.TestCase):
+
+    def harness(self) -> BotHarness:
+        harness = BotHarness()
+        self.addCleanup(harness.close)
+        return harness
+
+    def test_tick_during_running_tick_is_coalesced(self):
+        h = self.harness()
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(1))
+
+        running = TickLock(h.bot.tick_lock.path)
+        self.assertTrue(running.try_acquire())
+        self.assertEqual(h.tick(), [])
+        running.release()
+
+        # 다음 틱이 끝난 뒤 건너뛴 틱을 한 번 더 실행
+        self.assertEqual(names_in(h.tick()), ['김철수'])
+        guest_requests = [path for _, path, _ in h.luma.requests if path.endswith('/guests')]
+        self.assertEqual(len(guest_requests), 2)
+        self.assertEqual(h.bot.tick_metrics.data['coalesced_ticks'], 1)
+
+    def test_exhausted_budget_defers_event(self):
+        h = self.harness()
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(1))
+
+        h.bot.tick_budget_seconds = 0
+        self.assertEqual(h.tick(), [])
+        self.assertEqual(h.bot.tick_metrics.data['budget_exceeded'], 1)
+
+        h.bot.tick_budget_seconds = 50
+        h.advance(5)
+        self.assertEqual(names_in(h.tick()), ['김철수'])
+
+
+class SchedulerBudgetTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cwd = os.getcwd()
+        os.chdir(directory.name)
+        self.addCleanup(os.chdir, cwd)
+        environ = mock.patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        os.environ.pop('TICK_BUDGET_SECONDS', None)
+
+    def run_bot(self):
+        with mock.patch('scheduler.subprocess.run') as run, mock.patch('scheduler.time.time', return_value=1000.0):
+            run.return_value.returncode = 0
+            run.return_value.stdout = ''
+            scheduler.run_bot()
+        kwargs = run.call_args.kwargs
+        return float(kwargs['env']['TICK_DEADLINE']) - 1000.0, kwargs['timeout']
+
+    def test_budget_from_env_file(self):
+        self.assertEqual(self.run_bot(), (50.0, 50.0 + scheduler.KILL_GRACE_SECONDS))
+        with open('.env', 'w') as f:
+            f.write("TICK_BUDGET_SECONDS=20\n")
+        self.assertEqual(self.run_bot(), (20.0, 20.0 + scheduler.KILL_GRACE_SECONDS))
+        # 봇과 마찬가지로 프로세스 환경 변수가 .env보다 우선
+        os.environ['TICK_BUDGET_SECONDS'] = '40'
+        self.assertEqual(self.run_bot(), (40.0, 40.0 + scheduler.KILL_GRACE_SECONDS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+채팅방별 병렬 전송 테스트
+
+사용법:
+    python -m unittest test_delivery
+"""
+
+import logging
+import threading
+import unittest
+
+from delivery import LANE_REGULAR, LANE_SUMMARY, LANE_VIP, LaneMetrics, Notification, deliver_per_chat, prioritize
+from test_run_check import BotHarness, names_in
+
+
+class DeliverPerChatTest(unittest.TestCase):
+
+    def test_deferred_items_are_returned_per_chat(self):
+        sent = []
+
+        def send_batch(chat_id, items):
+            # 채팅방마다 첫 항목만 보내고 나머지는 미룸
+            sent.append((chat_id, items[0]))
+            return items[1:]
+
+        deferred = deliver_per_chat({'-1': ['a', 'b'], '-2': ['c'], '-3': []}, send_batch)
+        self.assertEqual(sorted(sent), [('-1', 'a'), ('-2', 'c')])
+        self.assertEqual(deferred, {'-1': ['b'], '-2': []})
+
+    def test_failed_chat_is_deferred_without_blocking_others(self):
+        def send_batch(chat_id, items):
+            if chat_id == '-1':
+                raise RuntimeError("전송 실패")
+            return []
+
+        with self.assertLogs('delivery', level=logging.ERROR):
+            deferred = deliver_per_chat({'-1': ['a', 'b'], '-2': ['c']}, send_batch)
+        self.assertEqual(deferred, {'-1': ['a', 'b'], '-2': []})
+
+        with self.assertLogs('delivery', level=logging.ERROR):
+            deferred = deliver_per_chat({'-1': ['a']}, send_batch)
+        self.assertEqual(deferred, {'-1': ['a']})
+
+    def test_chats_are_sent_concurrently(self):
+        # 모든 채팅방 작업이 동시에 실행 중이어야 통과하는 장벽
+        barrier = threading.Barrier(3, timeout=5)
+
+        def send_batch(chat_id, items):
+            barrier.wait()
+            return []
+
+        deferred = deliver_per_chat({'-1': ['a'], '-2': ['b'], '-3': ['c']}, send_batch, max_workers=3)
+        self.assertEqual(deferred, {'-1': [], '-2': [], '-3': []})
+
+
+
+class LaneTest(unittest.TestCase):
+
+    def test_prioritize_keeps_order_within_lane(self):
+        items = [
+            Notification([], 'summary', LANE_SUMMARY, 0.0),
+            Notification([], 'regular-1', LANE_REGULAR, 0.0),
+            Notification([], 'vip', LANE_VIP, 0.0),
+            Notification([], 'regular-2', LANE_REGULAR, 0.0),
+        ]
+        self.assertEqual([item.message for item in prioritize(items)], ['vip', 'regular-1', 'regular-2', 'summary'])
+
+    def test_lane_metrics(self):
+        metrics = LaneMetrics()
+        metrics.record(LANE_VIP, sent_at=10.5, queued_at=10.0)
+        metrics.record(LANE_VIP, sent_at=11.5, queued_at=10.0)
+        metrics.record(LANE_REGULAR, sent_at=9.0, queued_at=10.0)
+        self.assertEqual(metrics.snapshot(), {'vip': [2, 2.0, 1.5], 'regular': [1, 0.0, 0.0]})
+        self.assertEqual(metrics.format(), "vip 2건 평균 1.00초 최대 1.50초, regular 1건 평균 0.00초 최대 0.00초")
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_vip_is_sent_before_regular_when_budget_runs_out(self):
+        h = BotHarness({'VIP_GUESTS': '김대표'})
+        self.addCleanup(h.close)
+        h.luma.add_event('evt-1', '데모 데이')
+        for number in range(3):
+            h.luma.add_guest('evt-1', f'g{number}', f'참석자{number}', checked_in_at=h.ago(1))
+        h.luma.add_guest('evt-1', 'vip', '김대표', checked_in_at=h.ago(1))
+
+        # 첫 알림을 보낸 뒤 예산이 바닥나면 나머지는 다음 틱으로 (VIP가 먼저 나감)
+        send_message = h.bot.telegram_bot.send_message
+
+        def send_then_expire(*args, **kwargs):
+            result = send_message(*args, **kwargs)
+            h.bot.deadline.expires_at = 0
+            return result
+
+        h.bot.telegram_bot.send_message = send_then_expire
+        self.assertEqual(names_in(h.tick()), ['김대표'])
+
+        h.bot.telegram_bot.send_message = send_message
+        h.advance(1)
+        self.assertEqual(names_in(h.tick()), ['참석자0', '참석자1', '참석자2'])
+        lanes = h.bot.tick_metrics.data['lanes']
+        self.assertEqual((lanes['vip']['sent'], lanes['regular']['sent']), (1, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
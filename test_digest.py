@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+체크인 다이제스트 대기열과 요약 메시지 테스트
+
+사용법:
+    python -m unittest test_digest
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+from digest import MAX_NAMES_PER_GROUP, DigestBuffer, format_backlog, format_digest, parse_chat_modes
+
+NOW = datetime(2026, 5, 1, 10, 0, 0)
+
+
+def guest(name, ticket_type=None):
+    entry = {'api_id': name, 'name': name}
+    if ticket_type:
+        entry['ticket_type'] = ticket_type
+    return entry
+
+
+class DigestBufferTest(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = DigestBuffer(60)
+
+    def test_window_opens_with_first_entry(self):
+        self.buffer.add('-1', 'evt-1', '데모 데이', guest('김철수'), NOW)
+        self.buffer.add('-1', 'evt-1', '데모 데이', guest('이영희'), NOW + timedelta(seconds=50))
+        self.assertEqual(self.buffer.due_chats(NOW + timedelta(seconds=59)), [])
+        self.assertEqual(self.buffer.due_chats(NOW + timedelta(seconds=59), force=True), ['-1'])
+        self.assertEqual(self.buffer.due_chats(NOW + timedelta(seconds=60)), ['-1'])
+        self.assertEqual(len(self.buffer), 2)
+
+        entries = self.buffer.pop('-1')
+        self.assertEqual([entry[3] for entry in entries], ['김철수', '이영희'])
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(self.buffer.pop('-1'), [])
+
+    def test_requeued_entries_are_due_first(self):
+        self.buffer.add('-1', 'evt-1', '데모 데이', guest('김철수'), NOW)
+        failed = self.buffer.pop('-1')
+        self.buffer.add('-1', 'evt-1', '데모 데이', guest('이영희'), NOW + timedelta(seconds=70))
+        self.buffer.requeue('-1', failed, NOW + timedelta(seconds=70))
+
+        self.assertEqual(self.buffer.due_chats(NOW + timedelta(seconds=70)), ['-1'])
+        self.assertEqual([entry[3] for entry in self.buffer.pop('-1')], ['김철수', '이영희'])
+
+        self.buffer.requeue('-1', [], NOW)
+        self.assertEqual(self.buffer.pending, {})
+
+
+class FormatTest(unittest.TestCase):
+
+    def test_groups_by_event_and_ticket(self):
+        buffer = DigestBuffer(60)
+        for name, ticket_type in (('김철수', 'VIP'), ('이영희', None), ('박민수', None)):
+            buffer.add('-1', 'evt-1', '데모 데이', guest(name, ticket_type), NOW)
+        message = format_digest(buffer.pop('-1'), 60)
+
+        lines = message.splitlines()
+        self.assertIn('3명', lines[0])
+        self.assertIn('📅 <b>이벤트:</b> 데모 데이', lines)
+        # 인원이 많은 티켓 종류가 먼저
+        self.assertEqual(lines[3], '🏷️ <b>일반</b> (2명): 이영희, 박민수')
+        self.assertEqual(lines[4], '🏷️ <b>VIP</b> (1명): 김철수')
+
+    def test_long_groups_are_truncated(self):
+        entries = [('evt-1', '데모 데이', '일반', f'참석자{number}') for number in range(MAX_NAMES_PER_GROUP + 5)]
+        message = format_backlog(entries, NOW - timedelta(hours=1), NOW)
+        self.assertIn('외 5명', message)
+        self.assertIn('(18:00 ~ 19:00 KST', message.replace('05-01 ', ''))
+
+    def test_names_are_escaped(self):
+        entries = [('evt-1', 'R&D <Day>', '<Staff>', '<b>김철수</b> & co')]
+        message = format_digest(entries, 60)
+        self.assertIn('R&amp;D &lt;Day&gt;', message)
+        self.assertIn('<b>&lt;Staff&gt;</b>', message)
+        self.assertIn('&lt;b&gt;김철수&lt;/b&gt; &amp; co', message)
+
+    def test_parse_chat_modes(self):
+        self.assertEqual(parse_chat_modes('-100:digest, -200 : individual,bad'), {'-100': 'digest', '-200': 'individual'})
+        self.assertEqual(parse_chat_modes(None), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
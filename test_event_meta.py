@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+이벤트 메타데이터 캐시 테스트
+
+사용법:
+    python -m unittest test_event_meta
+"""
+
+import os
+import json
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from event_meta import EVICT_AFTER_SECONDS, EventMetadataCache, extract_metadata, format_event_context, upcoming_events
+
+EVENT = {
+    'event': {
+        'api_id': 'evt-1',
+        'name': '데모 데이',
+        'start_at': '2026-05-01T10:00:00.000Z',
+        'end_at': '2026-05-01T12:30:00.000Z',
+        'geo_address_json': {'full_address': '서울 강남구 <본관> & 별관'},
+        'capacity': 1200,
+        'registration_questions': [{'id': 'q1', 'label': '회사명'}],
+    }
+}
+
+
+class FormatTest(unittest.TestCase):
+
+    def test_extract_and_format(self):
+        meta = extract_metadata(EVENT)
+        self.assertEqual(meta['venue'], '서울 강남구 <본관> & 별관')
+        self.assertEqual(meta['capacity'], 1200)
+        self.assertEqual(format_event_context(meta), "\n".join([
+            "📍 <b>장소:</b> 서울 강남구 &lt;본관&gt; &amp; 별관",
+            "🕒 <b>일정:</b> 05-01 19:00 ~ 21:30 KST",
+            "👥 <b>정원:</b> 1,200명",
+        ]))
+
+    def test_online_event(self):
+        meta = extract_metadata({'name': '웨비나', 'meeting_url': 'https://zoom.example'})
+        self.assertEqual(meta['venue'], '온라인')
+        self.assertEqual(format_event_context(None), "")
+
+    def test_upcoming_events(self):
+        now = datetime(2026, 5, 1, 9, 0)
+        entries = [
+            {'event': {'api_id': 'later', 'start_at': '2026-05-01T09:50:00.000Z'}},
+            {'event': {'api_id': 'soon', 'start_at': '2026-05-01T09:10:00.000Z'}},
+            {'api_id': 'edge', 'start_at': '2026-05-01T10:00:00.000Z'},
+            {'event': {'api_id': 'started', 'start_at': '2026-05-01T08:59:00.000Z'}},
+            {'event': {'api_id': 'too-late', 'start_at': '2026-05-01T10:01:00.000Z'}},
+            {'event': {'api_id': 'no-start'}},
+            {'event': {'start_at': '2026-05-01T09:30:00.000Z'}},
+        ]
+        self.assertEqual([event['api_id'] for event in upcoming_events(entries, now, 60)], ['soon', 'later', 'edge'])
+        self.assertEqual(upcoming_events(entries, now, 0), [])
+
+
+class EventMetadataCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, '.event_cache.json')
+        self.fetched = []
+        self.release = threading.Event()
+
+    def fetch(self, event_id):
+        self.fetched.append(event_id)
+        self.release.wait(5)
+        return EVENT
+
+    def test_miss_refreshes_in_background_once(self):
+        cache = EventMetadataCache(self.path, ttl_seconds=3600, fetch=self.fetch)
+        self.assertIsNone(cache.get('evt-1'))
+        self.assertIsNone(cache.get('evt-1'))
+        self.release.set()
+        cache.wait(5)
+        self.assertEqual(self.fetched, ['evt-1'])
+        self.assertEqual(cache.get('evt-1')['name'], '데모 데이')
+
+    def test_warm_start_and_stale_value(self):
+        cache = EventMetadataCache(self.path, ttl_seconds=60, fetch=None)
+        cache.put('evt-1', {'name': '이전 이름'})
+        cache.save()
+
+        # 다음 실행은 파일에서 읽은 값을 바로 쓰고, TTL이 지났으면 이전 값을 쓰는 동안 새로 고침
+        cache = EventMetadataCache(self.path, ttl_seconds=60, fetch=self.fetch)
+        self.release.set()
+        with mock.patch('event_meta.time.time', return_value=cache._entries['evt-1']['fetched_at'] + 61):
+            self.assertEqual(cache.get('evt-1'), {'name': '이전 이름'})
+        cache.wait(5)
+        self.assertEqual(cache.get('evt-1')['name'], '데모 데이')
+
+    def test_save_evicts_unused_events(self):
+        cache = EventMetadataCache(self.path, ttl_seconds=60)
+        cache.put('evt-old', {'name': '지난 행사'})
+        cache.put('evt-1', {'name': '데모 데이'})
+        cache._entries['evt-old']['used_at'] -= EVICT_AFTER_SECONDS + 1
+        cache.save()
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(list(json.load(f)), ['evt-1'])
+
+    def test_failed_fetch_keeps_cache_empty(self):
+        def fail(event_id):
+            raise RuntimeError("연결 실패")
+
+        cache = EventMetadataCache(self.path, ttl_seconds=60, fetch=fail)
+        with self.assertLogs('event_meta', level='WARNING'):
+            cache.get('evt-1')
+            cache.wait(5)
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
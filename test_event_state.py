@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+이벤트 상태, 참석자 목록 동기화 체크포인트, 워터마크 테스트
+
+사용법:
+    python -m unittest test_event_state
+"""
+
+import unittest
+from datetime import datetime
+
+from event_state import EventState, SyncCheckpoint
+from test_run_check import BotHarness, names_in
+from transport import FakeLuma
+
+NOW = datetime(2026, 5, 1, 10, 0, 0)
+
+
+class SyncCheckpointTest(unittest.TestCase):
+
+    def test_progress_and_completion(self):
+        sync = SyncCheckpoint()
+        self.assertFalse(sync.in_progress)
+        sync.seen.update(['g1', 'g2'])
+        sync.advance('2')
+        sync.ticks += 1
+        self.assertTrue(sync.in_progress)
+        self.assertEqual(sync.progress(), "2명 (페이지 1, 틱 1회)")
+
+        restored = SyncCheckpoint.from_dict(sync.to_dict())
+        self.assertEqual((restored.cursor, restored.seen, restored.pages), ('2', {'g1', 'g2'}, 1))
+
+        restored.seen.update(['g3', 'g4'])
+        restored.advance(None)
+        restored.complete(NOW)
+        self.assertEqual(restored.last_total, 4)
+        self.assertEqual(restored.last_completed_at, NOW.isoformat())
+        self.assertEqual((restored.seen, restored.pages, restored.ticks), (set(), 0, 0))
+
+        restored.seen.add('g1')
+        self.assertIn("이전 전체 4명 기준 25%", restored.progress())
+
+
+class EventStateTest(unittest.TestCase):
+
+    def test_watermark_prunes_notified(self):
+        state = EventState('evt-1')
+        state.notified = {'g1': '2026-05-01T09:50:00Z', 'g2': '2026-05-01T09:58:00Z'}
+        state.advance_watermark('2026-05-01T09:55:00Z')
+        self.assertEqual(state.notified, {'g2': '2026-05-01T09:58:00Z'})
+        # 워터마크는 뒤로 가지 않음
+        state.advance_watermark('2026-05-01T09:00:00Z')
+        self.assertEqual(state.watermark, '2026-05-01T09:55:00Z')
+
+    def test_round_trip(self):
+        state = EventState('evt-1')
+        state.guest_index.apply([{'api_id': 'g1', 'checkin_info': {'checked_in_at': None}}])
+        state.watermark = '2026-05-01T09:55:00Z'
+        state.deferred_checkins = [{'guest': {'api_id': 'g1'}, 'chats': ['-100']}]
+        state.pending_digest = {'-100': [['evt-1', '데모 데이', '일반', '김철수']]}
+        state.sync.advance('50')
+
+        restored = EventState.from_dict(state.to_dict())
+        self.assertEqual(restored.to_dict(), state.to_dict())
+        self.assertNotIn('guests', state.to_dict(include_index=False))
+
+    def test_legacy_deferred_checkins(self):
+        restored = EventState.from_dict({'event_id': 'evt-1', 'deferred_checkins': [{'api_id': 'g1'}]})
+        self.assertEqual(restored.deferred_checkins, [{'guest': {'api_id': 'g1'}, 'chats': []}])
+
+
+class StopAfterFirstPage(FakeLuma):
+    """첫 참석자 페이지를 돌려준 뒤 봇의 틱 예산을 소진시키는 Luma"""
+
+    def __init__(self, page_size):
+        super().__init__(page_size)
+        self.bot = None
+
+    def handle(self, method, path, fields, files):
+        response = super().handle(method, path, fields, files)
+        if self.bot and path.endswith('/guests'):
+            self.bot.deadline.expires_at = 0
+            self.bot = None
+        return response
+
+
+class ResumedPaginationTest(unittest.TestCase):
+
+    def test_next_tick_resumes_from_cursor(self):
+        h = BotHarness(page_size=10)
+        self.addCleanup(h.close)
+        luma = StopAfterFirstPage(10)
+        h.luma = h.bot.luma_api.transport = luma
+        luma.add_event('evt-1', '데모 데이')
+        for number in range(25):
+            luma.add_guest('evt-1', f'g{number}', f'참석자{number}')
+        h.tick()
+
+        h.advance(5)
+        luma.check_in('evt-1', 'g3', h.ago(1))
+        luma.check_in('evt-1', 'g22', h.ago(1))
+        luma.bot = h.bot
+        h.tick()
+
+        # 다음 틱은 첫 페이지가 아니라 저장한 커서부터 이어서 조회하고, 동기화가 끝나면 두 체크인 모두 알림
+        luma.requests.clear()
+        h.advance(1)
+        names = names_in(h.tick())
+        cursors = [fields.get('pagination_cursor') for _, path, fields in luma.requests if path.endswith('/guests')]
+        self.assertEqual(cursors[0], '10')
+        self.assertEqual(sorted(names), ['참석자22', '참석자3'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+참석자 검색 인덱스와 스태프 명령 테스트
+
+사용법:
+    python -m unittest test_guest_search
+"""
+
+import time
+import unittest
+from unittest import mock
+
+from guest_search import GuestSearchIndex, choseong, normalize
+from staff_commands import MAX_COMMAND_AGE_SECONDS, CommandListener
+from test_run_check import BotHarness
+
+
+def guest(guest_id, name, email=None, checked_in_at=None, ticket_type=None):
+    entry = {'api_id': guest_id, 'name': name, 'email': email or f'{guest_id}@example.com',
+             'checkin_info': {'checked_in_at': checked_in_at}}
+    if ticket_type:
+        entry['ticket_type'] = ticket_type
+    return entry
+
+
+class GuestSearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = GuestSearchIndex()
+        self.index.update_page([
+            guest('g1', '김철수', 'chulsoo.kim@acme.io'),
+            guest('g2', '김 영희', 'younghee@example.com'),
+            guest('g3', 'John Kim', 'john@kim.dev'),
+        ])
+
+    def names(self, query):
+        return [record.name for record in self.index.search(query)]
+
+    def test_korean_names(self):
+        self.assertEqual(self.names('철수'), ['김철수'])
+        self.assertEqual(self.names('김영희'), ['김 영희'])
+        self.assertEqual(self.names('ㄱㅊㅅ'), ['김철수'])
+        # 한 글자는 토큰 접두어로
+        self.assertEqual(self.names('김'), ['김 영희', '김철수'])
+
+    def test_email_and_ranking(self):
+        self.assertEqual(self.names('acme'), ['김철수'])
+        # 토큰 일치가 부분 일치보다 먼저
+        self.assertEqual(self.names('kim'), ['John Kim', '김철수'])
+        self.assertEqual(self.names('john kim'), ['John Kim'])
+        self.assertEqual(self.names('없는사람'), [])
+        self.assertEqual(self.names('  '), [])
+
+    def test_only_changed_guests_are_reindexed(self):
+        self.assertEqual(self.index.update_page([guest('g1', '김철수', 'chulsoo.kim@acme.io')]), 0)
+        self.assertEqual(self.index.update_page([guest('g1', '김철호', 'chulsoo.kim@acme.io')]), 1)
+        self.assertEqual(self.names('철수'), [])
+        self.assertEqual(self.names('철호'), ['김철호'])
+
+        self.index.remove(['g1', 'g2', 'g3'])
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual((self.index._prefixes, self.index._ngrams), ({}, {}))
+
+    def test_normalize(self):
+        self.assertEqual(normalize('가 ABC '), '가 abc')
+        self.assertEqual(choseong('김a'), 'ㄱa')
+
+
+class CommandListenerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.replies = []
+        self.telegram = type('Bot', (), {'reply_message': lambda _, *args: self.replies.append(args)})()
+        self.listener = CommandListener(self.telegram, {'whois': lambda query, message: f"결과: {query}"}, ['-100'])
+
+    def update(self, text, chat_id=-100, age=0):
+        return {'update_id': 1, 'message': {'message_id': 7, 'chat': {'id': chat_id}, 'text': text,
+                                            'date': time.time() - age}}
+
+    def test_commands(self):
+        self.listener.handle_update(self.update('/whois@luma_bot 김철수'))
+        self.assertEqual(self.replies, [("결과: 김철수", '-100', 7)])
+
+    def test_ignored_messages(self):
+        self.listener.handle_update(self.update('김철수'))
+        self.listener.handle_update(self.update('/unknown 김철수'))
+        self.listener.handle_update(self.update('/whois 김철수', age=MAX_COMMAND_AGE_SECONDS + 1))
+        with self.assertLogs('staff_commands', level='WARNING'):
+            self.listener.handle_update(self.update('/whois 김철수', chat_id=-999))
+        self.assertEqual(self.replies, [])
+
+
+class WhoisTest(unittest.TestCase):
+
+    def test_whois_reports_checkin_status(self):
+        h = BotHarness({'STAFF_COMMANDS': '1'})
+        self.addCleanup(h.close)
+        h.bot.daemon = True
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(1))
+        h.luma.add_guest('evt-1', 'g2', '김<영희>')
+        h.tick()
+
+        reply = h.bot.whois('김')
+        self.assertIn('(2명)', reply)
+        self.assertIn('• 김철수 (일반) ✅ 18:59 체크인', reply)
+        self.assertIn('• 김&lt;영희&gt; (일반) ⬜ 미체크인', reply)
+        self.assertIn('일치하는 참석자가 없습니다', h.bot.whois('박민수'))
+        self.assertIn('사용법', h.bot.whois(''))
+
+    def run_daemon_once(self, env):
+        h = BotHarness(dict(env, STAFF_COMMANDS='1', CONFIG_RELOAD='0'))
+        self.addCleanup(h.close)
+        with mock.patch.object(h.bot, 'run_check', side_effect=KeyboardInterrupt):
+            h.bot.run_forever(60)
+        return h.bot
+
+    def test_listener_starts_without_worker_mode(self):
+        bot = self.run_daemon_once({})
+        self.assertIsNotNone(bot.command_listener)
+
+    def test_listener_is_disabled_in_worker_mode(self):
+        with self.assertLogs('luma_checkin_bot', level='WARNING') as logs:
+            bot = self.run_daemon_once({'LEASE_STORE': 'sqlite:leases.db', 'WORKER_ID': 'w1'})
+        self.assertIsNone(bot.command_listener)
+        self.assertFalse(bot.staff_commands)
+        self.assertIn('STAFF_COMMANDS', logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+참석자 인덱스 스냅샷 테스트
+
+사용법:
+    python -m unittest test_guest_snapshot
+"""
+
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from datetime import datetime
+
+from attendance_stats import AttendanceStats
+from event_state import EventStateStore
+from guest_index import GuestIndex
+from guest_snapshot import _HEADER, SNAPSHOT_VERSION, SnapshotError, read_snapshot, write_snapshot
+
+NOW = datetime(2026, 5, 1, 10, 0, 0)
+
+GUESTS = [
+    {'api_id': 'g1', 'ticket_type': 'VIP', 'checkin_info': {'checked_in_at': '2026-05-01T09:58:00.000Z'}},
+    {'api_id': 'g2', 'ticket_type': '일반', 'checkin_info': {'checked_in_at': None}},
+    {'api_id': 'g3', 'checkin_info': {'checked_in_at': None}},
+]
+
+
+def build_index():
+    guest_index = GuestIndex()
+    stats = AttendanceStats()
+    stats.apply(guest_index.apply(GUESTS))
+    return guest_index, stats
+
+
+class SnapshotFileTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'evt-1.guests')
+
+    def patch_file(self, offset: int, data: bytes):
+        with open(self.path, 'r+b') as f:
+            f.seek(offset)
+            f.write(data)
+
+    def test_round_trip(self):
+        guest_index, stats = build_index()
+        saved_at = write_snapshot(self.path, guest_index, stats, '2026-05-01T09:55:00Z')
+
+        snapshot = read_snapshot(self.path)
+        self.assertEqual(snapshot.guest_index.guests, guest_index.guests)
+        self.assertEqual(snapshot.stats.to_dict(), stats.to_dict())
+        self.assertEqual(snapshot.watermark, '2026-05-01T09:55:00Z')
+        self.assertEqual(snapshot.saved_at, saved_at)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_values_with_newlines_keep_alignment(self):
+        guest_index = GuestIndex()
+        stats = AttendanceStats()
+        stats.apply(guest_index.apply([
+            {'api_id': 'g1', 'ticket_type': 'VIP\n얼리버드', 'checkin_info': {'checked_in_at': None}},
+            {'api_id': 'g\n2', 'ticket_type': '', 'checkin_info': {'checked_in_at': '2026-05-01T09:58:00.000Z'}},
+            {'api_id': 'g3', 'ticket_type': '일반', 'checkin_info': {'checked_in_at': None}},
+        ]))
+        write_snapshot(self.path, guest_index, stats, None)
+        self.assertEqual(read_snapshot(self.path).guest_index.guests, guest_index.guests)
+
+    def test_empty_index(self):
+        write_snapshot(self.path, GuestIndex(), AttendanceStats(), None)
+        snapshot = read_snapshot(self.path)
+        self.assertEqual(snapshot.guest_index.guests, {})
+        self.assertIsNone(snapshot.watermark)
+
+    def test_missing_file(self):
+        self.assertIsNone(read_snapshot(self.path))
+
+    def test_corrupted_body_fails_crc(self):
+        write_snapshot(self.path, *build_index(), None)
+        size = os.path.getsize(self.path)
+        with open(self.path, 'rb') as f:
+            f.seek(size - 1)
+            last = f.read(1)
+        self.patch_file(size - 1, bytes([last[0] ^ 0xFF]))
+        with self.assertRaisesRegex(SnapshotError, 'CRC'):
+            read_snapshot(self.path)
+
+    def test_version_mismatch(self):
+        write_snapshot(self.path, *build_index(), None)
+        self.patch_file(4, struct.pack('<H', SNAPSHOT_VERSION + 1))
+        with self.assertRaisesRegex(SnapshotError, '버전'):
+            read_snapshot(self.path)
+
+    def test_wrong_magic_and_truncated_file(self):
+        write_snapshot(self.path, *build_index(), None)
+        with open(self.path, 'ab') as f:
+            f.write(b'x')
+        with self.assertRaisesRegex(SnapshotError, '크기'):
+            read_snapshot(self.path)
+
+        self.patch_file(0, b'JSON')
+        with self.assertRaisesRegex(SnapshotError, '스냅샷 파일이 아닙니다'):
+            read_snapshot(self.path)
+
+        with open(self.path, 'wb') as f:
+            f.write(b'LGSN')
+        with self.assertRaisesRegex(SnapshotError, '짧습니다'):
+            read_snapshot(self.path)
+
+    def test_corrupted_offsets_are_rejected(self):
+        # CRC까지 맞춰 다시 쓴 파일이라도 오프셋 표가 본문과 맞지 않으면 읽지 않음
+        write_snapshot(self.path, *build_index(), None)
+        with open(self.path, 'rb') as f:
+            data = bytearray(f.read())
+        header = list(_HEADER.unpack_from(data))
+        start = _HEADER.size + header[5]
+        data[start + 4:start + 8] = struct.pack('<I', 1)
+        body = bytes(data[_HEADER.size:])
+        header[-1] = zlib.crc32(body)
+        with open(self.path, 'wb') as f:
+            f.write(_HEADER.pack(*header) + body)
+        with self.assertRaisesRegex(SnapshotError, '오프셋'):
+            read_snapshot(self.path)
+
+
+class EventStateStoreSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def save_synced_state(self):
+        store = EventStateStore(self.directory)
+        state = store.get('evt-1')
+        state.guest_index, state.stats = build_index()
+        state.sync.complete(NOW)
+        store.save(state)
+        return state
+
+    def test_index_is_loaded_from_snapshot(self):
+        state = self.save_synced_state()
+        self.assertTrue(os.path.exists(os.path.join(self.directory, 'evt-1.guests')))
+
+        store = EventStateStore(self.directory)
+        loaded = store.get('evt-1')
+        self.assertEqual(loaded.guest_index.guests, state.guest_index.guests)
+        self.assertEqual(loaded.stats.checked_in, 1)
+        self.assertEqual(store.loaded_guests, 3)
+        self.assertIsNotNone(loaded.sync.last_completed_at)
+
+    def test_corrupted_snapshot_forces_full_sync(self):
+        self.save_synced_state()
+        path = os.path.join(self.directory, 'evt-1.guests')
+        with open(path, 'r+b') as f:
+            f.seek(4)
+            f.write(struct.pack('<H', SNAPSHOT_VERSION + 1))
+
+        store = EventStateStore(self.directory)
+        with self.assertLogs('event_state', 'WARNING'):
+            loaded = store.get('evt-1')
+        self.assertEqual(len(loaded.guest_index), 0)
+        self.assertEqual(loaded.stats.registered, 0)
+        self.assertIsNone(loaded.sync.last_completed_at)
+        self.assertEqual(store.loaded_guests, 0)
+
+    def test_unchanged_index_is_not_rewritten(self):
+        store = EventStateStore(self.directory, snapshot_interval=0)
+        state = store.get('evt-1')
+        state.guest_index, state.stats = build_index()
+        store.save(state)
+        path = os.path.join(self.directory, 'evt-1.guests')
+        written = os.stat(path).st_mtime_ns
+        os.utime(path, ns=(written - 10 ** 9, written - 10 ** 9))
+
+        state.watermark = '2026-05-01T09:55:00Z'
+        store.save(state)
+        self.assertEqual(os.stat(path).st_mtime_ns, written - 10 ** 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
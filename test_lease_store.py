@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+리스 저장소와 워커 간 이벤트 분배 테스트
+
+사용법:
+    python -m unittest test_lease_store
+"""
+
+import os
+import tempfile
+import unittest
+
+from lease_store import FileLeaseStore, LeaseManager, SQLiteLeaseStore, create_lease_store
+
+
+class LeaseStoreContract:
+    """두 백엔드가 모두 지켜야 하는 동작"""
+
+    def make_store(self, path: str):
+        raise NotImplementedError
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = self.make_store(os.path.join(directory.name, 'leases'))
+
+    def test_lease_is_exclusive_until_expiry(self):
+        token = self.store.acquire('evt-1', 'w1', ttl=10, now=100)
+        self.assertEqual(token, 1)
+        self.assertIsNone(self.store.acquire('evt-1', 'w2', ttl=10, now=105))
+        # 같은 워커가 다시 얻으면 같은 토큰으로 연장
+        self.assertEqual(self.store.acquire('evt-1', 'w1', ttl=10, now=105), 1)
+        self.assertEqual(self.store.leases(now=110), {'evt-1': 'w1'})
+
+    def test_expired_lease_gets_new_token_and_fences_old_holder(self):
+        self.store.acquire('evt-1', 'w1', ttl=10, now=100)
+        self.assertEqual(self.store.acquire('evt-1', 'w2', ttl=10, now=111), 2)
+        self.assertFalse(self.store.renew('evt-1', 'w1', 1, ttl=10, now=112))
+        self.assertTrue(self.store.renew('evt-1', 'w2', 2, ttl=10, now=112))
+
+    def test_renew_fails_after_expiry(self):
+        self.store.acquire('evt-1', 'w1', ttl=10, now=100)
+        self.assertFalse(self.store.renew('evt-1', 'w1', 1, ttl=10, now=110))
+
+    def test_release_frees_lease(self):
+        self.store.acquire('evt-1', 'w1', ttl=10, now=100)
+        self.store.release('evt-1', 'w1', 2)  # 토큰이 다르면 무시
+        self.assertEqual(self.store.leases(now=101), {'evt-1': 'w1'})
+        self.store.release('evt-1', 'w1', 1)
+        self.assertEqual(self.store.leases(now=101), {})
+        self.assertEqual(self.store.acquire('evt-1', 'w2', ttl=10, now=101), 2)
+
+    def test_live_workers(self):
+        self.store.heartbeat('w2', ttl=10, now=100)
+        self.store.heartbeat('w1', ttl=5, now=100)
+        self.assertEqual(self.store.live_workers(now=103), ['w1', 'w2'])
+        self.assertEqual(self.store.live_workers(now=106), ['w2'])
+
+
+class SQLiteLeaseStoreTest(LeaseStoreContract, unittest.TestCase):
+
+    def make_store(self, path):
+        return SQLiteLeaseStore(path + '.db')
+
+
+class FileLeaseStoreTest(LeaseStoreContract, unittest.TestCase):
+
+    def make_store(self, path):
+        return FileLeaseStore(path + '.json')
+
+
+class LeaseManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = SQLiteLeaseStore(os.path.join(directory.name, 'leases.db'))
+
+    def test_workers_split_events(self):
+        events = ['evt-1', 'evt-2', 'evt-3', 'evt-4']
+        first = LeaseManager(self.store, 'w1', ttl=60)
+        second = LeaseManager(self.store, 'w2', ttl=60)
+        self.store.heartbeat('w2', ttl=60)
+
+        owned_first = first.claim(events)
+        owned_second = second.claim(events)
+        self.assertEqual(len(owned_first), 2)
+        self.assertEqual(sorted(owned_first + owned_second), events)
+
+    def test_joining_worker_gets_share_after_rebalance(self):
+        events = ['evt-1', 'evt-2']
+        first = LeaseManager(self.store, 'w1', ttl=60)
+        self.assertEqual(first.claim(events), events)
+
+        second = LeaseManager(self.store, 'w2', ttl=60)
+        self.assertEqual(second.claim(events), [])
+        # 다음 틱에 w1이 초과분을 반납하면 w2가 가져감
+        self.assertEqual(len(first.claim(events)), 1)
+        self.assertEqual(len(second.claim(events)), 1)
+
+    def test_ended_events_are_released(self):
+        manager = LeaseManager(self.store, 'w1', ttl=60)
+        manager.claim(['evt-1', 'evt-2'])
+        manager.claim(['evt-2'])
+        self.assertEqual(set(manager.held), {'evt-2'})
+        self.assertEqual(self.store.leases(), {'evt-2': 'w1'})
+
+    def test_lost_lease_is_detected(self):
+        manager = LeaseManager(self.store, 'w1', ttl=60)
+        manager.claim(['evt-1'])
+        self.store.release('evt-1', 'w1', manager.held['evt-1'])
+        self.store.acquire('evt-1', 'w2', ttl=60)
+        self.assertFalse(manager.still_holds('evt-1'))
+        self.assertNotIn('evt-1', manager.held)
+
+
+class CreateLeaseStoreTest(unittest.TestCase):
+
+    def test_invalid_specs(self):
+        with self.assertRaises(ValueError):
+            create_lease_store('leases.db')
+        with self.assertRaises(ValueError):
+            create_lease_store('redis:leases')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+설정 파일 실시간 반영 테스트
+
+사용법:
+    python -m unittest test_live_config
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from live_config import ConfigWatcher, LiveSettings
+
+BASE = (
+    "LUMA_API_KEY=key\n"
+    "TELEGRAM_BOT_TOKEN=token\n"
+    "TELEGRAM_CHAT_ID=-100\n"
+    "VIP_GUESTS=김대표\n"
+    "ROUTING_RULES=vip=-200;default=-100\n"
+)
+
+
+class LiveSettingsTest(unittest.TestCase):
+
+    def test_compiled_values(self):
+        settings = LiveSettings({'VIP_GUESTS': '김대표, 이사', 'DELIVERY_MODE': 'digest'}, '-100')
+        self.assertEqual(settings.vip_index, frozenset(['김대표', '이사']))
+        self.assertEqual(settings.delivery_mode, 'digest')
+        self.assertEqual(settings.router.chats(), ['-100'])
+
+    def test_invalid_values(self):
+        with self.assertRaises(ValueError):
+            LiveSettings({'DELIVERY_MODE': 'batch'}, '-100')
+        with self.assertRaises(ValueError):
+            LiveSettings({'BULK_SUMMARY_THRESHOLD': 'many'}, '-100')
+
+    def test_describe_changes(self):
+        old = LiveSettings({'VIP_GUESTS': '김대표'}, '-100')
+        new = LiveSettings({'VIP_GUESTS': '이사', 'MENTION_USERS': '@manager'}, '-100')
+        self.assertEqual(new.describe_changes(old), [
+            "VIP_GUESTS: 1명 -> 1명 (추가: 이사, 제외: 김대표)",
+            "MENTION_USERS: '' -> '@manager'",
+        ])
+
+
+class ConfigWatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.env_file = os.path.join(directory.name, '.env')
+        self.write(BASE)
+        patcher = mock.patch.dict(os.environ, {}, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.watcher = ConfigWatcher(self.env_file)
+        self.mtime = os.stat(self.env_file).st_mtime_ns
+
+    def write(self, text):
+        with open(self.env_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def touch(self):
+        # 같은 크기로 바뀌어도 수정 시각으로 감지되도록
+        self.mtime += 10 ** 9
+        os.utime(self.env_file, ns=(self.mtime, self.mtime))
+
+    def test_unchanged_file_is_not_read(self):
+        with mock.patch('builtins.open') as opened:
+            self.assertIsNone(self.watcher.poll())
+        opened.assert_not_called()
+
+    def test_changed_file_returns_reloadable_values(self):
+        self.write(BASE.replace('김대표', '홍길동') + "LUMA_API_KEY=new-key\n")
+        self.touch()
+        with self.assertLogs('live_config', level='WARNING') as logs:
+            values = self.watcher.poll()
+        self.assertEqual(values, {'VIP_GUESTS': '홍길동', 'ROUTING_RULES': 'vip=-200;default=-100'})
+        self.assertIn('LUMA_API_KEY', logs.output[0])
+        self.assertIsNone(self.watcher.poll())
+
+    def test_missing_file_keeps_settings(self):
+        os.remove(self.env_file)
+        self.assertIsNone(self.watcher.poll())
+        self.write(BASE.replace('김대표', '홍길동'))
+        self.touch()
+        self.assertEqual(self.watcher.poll()['VIP_GUESTS'], '홍길동')
+
+    def test_unparsable_file_is_ignored_until_fixed(self):
+        self.write(BASE + 'VIP_GUESTS="홍길동\n')
+        self.touch()
+        with self.assertLogs('live_config', level='ERROR'):
+            self.assertIsNone(self.watcher.poll())
+        # 같은 파일에 대해서는 다시 읽지 않음
+        with mock.patch('builtins.open') as opened:
+            self.assertIsNone(self.watcher.poll())
+        opened.assert_not_called()
+
+        self.write(BASE + 'VIP_GUESTS="홍길동"\n')
+        self.touch()
+        self.assertEqual(self.watcher.poll()['VIP_GUESTS'], '홍길동')
+
+    def test_half_written_file_is_ignored(self):
+        self.write("LUMA_API_KEY=key\nVIP_GUESTS=\n")
+        self.touch()
+        with self.assertLogs('live_config', level='ERROR') as logs:
+            self.assertIsNone(self.watcher.poll())
+        self.assertIn('TELEGRAM_BOT_TOKEN', logs.output[0])
+
+        self.write("")
+        self.touch()
+        with self.assertLogs('live_config', level='ERROR'):
+            self.assertIsNone(self.watcher.poll())
+
+    def test_file_changing_while_read_is_retried(self):
+        stats = iter([(1, 1), (2, 2)])
+        with mock.patch.object(self.watcher, '_stat', side_effect=lambda: next(stats)):
+            self.assertIsNone(self.watcher.poll())
+        self.assertIsNone(self.watcher._rejected)
+
+    def test_shell_overrides_win(self):
+        with mock.patch.dict(os.environ, {'VIP_GUESTS': '셸 지정'}):
+            watcher = ConfigWatcher(self.env_file)
+        self.write(BASE.replace('김대표', '홍길동'))
+        self.touch()
+        self.assertEqual(watcher.poll()['VIP_GUESTS'], '셸 지정')
+
+
+if __name__ == "__main__":
+    unittest.main()
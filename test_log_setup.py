@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+비동기 로깅 파이프라인 테스트
+
+사용법:
+    python -m unittest test_log_setup
+"""
+
+import os
+import json
+import logging
+import tempfile
+import unittest
+from unittest import mock
+
+import log_setup
+from log_setup import JsonFormatter, TickIdFilter, current_tick_id, new_tick_id, setup_logging, shutdown_logging
+
+
+class TickIdTest(unittest.TestCase):
+
+    def test_new_tick_id(self):
+        self.assertEqual(new_tick_id('abc123'), 'abc123')
+        self.assertEqual(current_tick_id(), 'abc123')
+        generated = new_tick_id()
+        self.assertEqual(len(generated), 12)
+        self.assertEqual(current_tick_id(), generated)
+
+    def test_filter_keeps_explicit_tick_id(self):
+        new_tick_id('current')
+        record = logging.LogRecord('bot', logging.INFO, __file__, 1, "메시지", None, None)
+        TickIdFilter().filter(record)
+        self.assertEqual(record.tick_id, 'current')
+
+        record = logging.LogRecord('bot', logging.INFO, __file__, 1, "메시지", None, None)
+        record.tick_id = 'scheduler'
+        TickIdFilter().filter(record)
+        self.assertEqual(record.tick_id, 'scheduler')
+
+
+class JsonFormatterTest(unittest.TestCase):
+
+    def test_format(self):
+        record = logging.LogRecord('bot', logging.WARNING, __file__, 1, "참석자 %s명", (3,), None)
+        record.tick_id = 'tick-1'
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertEqual(entry['level'], 'WARNING')
+        self.assertEqual(entry['tick_id'], 'tick-1')
+        self.assertEqual(entry['message'], "참석자 3명")
+        self.assertTrue(entry['ts'].endswith('+00:00'))
+
+
+class SetupLoggingTest(unittest.TestCase):
+
+    def setUp(self):
+        root = logging.getLogger()
+        self.addCleanup(setattr, root, 'handlers', list(root.handlers))
+        self.addCleanup(root.setLevel, root.level)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.log_file = os.path.join(directory.name, 'bot.log')
+
+    def test_json_records_are_written_by_listener(self):
+        with mock.patch.dict(os.environ, {'LOG_FORMAT': 'json'}), mock.patch('sys.stdout'):
+            setup_logging(self.log_file, level='INFO')
+            self.addCleanup(shutdown_logging)
+            new_tick_id('tick-42')
+            logging.getLogger('bot').info("체크인 %s건", 5)
+            logging.getLogger('bot').debug("기록되지 않음")
+            shutdown_logging()
+
+        with open(self.log_file, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([entry['message'] for entry in entries], ["체크인 5건"])
+        self.assertEqual(entries[0]['tick_id'], 'tick-42')
+        self.assertIsNone(log_setup._listener)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+메모리 진단 테스트
+
+사용법:
+    python -m unittest test_memory_diag
+"""
+
+import unittest
+from collections import deque
+from unittest import mock
+
+from memory_diag import MemoryDiagnostics, growth_slope
+from test_run_check import BotHarness
+
+MB = 1024 * 1024
+
+
+class GrowthSlopeTest(unittest.TestCase):
+
+    def test_slope_in_mb_per_hour(self):
+        samples = deque((minute * 60, 100 * MB + minute * MB) for minute in range(10))
+        self.assertAlmostEqual(growth_slope(samples), 60.0)
+
+    def test_flat_and_short_samples(self):
+        self.assertEqual(growth_slope(deque()), 0.0)
+        self.assertEqual(growth_slope(deque([(0, MB)])), 0.0)
+        self.assertEqual(growth_slope(deque([(0, MB), (0, 2 * MB)])), 0.0)
+        self.assertEqual(growth_slope(deque([(0, MB), (60, MB)])), 0.0)
+
+
+class MemoryDiagnosticsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = [0.0]
+        self.rss = [100 * MB]
+        for target, value in (('memory_diag.time.monotonic', lambda: self.clock[0]),
+                              ('memory_diag.current_rss', lambda: self.rss[0])):
+            patcher = mock.patch(target, side_effect=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_ticks(self, diagnostics, minutes: int, mb_per_minute: float):
+        """1분마다 틱 하나, RSS는 mb_per_minute씩 증가"""
+        for _ in range(minutes):
+            self.clock[0] += 60
+            self.rss[0] += int(mb_per_minute * MB)
+            diagnostics.tick({})
+
+    def test_logs_every_interval(self):
+        diagnostics = MemoryDiagnostics(interval_ticks=3)
+        with self.assertLogs('memory_diag', 'INFO') as logs:
+            for _ in range(7):
+                diagnostics.tick({'참석자 인덱스': 10})
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn("메모리 진단 (틱 3)", logs.output[0])
+        self.assertIn("메모리 진단 (틱 6)", logs.output[1])
+
+    def test_size_changes(self):
+        diagnostics = MemoryDiagnostics(interval_ticks=1)
+        with self.assertLogs('memory_diag', 'INFO') as logs:
+            diagnostics.tick({'참석자 인덱스': 1000, '사진 다운로드 대기': 3})
+            diagnostics.tick({'참석자 인덱스': 1500, '사진 다운로드 대기': 1})
+        self.assertIn("참석자 인덱스: 1,000 (+0)", logs.output[0])
+        self.assertIn("참석자 인덱스: 1,500 (+500)", logs.output[1])
+        self.assertIn("사진 다운로드 대기: 1 (-2)", logs.output[1])
+
+    def test_warns_only_after_window_coverage(self):
+        diagnostics = MemoryDiagnostics(interval_ticks=1, warn_mb_per_hour=20, window_minutes=60)
+        # 시작 직후에는 기울기가 커도 관찰 기간이 창의 절반이 될 때까지 경고하지 않음
+        with self.assertLogs('memory_diag', 'INFO') as logs:
+            self.run_ticks(diagnostics, 29, 1)
+        self.assertFalse([record for record in logs.records if record.levelname == 'WARNING'])
+
+        with self.assertLogs('memory_diag', 'WARNING') as logs:
+            self.run_ticks(diagnostics, 2, 1)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("+60.0MB/시간", logs.output[0])
+
+    def test_warning_is_repeated_once_per_window(self):
+        diagnostics = MemoryDiagnostics(interval_ticks=1, warn_mb_per_hour=20, window_minutes=60)
+        with self.assertLogs('memory_diag', 'INFO') as logs:
+            self.run_ticks(diagnostics, 160, 1)
+        warnings = [record for record in logs.records if record.levelname == 'WARNING']
+        self.assertEqual(len(warnings), 3)
+
+    def test_steady_memory_does_not_warn(self):
+        diagnostics = MemoryDiagnostics(interval_ticks=1, warn_mb_per_hour=20, window_minutes=60)
+        with self.assertLogs('memory_diag', 'INFO') as logs:
+            self.run_ticks(diagnostics, 90, 0)
+        self.assertFalse([record for record in logs.records if record.levelname == 'WARNING'])
+        self.assertIn("증가 기울기 +0.0MB/시간", logs.output[-1])
+
+
+class MemoryStructuresTest(unittest.TestCase):
+
+    def test_optional_components_are_included(self):
+        h = BotHarness({'SEND_PHOTOS': '1', 'LEASE_STORE': 'sqlite:leases.db', 'WORKER_ID': 'w1'})
+        self.addCleanup(h.close)
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(1))
+        h.tick()
+
+        sizes = h.bot.memory_structures()
+        self.assertEqual(sizes['이벤트 상태'], 1)
+        self.assertEqual(sizes['참석자 인덱스'], 1)
+        self.assertEqual(sizes['보유 중인 리스'], 1)
+        self.assertEqual(sizes['사진 다운로드 대기'], 0)
+        self.assertEqual(sizes['사진 전송 중 URL 잠금'], 0)
+        self.assertIn('현황판 최근 도착/VIP', sizes)
+        self.assertIn('채팅방별 전송 간격', sizes)
+
+    def test_optional_components_are_omitted(self):
+        h = BotHarness()
+        self.addCleanup(h.close)
+        sizes = h.bot.memory_structures()
+        self.assertNotIn('보유 중인 리스', sizes)
+        self.assertNotIn('사진 다운로드 대기', sizes)
+        self.assertNotIn('스태프 명령 허용 채팅방', sizes)
+        self.assertEqual(sizes['시작 전 이벤트 목록'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+참석자 사진 전송과 file_id 캐시 테스트
+
+사용법:
+    python -m unittest test_photo
+"""
+
+import os
+import json
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from luma_checkin_bot import TelegramBot
+from photo import MAX_IMAGE_BYTES, FileIdCache, PhotoSender, guest_avatar_url
+from test_run_check import BotHarness
+from transport import FakeTelegram, Response, Transport, TransportError
+
+
+class FakeImages(Transport):
+    """URL별 이미지 바이트를 돌려주는 전송 (release 전까지 응답을 보류할 수 있음)"""
+
+    def __init__(self, images):
+        self.images = images
+        self.requests = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def request(self, method, url, params=None, data=None, files=None, headers=None, timeout=None):
+        self.requests.append(url)
+        self.release.wait(5)
+        if url not in self.images:
+            raise TransportError(f"연결 실패: {url}")
+        return Response(200, self.images[url], url)
+
+
+class FileIdCacheTest(unittest.TestCase):
+
+    def test_lru_and_persistence(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, '.photo_cache.json')
+
+        cache = FileIdCache(path, capacity=2)
+        cache.put('a', 'file-a')
+        cache.put('b', 'file-b')
+        self.assertEqual(cache.get('a'), 'file-a')
+        cache.put('c', 'file-c')
+        self.assertIsNone(cache.get('b'))
+        cache.save()
+
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(list(json.load(f)), ['a', 'c'])
+        self.assertEqual(len(FileIdCache(path, capacity=2)), 2)
+
+
+class PhotoSenderTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = FileIdCache(os.path.join(directory.name, '.photo_cache.json'))
+        self.images = FakeImages({
+            'https://img/a.jpg': b'a' * 100,
+            'https://img/b.jpg': b'b' * 100,
+            'https://img/huge.jpg': b'x' * (MAX_IMAGE_BYTES + 1),
+        })
+        self.sender = PhotoSender(self.cache, transport=self.images)
+        self.addCleanup(self.sender._pool.shutdown)
+        self.telegram = FakeTelegram()
+        self.bot = TelegramBot('token', '-100', transport=self.telegram)
+
+    def test_uploaded_photo_is_reused(self):
+        self.sender.prefetch('https://img/a.jpg')
+        self.assertTrue(self.sender.send(self.bot, '-1', 'https://img/a.jpg', '김철수', timeout=5))
+        self.assertTrue(self.sender.send(self.bot, '-2', 'https://img/a.jpg', '김철수', timeout=5))
+
+        self.assertEqual(self.images.requests, ['https://img/a.jpg'])
+        uploads = [fields for _, path, fields in self.telegram.requests if 'photo' not in fields]
+        self.assertEqual(len(uploads), 1)
+        self.assertIsNotNone(self.cache.get('https://img/a.jpg'))
+        # 전송이 끝나면 다운로드와 URL 잠금을 남기지 않음
+        self.assertEqual((self.sender.pending_downloads(), self.sender.sending_urls()), (0, 0))
+
+    def test_failed_or_oversized_downloads_are_skipped(self):
+        self.assertFalse(self.sender.send(self.bot, '-1', 'https://img/missing.jpg', '김철수', timeout=5))
+        self.assertFalse(self.sender.send(self.bot, '-1', 'https://img/huge.jpg', '김철수', timeout=5))
+        self.assertEqual(self.telegram.sent, [])
+        self.assertEqual((self.sender.pending_downloads(), self.sender.sending_urls()), (0, 0))
+
+    def test_slow_download_is_kept_until_it_expires(self):
+        self.images.release.clear()
+        self.assertFalse(self.sender.send(self.bot, '-1', 'https://img/a.jpg', '김철수', timeout=0.01))
+        self.assertEqual((self.sender.pending_downloads(), self.sender.sending_urls()), (1, 0))
+        self.images.release.set()
+
+        # 보관 시간이 지나면 다음 미리 받기 때 버림
+        with mock.patch('photo.time.monotonic', return_value=10 ** 9):
+            self.sender.prefetch('https://img/b.jpg')
+        self.assertEqual(list(self.sender._downloads), ['https://img/b.jpg'])
+
+    def test_unsent_downloads_are_capped(self):
+        sender = PhotoSender(self.cache, transport=self.images, max_pending=2)
+        self.addCleanup(sender._pool.shutdown)
+        for name in ('a', 'b', 'huge'):
+            sender.prefetch(f'https://img/{name}.jpg')
+        self.assertEqual(list(sender._downloads), ['https://img/b.jpg', 'https://img/huge.jpg'])
+
+
+class BotPhotoTest(unittest.TestCase):
+
+    def test_caption_escapes_guest_name(self):
+        h = BotHarness({'SEND_PHOTOS': '1'})
+        self.addCleanup(h.close)
+        h.bot.photo_sender.transport = FakeImages({'https://img/a.jpg': b'a' * 100})
+        self.addCleanup(h.bot.photo_sender._pool.shutdown)
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', 'A<B & C', checked_in_at=h.ago(1), avatar_url='https://img/a.jpg')
+
+        h.tick()
+        photos = [entry['photo'] for entry in h.telegram.sent if 'photo' in entry]
+        self.assertEqual(photos, ["👤 <b>A&lt;B &amp; C</b>"])
+
+
+class GuestAvatarUrlTest(unittest.TestCase):
+
+    def test_fields(self):
+        self.assertEqual(guest_avatar_url({'user_avatar_url': 'u'}), 'u')
+        self.assertEqual(guest_avatar_url({'avatar_url': 'a', 'user_avatar_url': 'u'}), 'a')
+        self.assertIsNone(guest_avatar_url({'avatar_url': ''}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Luma API 요청 예산(토큰 버킷) 테스트
+
+사용법:
+    python -m unittest test_rate_limit
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from deadline import Deadline, RequestBudgetExceeded
+from rate_limit import (
+    FileTokenBucketStore, MemoryTokenBucketStore, RequestGovernor, SQLiteTokenBucketStore, create_bucket_store,
+)
+
+
+class BucketStoreContract:
+    """세 백엔드가 모두 지켜야 하는 동작 (rate는 초당 토큰 수)"""
+
+    def make_store(self, path: str):
+        raise NotImplementedError
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = self.make_store(os.path.join(directory.name, 'rate'))
+
+    def test_new_bucket_starts_full(self):
+        self.assertEqual(self.store.take('k', 1, 3, 1, now=100), (True, 2))
+        self.assertEqual(self.store.take('k', 1, 3, 2, now=100), (True, 0))
+        self.assertEqual(self.store.take('k', 1, 3, 1, now=100), (False, 0))
+
+    def test_refill_is_capped_at_burst(self):
+        self.store.take('k', 1, 3, 3, now=100)
+        self.assertEqual(self.store.take('k', 1, 3, 0, now=101.5), (True, 1.5))
+        self.assertEqual(self.store.take('k', 1, 3, 0, now=200), (True, 3))
+
+    def test_peek_does_not_consume(self):
+        self.store.take('k', 1, 3, 2, now=100)
+        self.store.take('k', 1, 3, 0, now=100)
+        self.assertEqual(self.store.take('k', 1, 3, 0, now=100), (True, 1))
+
+    def test_denied_take_keeps_tokens(self):
+        self.store.take('k', 1, 2, 2, now=100)
+        self.assertFalse(self.store.take('k', 1, 2, 1, now=100.5)[0])
+        # 거절된 요청이 갱신 시각을 당기지 않으므로 1초 뒤에는 토큰 하나가 참
+        self.assertEqual(self.store.take('k', 1, 2, 1, now=101), (True, 0))
+
+    def test_keys_are_independent(self):
+        self.store.take('a', 1, 2, 2, now=100)
+        self.assertEqual(self.store.take('b', 1, 2, 1, now=100), (True, 1))
+
+
+class SQLiteBucketStoreTest(BucketStoreContract, unittest.TestCase):
+
+    def make_store(self, path):
+        return SQLiteTokenBucketStore(path + '.db')
+
+    def test_buckets_are_shared_between_instances(self):
+        self.store.take('k', 1, 3, 3, now=100)
+        other = SQLiteTokenBucketStore(self.store.path)
+        self.assertEqual(other.take('k', 1, 3, 1, now=101), (True, 0))
+        self.assertEqual(self.store.take('k', 1, 3, 1, now=101), (False, 0))
+
+
+class FileBucketStoreTest(BucketStoreContract, unittest.TestCase):
+
+    def make_store(self, path):
+        return FileTokenBucketStore(path + '.json')
+
+    def test_buckets_are_shared_between_instances(self):
+        self.store.take('k', 1, 3, 3, now=100)
+        other = FileTokenBucketStore(self.store.path)
+        self.assertEqual(other.take('k', 1, 3, 1, now=101), (True, 0))
+        self.assertEqual(self.store.take('k', 1, 3, 1, now=101), (False, 0))
+
+
+class MemoryBucketStoreTest(BucketStoreContract, unittest.TestCase):
+
+    def make_store(self, path):
+        return MemoryTokenBucketStore()
+
+
+class CreateBucketStoreTest(unittest.TestCase):
+
+    def test_specs(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.assertIsInstance(create_bucket_store('memory'), MemoryTokenBucketStore)
+        self.assertIsInstance(create_bucket_store('sqlite:' + os.path.join(directory.name, 'rate.db')),
+                              SQLiteTokenBucketStore)
+        self.assertIsInstance(create_bucket_store('file:' + os.path.join(directory.name, 'rate.json')),
+                              FileTokenBucketStore)
+
+    def test_invalid_specs(self):
+        with self.assertRaises(ValueError):
+            create_bucket_store('.luma_rate.db')
+        with self.assertRaises(ValueError):
+            create_bucket_store('redis:rate')
+
+
+class RequestGovernorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = [1000.0]
+        self.sleeps = []
+        patcher = mock.patch('rate_limit.time')
+        fake_time = patcher.start()
+        self.addCleanup(patcher.stop)
+        fake_time.time.side_effect = lambda: self.clock[0]
+        fake_time.sleep.side_effect = self.sleep
+        self.governor = RequestGovernor(MemoryTokenBucketStore(), 'secret-api-key', rate_per_minute=60, burst=2)
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.clock[0] += seconds
+
+    def test_key_does_not_contain_api_key(self):
+        self.assertTrue(self.governor.key.startswith('luma:'))
+        self.assertNotIn('secret-api-key', self.governor.key)
+        other = RequestGovernor(MemoryTokenBucketStore(), 'other-key', 60, 2)
+        self.assertNotEqual(other.key, self.governor.key)
+
+    def test_acquire_waits_for_refill(self):
+        for _ in range(3):
+            self.governor.acquire('참석자 조회')
+        self.assertEqual(self.governor.requests, 3)
+        self.assertEqual(self.sleeps, [1.0])
+        self.assertEqual(self.governor.waited, 1.0)
+
+        self.governor.reset_stats()
+        self.assertEqual((self.governor.requests, self.governor.waited), (0, 0.0))
+
+    def test_acquire_gives_up_when_deadline_is_short(self):
+        self.governor.acquire('조회')
+        self.governor.acquire('조회')
+        deadline = Deadline(0.5)
+        with self.assertRaises(RequestBudgetExceeded):
+            self.governor.acquire('참석자 조회', deadline)
+        self.assertEqual(self.sleeps, [])
+
+    def test_fair_share(self):
+        self.assertEqual(self.governor.remaining(), 2)
+        self.assertEqual(self.governor.fair_share(2), 1)
+        # 예산이 모자라도 최소 1
+        self.assertEqual(self.governor.fair_share(5), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
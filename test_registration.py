@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+등록 질문 답변 표시 테스트
+
+사용법:
+    python -m unittest test_registration
+"""
+
+import unittest
+
+from registration import MAX_ANSWER_LENGTH, QuestionSchema, answer_text, parse_fields
+from test_run_check import BotHarness
+
+
+def answers(*pairs):
+    return {'registration_answers': [
+        {'question_id': key, 'label': label, 'answer': value} for key, label, value in pairs
+    ]}
+
+
+class HelperTest(unittest.TestCase):
+
+    def test_parse_fields(self):
+        self.assertEqual(parse_fields('회사명=소속; 직함 ;;LinkedIn 프로필=LinkedIn'),
+                         [('회사명', '소속'), ('직함', '직함'), ('LinkedIn 프로필', 'LinkedIn')])
+        self.assertEqual(parse_fields(None), [])
+
+    def test_answer_text(self):
+        self.assertEqual(answer_text({'answer': ['A', None, 'B']}), 'A, B')
+        self.assertEqual(answer_text({'answer': True}), '예')
+        self.assertEqual(answer_text({'value': ' 값 '}), '값')
+        self.assertEqual(answer_text({}), '')
+
+
+class QuestionSchemaTest(unittest.TestCase):
+
+    def test_all_questions_in_form_order(self):
+        schema = QuestionSchema()
+        guest = answers(('q2', '직함', '개발자'), ('q1', '회사명', 'Acme & Co'))
+        self.assertTrue(schema.learn([guest]))
+        self.assertFalse(schema.learn([guest]))
+        schema.configure([])
+        self.assertEqual(schema.format_answers(guest), "📝 <b>등록 정보:</b>\n• <b>직함:</b> 개발자\n• <b>회사명:</b> Acme &amp; Co")
+
+    def test_configured_fields_order_and_alias(self):
+        schema = QuestionSchema([('q1', '회사명'), ('q2', '직함'), ('q3', '전화번호')])
+        schema.configure(parse_fields('직함;회사명=소속'))
+        guest = answers(('q1', '회사명', 'Acme'), ('q3', '전화번호', '010'), ('q2', '직함', '개발자'))
+        self.assertEqual(schema.format_answers(guest), "📝 <b>등록 정보:</b>\n• <b>직함:</b> 개발자\n• <b>소속:</b> Acme")
+        self.assertEqual(schema.format_answers({}), "")
+
+    def test_new_question_changes_signature(self):
+        schema = QuestionSchema([('q1', '회사명')])
+        signature = schema.signature
+        schema.configure([])
+        schema.learn([answers(('q9', '새 질문', '답'))])
+        self.assertNotEqual(schema.signature, signature)
+        # 표시 설정은 다음 configure()에서 다시 계산
+        schema.configure([])
+        self.assertIn('q9', schema.display)
+
+    def test_long_answers_are_truncated(self):
+        schema = QuestionSchema()
+        guest = answers(*[(f'q{number}', f'질문{number}', '가' * 500) for number in range(20)])
+        schema.learn([guest])
+        schema.configure([])
+        message = schema.format_answers(guest)
+        self.assertIn('가' * (MAX_ANSWER_LENGTH - 1) + '…', message)
+        self.assertIn('개 항목', message.splitlines()[-1])
+
+    def test_round_trip(self):
+        schema = QuestionSchema([('q1', '회사명')])
+        restored = QuestionSchema.from_list(schema.to_list())
+        self.assertEqual((restored.questions, restored.signature), (schema.questions, schema.signature))
+        self.assertIsNone(QuestionSchema.from_event({}))
+        self.assertEqual(QuestionSchema.from_event({'registration_questions': [{'id': 'q1', 'label': '회사명'}]}).questions,
+                         [('q1', '회사명')])
+
+
+class CheckinMessageTest(unittest.TestCase):
+
+    def test_answers_are_shown_in_notification(self):
+        h = BotHarness({'REGISTRATION_FIELDS': '회사명=소속'})
+        self.addCleanup(h.close)
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(1),
+                         **answers(('q1', '회사명', 'Acme'), ('q2', '직함', '개발자')))
+        messages = h.tick()
+        self.assertEqual(len(messages), 1)
+        self.assertIn('• <b>소속:</b> Acme', messages[0])
+        self.assertNotIn('개발자', messages[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Luma 응답 기록과 오프라인 재생 테스트
+
+사용법:
+    python -m unittest test_replay
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from replay import ReplaySource, ResponseRecorder, VirtualClock, read_ticks, replay
+from test_run_check import BotHarness, names_in
+
+NOW = datetime(2026, 5, 1, 10, 0, 0)
+
+
+class ArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'records', 'luma.jsonl.gz')
+
+    def test_ticks_from_appended_runs(self):
+        # 단발성 실행마다 새 기록기가 같은 아카이브에 이어 씀
+        for tick_id in ('t1', 't2'):
+            recorder = ResponseRecorder(self.path)
+            recorder.begin_tick(tick_id, NOW, 10)
+            recorder.record('/public/v1/event', None, {'entries': []})
+            recorder.record('/public/v1/event/evt-1/guests', {'b': 2, 'a': 1}, {'entries': [tick_id]})
+
+        ticks = list(read_ticks(self.path))
+        self.assertEqual([tick['tick_id'] for tick in ticks], ['t1', 't2'])
+        self.assertEqual(ticks[0]['minutes_ago'], 10)
+        self.assertEqual([key for _, key, _ in ticks[1]['responses']],
+                         ['/public/v1/event?', '/public/v1/event/evt-1/guests?a=1&b=2'])
+
+
+class ReplaySourceTest(unittest.TestCase):
+
+    def test_responses_follow_recorded_order(self):
+        clock = VirtualClock()
+        source = ReplaySource(clock)
+        source.load_tick({'responses': [
+            ('2026-05-01T10:00:01', '/guests?cursor=', {'entries': [1]}),
+            ('2026-05-01T10:00:02', '/guests?cursor=', {'entries': [2]}),
+        ]})
+
+        self.assertEqual(source.get('https://luma/guests', params={'cursor': ''}).json(), {'entries': [1]})
+        self.assertEqual(clock.utcnow(), datetime(2026, 5, 1, 10, 0, 1))
+        # 마지막 응답은 같은 요청이 반복돼도 계속 돌려줌
+        for _ in range(2):
+            self.assertEqual(source.get('https://luma/guests', params={'cursor': ''}).json(), {'entries': [2]})
+        self.assertEqual(source.misses, 0)
+
+        self.assertEqual(source.get('https://luma/other').json(), {'entries': []})
+        self.assertEqual(source.misses, 1)
+
+    def test_clock_never_goes_back(self):
+        clock = VirtualClock()
+        clock.set('2026-05-01T10:00:05')
+        clock.set('2026-05-01T10:00:01')
+        self.assertEqual(clock.utcnow(), datetime(2026, 5, 1, 10, 0, 5))
+
+
+class RecordAndReplayTest(unittest.TestCase):
+
+    def test_replay_reproduces_notifications(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        archive = os.path.join(directory.name, 'luma.jsonl.gz')
+
+        h = BotHarness({'RECORD_FILE': archive})
+        self.addCleanup(h.close)
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(1))
+        h.luma.add_guest('evt-1', 'g2', '이영희')
+        # 응답 기록 시각도 가상 시계를 따르도록
+        with mock.patch('replay.datetime') as clock:
+            clock.utcnow.side_effect = lambda: h.now
+            recorded = h.tick(minutes_ago=10)
+            h.advance(5)
+            h.luma.check_in('evt-1', 'g2', h.ago(1))
+            recorded += h.tick(minutes_ago=10)
+        self.assertEqual(names_in(recorded), ['김철수', '이영희'])
+
+        output = os.path.join(directory.name, 'out.jsonl')
+        with mock.patch.dict(os.environ):
+            result = replay(archive, speed=0, output=output)
+        self.assertEqual(result['ticks'], 2)
+        self.assertEqual(result['notifications'], 2)
+        self.assertEqual(result['misses'], 0)
+        with open(output, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+행사 후 참석 보고서 테스트
+
+사용법:
+    python -m unittest test_report
+"""
+
+import os
+import csv
+import tempfile
+import unittest
+
+from checkin_log import CheckinLog, CheckinRecord
+from event_state import EventStateStore
+from guest_index import GuestIndex
+from report import build_report
+
+# 2026-05-01 10:00 UTC (19:00 KST)
+START = 1_777_629_600
+
+
+class ReportTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.log = CheckinLog(os.path.join(directory.name, 'checkins.d'))
+        self.store = EventStateStore(os.path.join(directory.name, 'state'))
+
+        # 등록 6명 (VIP 티켓 2명), 기록상 4명 도착
+        state = self.store.get('evt-1')
+        guests = [{'api_id': f'g{number}', 'checkin_info': {'checked_in_at': None}} for number in range(4)]
+        guests += [{'api_id': f'v{number}', 'ticket_type': 'R&D', 'checkin_info': {'checked_in_at': None}}
+                   for number in range(2)]
+        state.stats.apply(GuestIndex().apply(guests))
+        self.store.save(state)
+
+        self.log.append('evt-1', [
+            CheckinRecord(START + 30, START + 40, START + 45, 'g0', '일반', False, '김철수'),
+            CheckinRecord(START + 70, START + 80, START + 90, 'g1', '일반', False, '이영희'),
+            CheckinRecord(START + 75, START + 85, 0, 'g2', '일반', False, '박민수'),
+            CheckinRecord(START + 3000, START + 3010, START + 3020, 'v0', 'R&D', True, '<대표>'),
+            # 같은 참석자가 다시 기록되면 처음 기록만 사용
+            CheckinRecord(START + 3100, START + 3110, START + 3120, 'g0', '일반', False, '김철수'),
+        ])
+
+    def test_aggregates(self):
+        report = build_report('evt-1', self.log, self.store, {'evt-1': '데모 & 데이'})
+        self.assertEqual(report.event_name, '데모 & 데이')
+        self.assertEqual((report.registered, report.checked_in, report.logged), (6, 4, 4))
+        self.assertEqual(report.peak_minute(), (START + 60) // 60)
+        self.assertEqual(report.detect_delay_total, 40)
+        self.assertEqual(report.delivered, 3)
+        self.assertEqual(report.ticket_rows(), [['일반', 4, 3, 0.75], ['R&D', 2, 1, 0.5]])
+        self.assertEqual(report.vip_rows(['이사']), [['이사', None], ['<대표>', START + 3000]])
+
+        bucket, curve = report.curve()
+        self.assertEqual(bucket, 5)
+        self.assertEqual(sum(count for _, count in curve), 4)
+
+    def test_format_text(self):
+        text = build_report('evt-1', self.log, self.store, {'evt-1': '데모 & 데이'}).format_text(['이사'])
+        self.assertIn('📅 <b>이벤트:</b> 데모 &amp; 데이', text)
+        self.assertIn('✅ <b>참석:</b> 4 / 6명 (66.7%)', text)
+        self.assertIn('🔥 <b>가장 붐빈 1분:</b> 19:01 KST (2명)', text)
+        self.assertIn('• R&amp;D: 1 / 2명 (50.0%)', text)
+        self.assertIn('• &lt;대표&gt; (19:50)', text)
+        self.assertIn('• 미참석: 이사', text)
+        self.assertEqual(text.count('<pre>'), text.count('</pre>'))
+
+    def test_csv(self):
+        path = os.path.join(self.directory, 'reports', 'evt-1.csv')
+        build_report('evt-1', self.log, self.store).write_csv(path, [])
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ['section', 'key', 'value'])
+        self.assertIn(['summary', 'event_id', 'evt-1'], rows)
+        self.assertEqual(len([row for row in rows if row[0] == 'arrivals']), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+체크인 알림 라우팅 규칙 테스트
+
+사용법:
+    python -m unittest test_routing
+"""
+
+import unittest
+
+from routing import Router, RoutingRuleError
+
+FALLBACK = '-100'
+
+
+def guest(ticket_type=None):
+    entry = {'api_id': 'g1', 'name': '김철수'}
+    if ticket_type:
+        entry['ticket_type'] = ticket_type
+    return entry
+
+
+class RouterTest(unittest.TestCase):
+
+    def test_no_rules_send_everything_to_fallback(self):
+        router = Router.parse('', FALLBACK)
+        self.assertEqual(router.route(guest(), 'evt-1', is_vip=True), [FALLBACK])
+        self.assertEqual(router.chats(), [FALLBACK])
+
+    def test_rules_are_matched_in_order(self):
+        router = Router.parse('vip=-200;ticket:Staff=-300,-200;event:evt-2=-500;default=-400;all=-900', FALLBACK)
+        self.assertEqual(router.route(guest('Staff'), 'evt-1', is_vip=True), ['-200', '-300', '-900'])
+        self.assertEqual(router.route(guest(), 'evt-2', is_vip=False), ['-500', '-900'])
+        self.assertEqual(router.route(guest(), 'evt-1', is_vip=False), ['-400', '-900'])
+        self.assertNotIn(FALLBACK, router.chats())
+
+    def test_unmatched_checkins_fall_back_without_default_or_all(self):
+        router = Router.parse('vip=-200;ticket:Staff=-300', FALLBACK)
+        self.assertEqual(router.route(guest(), 'evt-1', is_vip=False), [FALLBACK])
+        self.assertEqual(router.route(guest('Staff'), 'evt-1', is_vip=False), ['-300'])
+        self.assertEqual(router.route(guest(), 'evt-1', is_vip=True), ['-200'])
+
+    def test_all_rule_covers_unmatched_checkins(self):
+        router = Router.parse('vip=-200;all=-900', FALLBACK)
+        self.assertEqual(router.route(guest(), 'evt-1', is_vip=False), ['-900'])
+
+    def test_invalid_rules(self):
+        for spec in ('vip', 'vip=', '=-200', 'ticket=-200', 'team:A=-200'):
+            with self.assertRaises(RoutingRuleError, msg=spec):
+                Router.parse(spec, FALLBACK)
+
+
+if __name__ == "__main__":
+    unittest.main()
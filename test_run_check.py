@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+run_check 결정적 테스트 및 벤치마크
+
+LumaAPI와 TelegramBot의 전송 계층을 프로세스 안의 가짜 구현(transport.FakeLuma, FakeTelegram)으로
+바꿔 네트워크 없이 `LumaCheckinBot.run_check`를 처음부터 끝까지 실행합니다. 시각은 가상 시계를 쓰고
+상태 파일은 시나리오마다 임시 디렉터리에 두므로, 같은 시나리오는 항상 같은 알림을 만듭니다.
+
+실제 API에 요청하는 점검용 스크립트(test_guests.py 등)와 달리 API 키와 네트워크가 필요 없습니다.
+
+사용법:
+    python -m unittest test_run_check            # 테스트
+    python test_run_check.py --bench [--runs 20] # 시나리오별 실행 시간 (중앙값)
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import unittest
+import statistics
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from unittest import mock
+
+from luma_checkin_bot import LumaCheckinBot
+from transport import FakeLuma, FakeTelegram
+
+CHAT_ID = '-100'
+START = datetime(2026, 5, 1, 10, 0, 0)
+
+BASE_ENV = {
+    'LUMA_API_KEY': 'test-key',
+    'TELEGRAM_BOT_TOKEN': 'test-token',
+    'TELEGRAM_CHAT_ID': CHAT_ID,
+    # 요청 예산, 전송 속도 제한, 행사 전 미리 받기는 실제 시간을 쓰므로 끔
+    'LUMA_RATE_PER_MINUTE': '0',
+    'TELEGRAM_SEND_RATE_PER_MINUTE': '0',
+    'WARMUP_LEAD_MINUTES': '0',
+}
+
+
+class BotHarness:
+    """가짜 Luma/Telegram과 가상 시계로 봇을 실행하는 시나리오 환경"""
+
+    def __init__(self, env: Optional[Dict[str, str]] = None, page_size: int = 50):
+        self.workdir = tempfile.mkdtemp(prefix='luma-test-')
+        self._cwd = os.getcwd()
+        os.chdir(self.workdir)
+        self._env = mock.patch.dict(os.environ, dict(BASE_ENV, **(env or {})), clear=True)
+        self._env.start()
+
+        self.now = START
+        self.luma = FakeLuma(page_size)
+        self.telegram = FakeTelegram()
+        self.bot = self.new_bot()
+
+    def new_bot(self):
+        """같은 상태 디렉터리로 봇을 새로 만듦 (재시작)"""
+        bot = LumaCheckinBot()
+        bot.utcnow = lambda: self.now
+        bot.luma_api.transport = self.luma
+        bot.telegram_bot.transport = self.telegram
+        # 이벤트 메타데이터는 백그라운드 스레드에서 받으므로 결과가 틱마다 달라지지 않도록 받지 않음
+        bot.event_meta.fetch = None
+        return bot
+
+    def close(self):
+        self._env.stop()
+        os.chdir(self._cwd)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def advance(self, minutes: float):
+        self.now += timedelta(minutes=minutes)
+
+    def ago(self, minutes: float) -> datetime:
+        return self.now - timedelta(minutes=minutes)
+
+    def tick(self, minutes_ago: Optional[float] = None) -> List[str]:
+        """틱 하나를 실행하고 그 틱에 보낸 메시지 본문 목록 반환"""
+        sent = len(self.telegram.sent)
+        self.bot.run_check(minutes_ago=minutes_ago)
+        return [entry.get('text', entry.get('photo')) for entry in self.telegram.sent[sent:]]
+
+
+def names_in(messages: List[str]) -> List[str]:
+    """개별 체크인 알림에 들어 있는 참석자 이름"""
+    prefix = "👤 <b>이름:</b> "
+    return [line[len(prefix):] for message in messages for line in message.splitlines() if line.startswith(prefix)]
+
+
+class RunCheckTest(unittest.TestCase):
+
+    def harness(self, env: Optional[Dict[str, str]] = None, page_size: int = 50) -> BotHarness:
+        harness = BotHarness(env, page_size)
+        self.addCleanup(harness.close)
+        return harness
+
+    def test_first_run_notifies_recent_checkins_only(self):
+        h = self.harness()
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(3))
+        h.luma.add_guest('evt-1', 'g2', '이영희', checked_in_at=h.ago(45))
+        h.luma.add_guest('evt-1', 'g3', '박민수')
+
+        self.assertEqual(names_in(h.tick()), ['김철수'])
+
+    def test_each_checkin_is_notified_once(self):
+        h = self.harness()
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(1))
+        h.luma.add_guest('evt-1', 'g2', '이영희')
+        h.tick()
+
+        h.advance(5)
+        self.assertEqual(h.tick(), [])
+
+        h.advance(5)
+        h.luma.check_in('evt-1', 'g2', h.ago(2))
+        self.assertEqual(names_in(h.tick()), ['이영희'])
+        self.assertEqual(names_in(h.tick()), [])
+
+    def test_guests_across_pages(self):
+        h = self.harness(page_size=10)
+        h.luma.add_event('evt-1', '데모 데이')
+        for number in range(35):
+            h.luma.add_guest('evt-1', f'g{number}', f'참석자{number}')
+        h.tick()
+
+        h.advance(5)
+        for number in (3, 17, 34):
+            h.luma.check_in('evt-1', f'g{number}', h.ago(0.5))
+        self.assertEqual(sorted(names_in(h.tick())), ['참석자17', '참석자3', '참석자34'])
+        guest_requests = [path for _, path, _ in h.luma.requests if path.endswith('/guests')]
+        self.assertEqual(len(guest_requests), 8)
+
+    def test_vip_checkin_mentions_staff(self):
+        h = self.harness({'VIP_GUESTS': '김대표', 'MENTION_USERS': '@manager'})
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김대표', checked_in_at=h.ago(1))
+        h.luma.add_guest('evt-1', 'g2', '이영희', checked_in_at=h.ago(1))
+
+        messages = h.tick()
+        self.assertEqual(len(messages), 2)
+        # VIP 레인이 먼저 전송됨
+        self.assertIn('🌟 VIP', messages[0])
+        self.assertIn('@manager', messages[0])
+        self.assertNotIn('@manager', messages[1])
+
+    def test_checkin_message_escapes_guest_fields(self):
+        h = self.harness()
+        h.luma.add_event('evt-1', 'R&D <Day>')
+        h.luma.add_guest('evt-1', 'g1', 'A<B & C', email='a<b>@example.com', ticket_type='<Staff>',
+                         checked_in_at=h.ago(1))
+
+        message, = h.tick()
+        self.assertIn('📅 <b>이벤트:</b> R&amp;D &lt;Day&gt;', message)
+        self.assertIn('📧 <b>이메일:</b> a&lt;b&gt;@example.com', message)
+        self.assertIn('🏷️ <b>티켓 종류:</b> &lt;Staff&gt;', message)
+        self.assertEqual(names_in([message]), ['A&lt;B &amp; C'])
+
+    def test_routing_rules(self):
+        h = self.harness({'ROUTING_RULES': 'vip=-200;ticket:Staff=-300;default=-400', 'VIP_GUESTS': '김대표'})
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김대표', checked_in_at=h.ago(1))
+        h.luma.add_guest('evt-1', 'g2', '스태프', ticket_type='Staff', checked_in_at=h.ago(1))
+        h.luma.add_guest('evt-1', 'g3', '일반 참석자', checked_in_at=h.ago(1))
+        h.tick()
+
+        self.assertEqual(names_in(h.telegram.messages('-200')), ['김대표'])
+        self.assertEqual(names_in(h.telegram.messages('-300')), ['스태프'])
+        self.assertEqual(names_in(h.telegram.messages('-400')), ['일반 참석자'])
+        self.assertEqual(h.telegram.messages(CHAT_ID), [])
+
+    def test_digest_mode_sends_one_message(self):
+        h = self.harness({'DELIVERY_MODE': 'digest'})
+        h.luma.add_event('evt-1', '데모 데이')
+        for number in range(5):
+            h.luma.add_guest('evt-1', f'g{number}', f'참석자{number}', checked_in_at=h.ago(1))
+
+        messages = h.tick()
+        self.assertEqual(len(messages), 1)
+        for number in range(5):
+            self.assertIn(f'참석자{number}', messages[0])
+
+    def test_failed_digest_is_sent_next_tick(self):
+        h = self.harness({'DELIVERY_MODE': 'digest', 'DIGEST_WINDOW_SECONDS': '60'})
+        h.bot.daemon = True
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(1))
+        self.assertEqual(h.tick(), [])
+
+        h.advance(1)
+        h.telegram.fail('sendMessage')
+        self.assertEqual(h.tick(), [])
+
+        h.advance(1)
+        messages = h.tick()
+        self.assertEqual(len(messages), 1)
+        self.assertIn('김철수', messages[0])
+
+    def test_failed_digest_survives_one_shot_exit(self):
+        h = self.harness({'DELIVERY_MODE': 'digest'})
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(1))
+        h.telegram.fail('sendMessage')
+        self.assertEqual(h.tick(), [])
+        self.assertEqual(len(h.bot.digest_buffer), 0)
+
+        # 단발성 실행은 틱마다 새 프로세스
+        h.advance(5)
+        h.bot = h.new_bot()
+        messages = h.tick()
+        self.assertEqual(len(messages), 1)
+        self.assertIn('김철수', messages[0])
+        self.assertEqual(h.bot.state_store.get('evt-1').pending_digest, {})
+
+        h.advance(5)
+        h.bot = h.new_bot()
+        self.assertEqual(h.tick(), [])
+
+    def test_backlog_after_downtime_is_summarized(self):
+        h = self.harness({'BULK_SUMMARY_THRESHOLD': '10'})
+        h.luma.add_event('evt-1', '데모 데이')
+        for number in range(30):
+            h.luma.add_guest('evt-1', f'g{number}', f'참석자{number}')
+        h.tick()
+
+        # 두 시간 멈춰 있던 동안 쌓인 체크인은 워터마크부터 따라잡아 요약 하나로
+        h.advance(120)
+        for number in range(30):
+            h.luma.check_in('evt-1', f'g{number}', h.ago(100 - number))
+        messages = h.tick()
+        self.assertEqual(len(messages), 1)
+        self.assertIn('밀린 체크인 일괄 요약', messages[0])
+        self.assertIn('30명', messages[0])
+
+    def test_guest_page_failure_recovers_next_tick(self):
+        h = self.harness(page_size=10)
+        h.luma.add_event('evt-1', '데모 데이')
+        for number in range(25):
+            h.luma.add_guest('evt-1', f'g{number}', f'참석자{number}')
+        h.tick()
+
+        h.advance(5)
+        h.luma.check_in('evt-1', 'g20', h.ago(0.5))
+        h.luma.fail('/guests', status=502)
+        self.assertEqual(h.tick(), [])
+
+        h.advance(5)
+        self.assertEqual(names_in(h.tick()), ['참석자20'])
+
+    def test_live_event_failure_skips_tick(self):
+        h = self.harness()
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(1))
+        h.luma.fail('/public/v1/event')
+
+        self.assertEqual(h.tick(), [])
+        self.assertEqual(names_in(h.tick()), ['김철수'])
+
+    def test_telegram_failure_does_not_block_other_messages(self):
+        h = self.harness()
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(2))
+        h.luma.add_guest('evt-1', 'g2', '이영희', checked_in_at=h.ago(1))
+        h.telegram.fail('/sendMessage', status=500)
+
+        h.tick()
+        # 실패한 전송도 요청은 기록되고, 나머지 알림은 전송됨
+        sends = [path for _, path, _ in h.telegram.requests if path.endswith('/sendMessage')]
+        self.assertEqual(len(sends), 2)
+        self.assertEqual(len(names_in(h.telegram.messages())), 1)
+
+    def test_restart_does_not_resend(self):
+        h = self.harness()
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(1))
+        h.luma.add_guest('evt-1', 'g2', '이영희')
+        h.tick()
+        h.bot.state_store.flush()
+
+        h.bot = h.new_bot()
+        h.advance(5)
+        h.luma.check_in('evt-1', 'g2', h.ago(1))
+        self.assertEqual(names_in(h.tick()), ['이영희'])
+
+    def test_multiple_live_events(self):
+        h = self.harness()
+        for event_id, name in (('evt-1', '데모 데이'), ('evt-2', '밋업')):
+            h.luma.add_event(event_id, name)
+            h.luma.add_guest(event_id, f'{event_id}-g1', f'{name} 참석자', checked_in_at=h.ago(1))
+
+        messages = h.tick()
+        self.assertEqual(sorted(names_in(messages)), ['데모 데이 참석자', '밋업 참석자'])
+
+    def test_no_live_events(self):
+        h = self.harness()
+        h.luma.add_event('evt-1', '데모 데이', live=False)
+        h.luma.add_guest('evt-1', 'g1', '김철수', checked_in_at=h.ago(1))
+
+        self.assertEqual(h.tick(), [])
+        self.assertEqual([path for _, path, _ in h.luma.requests], ['/public/v1/event'])
+
+    def test_upcoming_event_is_warmed_before_it_goes_live(self):
+        h = self.harness({'WARMUP_LEAD_MINUTES': '60'})
+        h.luma.add_event('evt-1', '데모 데이', live=False, start_at=h.now + timedelta(minutes=30))
+        h.luma.add_event('evt-2', '밋업', live=False, start_at=h.now + timedelta(minutes=90))
+        for number in range(3):
+            h.luma.add_guest('evt-1', f'g{number}', f'참석자{number}')
+
+        self.assertEqual(h.tick(), [])
+        guest_paths = {path for _, path, _ in h.luma.requests if path.endswith('/guests')}
+        self.assertEqual(guest_paths, {'/public/v1/event/evt-1/guests'})
+        state = h.bot.state_store.get('evt-1')
+        self.assertIsNotNone(state.sync.last_completed_at)
+        self.assertEqual(state.sync.last_total, 3)
+
+        # 라이브가 되면 미리 받은 인덱스에서 변경분만 알림
+        h.advance(30)
+        h.luma.set_live('evt-1')
+        h.luma.check_in('evt-1', 'g1', h.ago(1))
+        self.assertEqual(names_in(h.tick()), ['참석자1'])
+
+    def test_upcoming_list_is_refreshed_periodically(self):
+        h = self.harness({'WARMUP_LEAD_MINUTES': '60', 'WARMUP_REFRESH_MINUTES': '15'})
+        h.luma.add_event('evt-1', '데모 데이', live=False, start_at=h.now + timedelta(minutes=50))
+        h.luma.add_guest('evt-1', 'g1', '김철수')
+
+        def list_requests():
+            return len([path for _, path, _ in h.luma.requests if path.endswith('/list-events')])
+
+        h.tick()
+        h.advance(5)
+        h.tick()
+        self.assertEqual(list_requests(), 1)
+        # 새로 고침 주기 안에는 참석자 목록도 다시 받지 않음
+        self.assertEqual(len([path for _, path, _ in h.luma.requests if path.endswith('/guests')]), 1)
+
+        h.advance(10)
+        h.tick()
+        self.assertEqual(list_requests(), 2)
+
+    def test_warm_up_is_skipped_without_spare_budget(self):
+        h = self.harness({'WARMUP_LEAD_MINUTES': '60'})
+        h.luma.add_event('evt-1', '데모 데이')
+        h.luma.add_event('evt-2', '밋업', live=False, start_at=h.now + timedelta(minutes=30))
+        h.luma.add_guest('evt-2', 'g1', '김철수')
+        h.bot.tick_budget_seconds = 0
+
+        h.tick()
+        self.assertFalse([path for _, path, _ in h.luma.requests if 'evt-2' in path or path.endswith('/list-events')])
+
+
+def _bench_large_event(h: BotHarness):
+    h.luma.page_size = 100
+    h.luma.add_event('evt-1', '컨퍼런스')
+    for number in range(5000):
+        h.luma.add_guest('evt-1', f'g{number}', f'참석자{number}', ticket_type='VIP' if number % 50 == 0 else None)
+    h.tick()
+    for tick in range(10):
+        h.advance(5)
+        for number in range(tick * 50, tick * 50 + 50):
+            h.luma.check_in('evt-1', f'g{number}', h.ago(1))
+        h.tick()
+
+
+def bench(runs: int):
+    """시나리오별 실행 시간 중앙값 출력"""
+    logging.disable(logging.CRITICAL)
+    print(f"{'시나리오':<52} {'중앙값':>10}")
+    for name in unittest.TestLoader().getTestCaseNames(RunCheckTest):
+        timings = []
+        for _ in range(runs):
+            result = unittest.TestResult()
+            started = time.perf_counter()
+            RunCheckTest(name).run(result)
+            timings.append(time.perf_counter() - started)
+            if not result.wasSuccessful():
+                print(f"{name}: 실패")
+                break
+        print(f"{name:<52} {statistics.median(timings) * 1000:>8.1f}ms")
+
+    timings = []
+    for _ in range(max(runs // 5, 1)):
+        h = BotHarness()
+        try:
+            started = time.perf_counter()
+            _bench_large_event(h)
+            timings.append(time.perf_counter() - started)
+        finally:
+            h.close()
+    print(f"{'large_event (참석자 5000명, 틱 11회, 알림 500건)':<52} {statistics.median(timings) * 1000:>8.1f}ms")
+
+
+def setUpModule():
+    logging.disable(logging.CRITICAL)
+
+
+def tearDownModule():
+    logging.disable(logging.NOTSET)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="run_check 결정적 테스트 및 벤치마크")
+    parser.add_argument('--bench', action='store_true', help="테스트 대신 시나리오별 실행 시간 측정")
+    parser.add_argument('--runs', type=int, default=20, help="벤치마크 반복 횟수")
+    args, rest = parser.parse_known_args()
+    if args.bench:
+        bench(args.runs)
+    else:
+        unittest.main(argv=[sys.argv[0]] + rest)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+틱 단계별 추적과 틱 프로파일러 테스트
+
+사용법:
+    python -m unittest test_tracing
+"""
+
+import os
+import time
+import tempfile
+import unittest
+
+from tracing import Tracer, TickProfiler, _NULL_SPAN
+
+
+class TracerTest(unittest.TestCase):
+
+    def test_disabled_tracer_is_noop(self):
+        tracer = Tracer()
+        tracer.begin_tick('t1')
+        self.assertIs(tracer.span('fetch'), _NULL_SPAN)
+        self.assertIsNone(tracer.end_tick())
+        self.assertEqual(tracer.format_totals(), "추적된 틱이 없습니다.")
+
+    def test_stages_are_aggregated(self):
+        tracer = Tracer()
+        tracer.enabled = True
+        # 틱 밖의 구간은 기록하지 않음
+        self.assertIs(tracer.span('fetch'), _NULL_SPAN)
+
+        for tick_id in ('t1', 't2'):
+            tracer.begin_tick(tick_id)
+            with tracer.span('fetch'):
+                pass
+            tracer.record('send', 0.002)
+            tracer.record('send', 0.003)
+            trace = tracer.end_tick()
+
+        self.assertEqual(trace.tick_id, 't2')
+        self.assertEqual(trace.stages['send'][1], 2)
+        self.assertAlmostEqual(trace.stages['send'][0], 0.005)
+        self.assertIn('틱 t2 소요', trace.format())
+        self.assertEqual(tracer.tick_count, 2)
+        self.assertEqual(tracer.totals['fetch'][1], 2)
+        self.assertEqual(tracer.totals['send'][1], 4)
+        self.assertIn('틱 2회', tracer.format_totals())
+
+
+class TickProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = os.path.join(directory.name, 'profiles')
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            TickProfiler('perf', self.directory)
+
+    def test_cprofile_dump(self):
+        profiler = TickProfiler('cprofile', self.directory)
+        profiler.start()
+        sum(range(1000))
+        path = profiler.stop('t1')
+        self.assertTrue(path.endswith('-t1.prof'))
+        self.assertTrue(os.path.exists(path))
+        self.assertIsNone(profiler.stop('t1'))
+
+    def write_profile(self, elapsed_ms, tick_id):
+        open(os.path.join(self.directory, f"tick-{elapsed_ms:08d}ms-{tick_id}.folded"), 'w').close()
+
+    def test_keeps_only_slowest(self):
+        os.makedirs(self.directory)
+        self.write_profile(500, 'a')
+        self.write_profile(400, 'b')
+        profiler = TickProfiler('sampling', self.directory, keep_slowest=2)
+
+        # 보관 중인 가장 느린 2개보다 빠른 틱은 저장하지 않음
+        profiler.start()
+        self.assertIsNone(profiler.stop('fast'))
+        self.assertEqual(sorted(os.listdir(self.directory)), ['tick-00000400ms-b.folded', 'tick-00000500ms-a.folded'])
+
+        # 더 느린 틱은 저장하고 가장 빠른 프로파일을 삭제
+        os.remove(os.path.join(self.directory, 'tick-00000400ms-b.folded'))
+        self.write_profile(1, 'c')
+        profiler.start()
+        time.sleep(0.01)
+        path = profiler.stop('slow')
+        self.assertEqual(sorted(os.listdir(self.directory)), sorted([os.path.basename(path), 'tick-00000500ms-a.folded']))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+틱 단계별 추적 및 프로파일링
+
+- `tracer.span('단계')`로 감싼 구간의 소요 시간을 틱 단위로 집계해 어디에 시간이 쓰였는지 보여줍니다.
+  추적이 꺼져 있으면 span()은 미리 만들어 둔 빈 컨텍스트를 돌려주므로 비용이 거의 없습니다.
+- 선택적으로 틱마다 cProfile 또는 샘플링 프로파일을 남기며, 가장 느린 N개의 틱 프로파일만 보관할 수 있습니다.
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from contextlib import nullcontext
+from typing import List, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    """구간 하나의 소요 시간을 측정해 추적기에 기록"""
+
+    __slots__ = ('tracer', 'name', 'started')
+
+    def __init__(self, tracer: 'Tracer', name: str):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class TickTrace:
+    """틱 하나의 단계별 소요 시간"""
+
+    def __init__(self, tick_id: str):
+        self.tick_id = tick_id
+        self.total = 0.0
+        # 단계 이름 -> [누적 시간(초), 호출 횟수]
+        self.stages: Dict[str, list] = {}
+
+    def format(self) -> str:
+        parts = [
+            f"{name} {seconds * 1000:.1f}ms({count})"
+            for name, (seconds, count) in sorted(self.stages.items(), key=lambda item: -item[1][0])
+        ]
+        accounted = sum(seconds for seconds, _ in self.stages.values())
+        other = max(self.total - accounted, 0.0)
+        parts.append(f"기타 {other * 1000:.1f}ms")
+        return f"틱 {self.tick_id} 소요 {self.total * 1000:.1f}ms: " + ", ".join(parts)
+
+
+class Tracer:
+    """틱 단위 단계별 소요 시간 추적기"""
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._current: Optional[TickTrace] = None
+        self._tick_started = 0.0
+        # 여러 틱에 걸친 단계별 누적 [시간, 횟수] 및 틱 수
+        self.totals: Dict[str, list] = {}
+        self.tick_count = 0
+        self.tick_seconds = 0.0
+
+    def span(self, name: str):
+        """구간 측정 컨텍스트 (추적이 꺼져 있으면 빈 컨텍스트)"""
+        if not self.enabled or self._current is None:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            if self._current is None:
+                return
+            stage = self._current.stages.setdefault(name, [0.0, 0])
+            stage[0] += seconds
+            stage[1] += 1
+
+    def begin_tick(self, tick_id: str):
+        if not self.enabled:
+            return
+        self._current = TickTrace(tick_id)
+        self._tick_started = time.perf_counter()
+
+    def end_tick(self) -> Optional[TickTrace]:
+        """틱 종료 후 해당 틱의 추적 결과 반환"""
+        if not self.enabled or self._current is None:
+            return None
+        with self._lock:
+            trace, self._current = self._current, None
+        trace.total = time.perf_counter() - self._tick_started
+        self.tick_count += 1
+        self.tick_seconds += trace.total
+        for name, (seconds, count) in trace.stages.items():
+            total = self.totals.setdefault(name, [0.0, 0])
+            total[0] += seconds
+            total[1] += count
+        return trace
+
+    def format_totals(self) -> str:
+        """지금까지의 틱 전체에 대한 단계별 요약"""
+        if not self.tick_count:
+            return "추적된 틱이 없습니다."
+        lines = [f"틱 {self.tick_count}회, 평균 {self.tick_seconds / self.tick_count * 1000:.1f}ms"]
+        for name, (seconds, count) in sorted(self.totals.items(), key=lambda item: -item[1][0]):
+            share = seconds / self.tick_seconds * 100 if self.tick_seconds else 0.0
+            lines.append(f"  {name:<22} {seconds * 1000:10.1f}ms {share:5.1f}% ({count}회)")
+        return "\n".join(lines)
+
+
+# 모듈 전역 추적기 (logging과 같이 어디서든 가져다 사용)
+tracer = Tracer()
+
+
+class _SamplingProfiler:
+    """대상 스레드의 호출 스택을 주기적으로 샘플링 (flamegraph용 collapsed 형식)"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                key = ";".join(reversed(stack))
+                self.samples[key] = self.samples.get(key, 0) + 1
+
+    def dump(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.samples.items(), key=lambda item: -item[1]):
+                f.write(f"{stack} {count}\n")
+
+    def top_functions(self, limit: int = 5) -> List[Tuple[str, int]]:
+        leaves: Dict[str, int] = {}
+        for stack, count in self.samples.items():
+            leaf = stack.rsplit(';', 1)[-1]
+            leaves[leaf] = leaves.get(leaf, 0) + count
+        return sorted(leaves.items(), key=lambda item: -item[1])[:limit]
+
+
+class TickProfiler:
+    """틱 단위 프로파일러 (cprofile 또는 sampling)
+
+    프로파일은 `<디렉터리>/tick-<소요ms>ms-<틱ID>.<prof|folded>`로 저장하며,
+    keep_slowest가 0보다 크면 소요 시간이 가장 긴 N개만 남기고 나머지는 삭제합니다.
+    파일 이름에 소요 시간이 들어 있으므로 cron 단발성 실행 사이에도 기준이 유지됩니다.
+    """
+
+    def __init__(self, mode: str, directory: str, keep_slowest: int = 0,
+                 sample_interval: float = 0.005):
+        if mode not in ('cprofile', 'sampling'):
+            raise ValueError(f"지원하지 않는 PROFILE_MODE입니다: {mode}")
+        self.mode = mode
+        self.directory = directory
+        self.keep_slowest = keep_slowest
+        self.sample_interval = sample_interval
+        self._profiler = None
+        self._started = 0.0
+
+    def start(self):
+        if self.mode == 'cprofile':
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._profiler = _SamplingProfiler(threading.get_ident(), self.sample_interval)
+            self._profiler.start()
+        self._started = time.perf_counter()
+
+    def stop(self, tick_id: str) -> Optional[str]:
+        """프로파일링을 멈추고 저장한 파일 경로 반환 (보관 대상이 아니면 None)"""
+        if self._profiler is None:
+            return None
+        elapsed_ms = int((time.perf_counter() - self._started) * 1000)
+        profiler, self._profiler = self._profiler, None
+        if self.mode == 'cprofile':
+            profiler.disable()
+        else:
+            profiler.stop()
+
+        if self.keep_slowest > 0:
+            existing = self._existing_profiles()
+            if len(existing) >= self.keep_slowest and existing[-1][0] >= elapsed_ms:
+                return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        extension = 'prof' if self.mode == 'cprofile' else 'folded'
+        path = os.path.join(self.directory, f"tick-{elapsed_ms:08d}ms-{tick_id}.{extension}")
+        if self.mode == 'cprofile':
+            profiler.dump_stats(path)
+            self._log_cprofile_top(path)
+        else:
+            profiler.dump(path)
+            top = ", ".join(f"{name}({count})" for name, count in profiler.top_functions())
+            logger.info("샘플링 프로파일 상위 함수: %s", top)
+
+        if self.keep_slowest > 0:
+            for _, old_path in self._existing_profiles()[self.keep_slowest:]:
+                os.remove(old_path)
+        logger.info("틱 프로파일 저장: %s", path)
+        return path
+
+    def _existing_profiles(self) -> List[Tuple[int, str]]:
+        """저장된 프로파일 목록 (소요 시간 내림차순)"""
+        profiles = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return profiles
+        for name in names:
+            if name.startswith('tick-') and 'ms-' in name:
+                try:
+                    profiles.append((int(name[5:].split('ms-', 1)[0]), os.path.join(self.directory, name)))
+                except ValueError:
+                    continue
+        profiles.sort(reverse=True)
+        return profiles
+
+    @staticmethod
+    def _log_cprofile_top(path: str, limit: int = 5):
+        import pstats
+        stats = pstats.Stats(path)
+        rows = sorted(stats.stats.items(), key=lambda item: -item[1][3])[:limit]
+        top = ", ".join(
+            f"{os.path.basename(func[0])}:{func[2]} {row[3] * 1000:.1f}ms" for func, row in rows
+        )
+        logger.info("cProfile 누적 시간 상위 함수: %s", top)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+HTTP 전송 계층
+
+LumaAPI와 TelegramBot은 requests를 직접 호출하지 않고 Transport.request()로 요청을 보냅니다.
+구현을 바꿔 끼우면 같은 클라이언트 코드를 네트워크 없이 실행할 수 있습니다.
+
+- HTTPTransport: 실제 HTTP 요청 (requests, 스레드별 세션으로 연결 재사용)
+- replay.ReplaySource: RECORD_FILE로 기록한 Luma 응답을 돌려주는 기록 재생 구현
+- FakeLuma / FakeTelegram: 프로세스 안에서 Luma와 Telegram API를 흉내 내는 구현
+  (이벤트와 참석자를 코드로 만들고 체크인시키며, 보낸 메시지를 모아 둠, 결정적 테스트와 벤치마크용)
+
+구현과 관계없이 요청 실패는 TransportError로, HTTP 오류 상태는 raise_for_status()의 HTTPStatusError로,
+JSON이 아닌 응답은 json()의 InvalidResponse(ValueError이기도 함)로 전달됩니다.
+"""
+
+import json
+import hashlib
+import threading
+from datetime import datetime
+from itertools import count
+from urllib.parse import urlsplit
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class TransportError(Exception):
+    """요청 실패 (연결 오류, 타임아웃, HTTP 오류 상태 등)"""
+
+
+class HTTPStatusError(TransportError):
+    """HTTP 오류 상태 (4xx, 5xx)"""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class InvalidResponse(TransportError, ValueError):
+    """JSON으로 해석할 수 없는 응답"""
+
+
+class Response:
+    """HTTP 응답 (상태 코드와 본문)"""
+
+    def __init__(self, status_code: int, content: bytes, url: str = ''):
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+
+    @classmethod
+    def from_json(cls, data: Any, status_code: int = 200, url: str = '') -> 'Response':
+        return cls(status_code, json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), url)
+
+    def json(self) -> Any:
+        try:
+            return json.loads(self.content)
+        except ValueError as e:
+            raise InvalidResponse(f"JSON이 아닌 응답입니다: {self.url}: {e}")
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPStatusError(f"{self.status_code} 오류 응답: {self.url}", self.status_code)
+
+
+class Transport:
+    """요청 전송 인터페이스"""
+
+    def request(self, method: str, url: str, params: Optional[Dict] = None, data: Optional[Dict] = None,
+                files: Optional[Dict] = None, headers: Optional[Dict] = None,
+                timeout: Optional[float] = None) -> Response:
+        """요청을 보내고 응답 반환 (요청 자체가 실패하면 TransportError)"""
+        raise NotImplementedError
+
+    def get(self, url: str, **kwargs) -> Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> Response:
+        return self.request('POST', url, **kwargs)
+
+
+class HTTPTransport(Transport):
+    """requests를 사용하는 실제 HTTP 전송 (requests는 첫 요청 때 임포트)"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            import requests
+            session = self._local.session = requests.Session()
+        return session
+
+    def request(self, method, url, params=None, data=None, files=None, headers=None, timeout=None):
+        import requests
+        try:
+            response = self._session().request(
+                method, url, params=params, data=data, files=files, headers=headers, timeout=timeout
+            )
+        except requests.RequestException as e:
+            raise TransportError(str(e)) from e
+        return Response(response.status_code, response.content, url)
+
+
+class FakeTransport(Transport):
+    """프로세스 안에서 응답을 만드는 가짜 전송의 공통 부분
+
+    요청을 모두 requests에 기록하고, fail()로 지정한 경로의 요청은 횟수만큼 실패시킵니다.
+    """
+
+    def __init__(self):
+        self.requests: List[Tuple[str, str, Dict]] = []
+        # 경로에 포함된 문자열 -> [남은 실패 횟수, 상태 코드 (0이면 연결 오류)]
+        self._failures: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def fail(self, fragment: str, times: int = 1, status: int = 0):
+        """경로에 fragment가 들어간 다음 요청 times개를 실패시킴 (status가 0이면 연결 오류, 아니면 그 상태 코드)"""
+        self._failures[fragment] = [times, status]
+
+    def _injected_failure(self, path: str, url: str) -> Optional[Response]:
+        for fragment, failure in self._failures.items():
+            if fragment in path and failure[0] > 0:
+                failure[0] -= 1
+                if not failure[1]:
+                    raise TransportError(f"연결 실패 (가짜 전송): {url}")
+                return Response.from_json({'ok': False, 'description': 'injected failure'}, failure[1], url)
+        return None
+
+    def request(self, method, url, params=None, data=None, files=None, headers=None, timeout=None):
+        path = urlsplit(url).path
+        fields = dict(params or {}, **(data or {}))
+        with self._lock:
+            self.requests.append((method, path, fields))
+            response = self._injected_failure(path, url)
+            if response is not None:
+                return response
+            status, payload = self.handle(method, path, fields, files)
+        return Response.from_json(payload, status, url)
+
+    def handle(self, method: str, path: str, fields: Dict, files: Optional[Dict]) -> Tuple[int, Any]:
+        """요청 하나에 대한 (상태 코드, JSON 응답)"""
+        raise NotImplementedError
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+
+class FakeLuma(FakeTransport):
+    """Luma Public API 가짜 구현 (라이브 이벤트, 참석자 페이지, 이벤트 상세, 캘린더 이벤트 목록)"""
+
+    def __init__(self, page_size: int = 50):
+        super().__init__()
+        self.page_size = page_size
+        self.events: Dict[str, Dict] = {}
+        self.live: List[str] = []
+        self.guests: Dict[str, List[Dict]] = {}
+
+    def add_event(self, api_id: str, name: str, live: bool = True, **fields) -> Dict:
+        """이벤트 추가 (start_at 등 datetime 값은 ISO 문자열로 변환)"""
+        event = {'api_id': api_id, 'name': name}
+        event.update({key: _iso(value) if isinstance(value, datetime) else value for key, value in fields.items()})
+        self.events[api_id] = event
+        self.guests.setdefault(api_id, [])
+        self.set_live(api_id, live)
+        return event
+
+    def set_live(self, api_id: str, live: bool = True):
+        if live and api_id not in self.live:
+            self.live.append(api_id)
+        elif not live and api_id in self.live:
+            self.live.remove(api_id)
+
+    def add_guest(self, event_id: str, api_id: str, name: str, email: Optional[str] = None,
+                  ticket_type: Optional[str] = None, checked_in_at: Optional[datetime] = None, **fields) -> Dict:
+        """참석자 등록 (checked_in_at을 주면 체크인한 상태로)"""
+        guest = {
+            'api_id': api_id,
+            'name': name,
+            'email': email or f"{api_id}@example.com",
+            'approval_status': 'approved',
+            'checkin_info': {'checked_in_at': _iso(checked_in_at) if checked_in_at else None},
+        }
+        if ticket_type:
+            guest['ticket_type'] = ticket_type
+        guest.update(fields)
+        self.guests[event_id].append(guest)
+        return guest
+
+    def check_in(self, event_id: str, guest_id: str, at: Optional[datetime]):
+        """참석자 체크인 (at이 None이면 체크인 취소)"""
+        for guest in self.guests[event_id]:
+            if guest['api_id'] == guest_id:
+                guest['checkin_info'] = {'checked_in_at': _iso(at) if at else None}
+                return
+        raise KeyError(guest_id)
+
+    def remove_guest(self, event_id: str, guest_id: str):
+        self.guests[event_id] = [guest for guest in self.guests[event_id] if guest['api_id'] != guest_id]
+
+    def _page(self, entries: List, fields: Dict) -> Dict:
+        start = int(fields.get('pagination_cursor') or 0)
+        end = start + self.page_size
+        has_more = end < len(entries)
+        return {'entries': entries[start:end], 'has_more': has_more, 'next_cursor': str(end) if has_more else None}
+
+    def handle(self, method, path, fields, files):
+        parts = path.strip('/').split('/')
+        if parts == ['public', 'v1', 'event']:
+            return 200, {'entries': [self.events[api_id] for api_id in self.live]}
+        if parts == ['public', 'v1', 'calendar', 'list-events']:
+            after, before = fields.get('after', ''), fields.get('before')
+            entries = [
+                {'event': event} for event in self.events.values()
+                if after <= event.get('start_at', '') and (not before or event.get('start_at', '') <= before)
+            ]
+            return 200, self._page(entries, fields)
+        if len(parts) >= 4 and parts[3] in self.events:
+            if parts[4:] == ['guests']:
+                return 200, self._page(self.guests[parts[3]], fields)
+            if not parts[4:]:
+                return 200, {'event': self.events[parts[3]]}
+        return 404, {'message': 'not found'}
+
+
+class FakeTelegram(FakeTransport):
+    """Telegram Bot API 가짜 구현 (보낸 메시지를 sent에 모으고, getUpdates는 updates에 넣은 메시지를 돌려줌)
+
+    sent 항목: {'chat_id', 'text'} (수정이면 'edit': 메시지 ID, 답장이면 'reply_to', 사진이면 'photo': 설명)
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.sent: List[Dict] = []
+        self.pinned: List[Tuple[str, int]] = []
+        self.updates: List[Dict] = []
+        self._message_ids = count(1)
+        self._update_ids = count(1)
+
+    def add_update(self, chat_id: str, text: str, user: str = 'staff') -> Dict:
+        """봇이 받을 메시지 추가 (스태프 명령 테스트용)"""
+        update = {
+            'update_id': next(self._update_ids),
+            'message': {'message_id': next(self._message_ids), 'chat': {'id': int(chat_id)},
+                        'from': {'username': user}, 'text': text},
+        }
+        self.updates.append(update)
+        return update
+
+    def messages(self, chat_id: Optional[str] = None) -> List[str]:
+        """보낸 메시지 본문 목록 (chat_id를 주면 그 채팅방만)"""
+        return [
+            entry.get('text', entry.get('photo')) for entry in self.sent
+            if chat_id is None or str(entry['chat_id']) == str(chat_id)
+        ]
+
+    def handle(self, method, path, fields, files):
+        api_method = path.rsplit('/', 1)[-1]
+        chat_id = fields.get('chat_id')
+        if api_method == 'sendMessage':
+            entry = {'chat_id': chat_id, 'text': fields.get('text')}
+            if fields.get('reply_to_message_id'):
+                entry['reply_to'] = fields['reply_to_message_id']
+            self.sent.append(entry)
+            return 200, {'ok': True, 'result': {'message_id': next(self._message_ids)}}
+        if api_method == 'editMessageText':
+            self.sent.append({'chat_id': chat_id, 'text': fields.get('text'), 'edit': fields.get('message_id')})
+            return 200, {'ok': True, 'result': {'message_id': fields.get('message_id')}}
+        if api_method == 'pinChatMessage':
+            self.pinned.append((chat_id, fields.get('message_id')))
+            return 200, {'ok': True, 'result': True}
+        if api_method == 'sendPhoto':
+            self.sent.append({'chat_id': chat_id, 'photo': fields.get('caption')})
+            # 올린 사진은 내용 해시를 file_id로 (같은 사진을 다시 올리면 같은 file_id)
+            photo = fields.get('photo') or hashlib.sha256(files['photo'][1]).hexdigest()
+            return 200, {'ok': True, 'result': {'message_id': next(self._message_ids),
+                                                'photo': [{'file_id': photo}]}}
+        if api_method == 'getUpdates':
+            offset = int(fields.get('offset') or 0)
+            updates = [update for update in self.updates if update['update_id'] >= offset]
+            return 200, {'ok': True, 'result': updates}
+        return 404, {'ok': False, 'description': 'Not Found: method not found'}